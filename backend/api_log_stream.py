@@ -0,0 +1,383 @@
+import os
+import sys
+import json
+import time
+import base64
+import atexit
+from collections import deque
+from threading import Thread, Lock, Condition
+from datetime import datetime, timezone
+from pagination import InvalidCursorError
+from telemetry import telemetry_manager
+
+# API 로그 스트림 키와 보관 정책
+STREAM_KEY = os.getenv('API_LOG_STREAM_KEY', 'api_log_stream')
+# 기존 LPUSH/LTRIM 리스트 (마이그레이션 대상)
+LEGACY_LIST_KEY = 'api_logs'
+# 최대 보관 개수 (MAXLEN ~, 근사치로 잘라 O(1)에 가깝게 유지)
+MAXLEN = int(os.getenv('API_LOG_STREAM_MAXLEN', '1000'))
+# 보관 기간(초), 0이면 개수로만 제한 (MINID ~)
+RETENTION_SECONDS = int(os.getenv('API_LOG_STREAM_RETENTION_SECONDS', '0'))
+
+_MIGRATION_LOCK_KEY = f"{STREAM_KEY}:migration_lock"
+
+
+def append(client, action, details, timestamp=None):
+    """로그를 스트림에 추가합니다. client가 파이프라인이면 명령만 추가됩니다."""
+    client.xadd(STREAM_KEY, {
+        'timestamp': timestamp or datetime.utcnow().replace(tzinfo=timezone.utc).isoformat(),
+        'action': action,
+        'details': details
+    }, maxlen=MAXLEN, approximate=True)
+    if RETENTION_SECONDS > 0:
+        client.xtrim(STREAM_KEY, minid=int((time.time() - RETENTION_SECONDS) * 1000), approximate=True)
+
+
+class RedisLogShipper:
+    """요청 스레드 대신 백그라운드에서 로그를 스트림에 기록합니다.
+
+    submit()은 제한된 큐에 추가만 하며, 플러셔 스레드가 batch_size개가 모이거나
+    첫 로그 이후 flush_interval이 지나면 한 번의 파이프라인으로 기록합니다.
+    큐가 가득 차면 가장 오래된 로그를 버립니다.
+    """
+
+    def __init__(self, get_client, capacity=10000, batch_size=100, flush_interval=0.2):
+        self.get_client = get_client
+        self.capacity = max(1, capacity)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+
+        self._queue = deque()
+        self._cond = Condition()
+        self._closed = False
+        self.counters = {'enqueued': 0, 'dropped': 0, 'written': 0, 'failed': 0}
+
+        self._thread = Thread(target=self._run, name="redis-log-shipper", daemon=True)
+        self._thread.start()
+
+        telemetry_manager.register_gauge(
+            "redis_log_queue_depth", lambda: len(self._queue),
+            description="Redis 기록 대기 중인 로그 수"
+        )
+
+    def _count(self, result, value=1):
+        with self._cond:
+            self.counters[result] += value
+        telemetry_manager.record_metric("redis_log_events_total", value, {"result": result})
+
+    def submit(self, action, details):
+        """로그를 큐에 추가합니다. 추가되면 True, 종료 중이라 버려지면 False를 반환합니다."""
+        entry = (datetime.utcnow().replace(tzinfo=timezone.utc).isoformat(), action, details)
+        dropped_oldest = False
+        with self._cond:
+            if self._closed:
+                accepted = False
+            else:
+                if len(self._queue) >= self.capacity:
+                    self._queue.popleft()
+                    dropped_oldest = True
+                self._queue.append(entry)
+                accepted = True
+                if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+                    self._cond.notify_all()
+
+        if dropped_oldest or not accepted:
+            self._count('dropped')
+        if accepted:
+            self._count('enqueued')
+        return accepted
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                # 배치가 찰 때까지 최대 flush_interval 동안 대기
+                self._cond.wait_for(
+                    lambda: len(self._queue) >= self.batch_size or self._closed, self.flush_interval
+                )
+                batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.batch_size))]
+                finished = self._closed and not self._queue
+            if batch:
+                self._flush(batch)
+            if finished:
+                return
+
+    def _flush(self, batch):
+        start = time.perf_counter()
+        try:
+            pipe = self.get_client().pipeline(transaction=False)
+            for timestamp, action, details in batch:
+                append(pipe, action, details, timestamp)
+            pipe.execute()
+        except Exception as e:
+            self._count('failed', len(batch))
+            print(f"Redis logging error: {str(e)}")
+            telemetry_manager.log_error("Redis logging error: %s", lambda: {
+                "action": "redis_logging_error",
+                "error": str(e),
+                "batch_size": len(batch),
+                "component": "redis_logging"
+            }, args=(e,), component="redis_logging")
+            return
+
+        telemetry_manager.record_histogram("redis_log_flush_latency_ms", (time.perf_counter() - start) * 1000)
+        telemetry_manager.record_histogram("redis_log_batch_size", len(batch))
+        self._count('written', len(batch))
+        for _, action, details in batch:
+            # OpenTelemetry 로그 전송 (redis_logging 컴포넌트 레이트 리밋, 버려지면 포맷하지 않음)
+            telemetry_manager.log_info("Redis log: %s - %s", lambda: {
+                "action": action,
+                "component": "redis_logging"
+            }, args=(action, details), component="redis_logging")
+
+    def stats(self):
+        """카운터와 현재 큐 깊이를 반환합니다."""
+        with self._cond:
+            return dict(self.counters, queue_depth=len(self._queue))
+
+    def shutdown(self, timeout=5):
+        """새 로그를 막고 큐에 남은 로그를 기록한 뒤 플러셔를 종료합니다."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        remaining = self.stats()['queue_depth']
+        if remaining:
+            print(f"Redis log shipper stopped with {remaining} unwritten logs")
+
+
+_shipper = None
+_shipper_pid = None
+_shipper_lock = Lock()
+
+
+def get_log_shipper():
+    """프로세스 전역 로그 기록기를 반환합니다. fork 이후에는 새로 생성합니다."""
+    global _shipper, _shipper_pid
+    if _shipper is None or _shipper_pid != os.getpid():
+        with _shipper_lock:
+            if _shipper is None or _shipper_pid != os.getpid():
+                from redis_pool import get_redis_client
+                _shipper = RedisLogShipper(
+                    get_redis_client,
+                    capacity=int(os.getenv('REDIS_LOG_QUEUE_CAPACITY', '10000')),
+                    batch_size=int(os.getenv('REDIS_LOG_BATCH_SIZE', '100')),
+                    flush_interval=int(os.getenv('REDIS_LOG_FLUSH_INTERVAL_MS', '200')) / 1000
+                )
+                _shipper_pid = os.getpid()
+    return _shipper
+
+
+def shutdown_log_shipper(timeout=None):
+    """큐에 남은 로그를 기록하고 로그 기록기를 종료합니다."""
+    global _shipper, _shipper_pid
+    with _shipper_lock:
+        shipper, pid = _shipper, _shipper_pid
+        _shipper = None
+        _shipper_pid = None
+    if shipper is not None and pid == os.getpid():
+        if timeout is None:
+            timeout = float(os.getenv('REDIS_LOG_SHUTDOWN_TIMEOUT', '5'))
+        shipper.shutdown(timeout)
+
+
+atexit.register(shutdown_log_shipper)
+
+
+def _to_log(stream_id, fields):
+    return {
+        'id': stream_id,
+        'timestamp': fields.get('timestamp'),
+        'action': fields.get('action'),
+        'details': fields.get('details')
+    }
+
+
+def encode_cursor(stream_id, direction):
+    """스트림 ID 경계와 방향(next/prev)을 불투명한 토큰으로 인코딩합니다."""
+    raw = json.dumps({"id": stream_id, "d": direction}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """커서 토큰을 (stream_id, direction)으로 디코딩합니다."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        stream_id, direction = str(data["id"]), data["d"]
+        ms, seq = stream_id.split('-')
+        int(ms), int(seq)
+    except Exception:
+        raise InvalidCursorError("잘못된 커서입니다")
+    if direction not in ("next", "prev"):
+        raise InvalidCursorError("잘못된 커서입니다")
+    return stream_id, direction
+
+
+def time_bound(value):
+    """ISO 8601 시각 또는 epoch 밀리초를 스트림 ID 범위 경계(밀리초)로 변환합니다. 없으면 None."""
+    if not value:
+        return None
+    if value.isdigit():
+        return value
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"잘못된 시각 형식입니다: {value}")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return str(int(parsed.timestamp() * 1000))
+
+
+def page_range(token=None, since=None, until=None):
+    """커서와 시간 범위로 조회할 스트림 ID 범위를 계산합니다.
+
+    Returns:
+        (newest, oldest, direction)
+    """
+    newest = until or '+'
+    oldest = since or '-'
+    direction = "next"
+    if token:
+        boundary, direction = decode_cursor(token)
+        if direction == "next":
+            newest = f"({boundary}"
+        else:
+            oldest = f"({boundary}"
+    return newest, oldest, direction
+
+
+def page_result(entries, limit, direction, token=None):
+    """page_range 범위에서 읽은 항목(limit + 1개)으로 페이지와 이전/다음 커서를 만듭니다.
+
+    Returns:
+        (logs, next_cursor, prev_cursor)
+    """
+    has_extra = len(entries) > limit
+    entries = entries[:limit]
+    if direction == "prev":
+        entries.reverse()
+
+    logs = [_to_log(stream_id, fields) for stream_id, fields in entries]
+    if not logs:
+        return logs, None, None
+
+    if direction == "next":
+        has_next, has_prev = has_extra, bool(token)
+    else:
+        has_next, has_prev = True, has_extra
+
+    next_cursor = encode_cursor(logs[-1]['id'], "next") if has_next else None
+    prev_cursor = encode_cursor(logs[0]['id'], "prev") if has_prev else None
+    return logs, next_cursor, prev_cursor
+
+
+def read_page(client, limit, token=None, since=None, until=None):
+    """스트림을 최신순으로 커서 기반 페이지 조회합니다. 비용은 O(limit)입니다.
+
+    since/until은 스트림 ID(밀리초) 경계이며 포함 범위입니다.
+
+    Returns:
+        (logs, next_cursor, prev_cursor)
+    """
+    newest, oldest, direction = page_range(token, since, until)
+    if direction == "next":
+        entries = client.xrevrange(STREAM_KEY, max=newest, min=oldest, count=limit + 1)
+    else:
+        entries = client.xrange(STREAM_KEY, min=oldest, max=newest, count=limit + 1)
+    return page_result(entries, limit, direction, token)
+
+
+def read_offset_page(client, offset, limit):
+    """page/limit 방식 조회 (기존 API 호환). 최신 offset + limit개만 읽습니다.
+
+    Returns:
+        (logs, total)
+    """
+    pipe = client.pipeline(transaction=False)
+    pipe.xrevrange(STREAM_KEY, count=offset + limit)
+    pipe.xlen(STREAM_KEY)
+    entries, total = pipe.execute()
+    return offset_page_result(entries, offset), total
+
+
+def offset_page_result(entries, offset):
+    return [_to_log(stream_id, fields) for stream_id, fields in entries[offset:]]
+
+
+def _timestamp_ms(value, default):
+    try:
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp() * 1000)
+    except (TypeError, ValueError):
+        return default
+
+
+def migrate_from_list(client):
+    """기존 api_logs 리스트의 로그를 시간순으로 스트림에 옮기고 리스트를 삭제합니다.
+
+    로그의 timestamp로 스트림 ID를 만들어 시간 범위 조회에 포함되도록 합니다.
+    스트림에 이미 더 최신 로그가 있으면 그 뒤의 ID를 사용합니다.
+    여러 프로세스가 동시에 시작해도 한 프로세스만 옮기며, 옮긴 로그 수를 반환합니다.
+    """
+    if client.type(LEGACY_LIST_KEY) not in ('list', b'list'):
+        return 0
+    if not client.set(_MIGRATION_LOCK_KEY, os.getpid(), nx=True, ex=60):
+        return 0
+
+    try:
+        # LPUSH로 쌓였으므로 뒤쪽이 오래된 로그
+        raw_logs = client.lrange(LEGACY_LIST_KEY, 0, -1)[::-1]
+        last = client.xrevrange(STREAM_KEY, count=1)
+        prev_ms, prev_seq = map(int, last[0][0].split('-')) if last else (0, -1)
+
+        entries = []
+        for raw in raw_logs:
+            try:
+                log = json.loads(raw)
+            except ValueError:
+                continue
+            ms = _timestamp_ms(log.get('timestamp'), prev_ms)
+            if ms > prev_ms:
+                prev_ms, prev_seq = ms, 0
+            else:
+                prev_seq += 1
+            entries.append(({
+                'timestamp': log.get('timestamp') or '',
+                'action': log.get('action') or '',
+                'details': log.get('details') or ''
+            }, f"{prev_ms}-{prev_seq}"))
+
+        pipe = client.pipeline(transaction=False)
+        for fields, stream_id in entries:
+            pipe.xadd(STREAM_KEY, fields, id=stream_id)
+        results = pipe.execute(raise_on_error=False)
+
+        # 그 사이 다른 프로세스가 더 최신 로그를 추가해 ID가 거부되면 자동 ID로 추가
+        pipe = client.pipeline(transaction=False)
+        for (fields, _), result in zip(entries, results):
+            if isinstance(result, Exception):
+                pipe.xadd(STREAM_KEY, fields)
+        pipe.delete(LEGACY_LIST_KEY)
+        pipe.execute()
+        migrated = len(entries)
+    finally:
+        client.delete(_MIGRATION_LOCK_KEY)
+
+    telemetry_manager.log_info(f"Migrated {migrated} API logs from list to stream", {
+        "action": "api_log_stream_migrate",
+        "migrated": migrated,
+        "component": "redis_logging"
+    })
+    return migrated
+
+
+if __name__ == '__main__':
+    # 사용법: python api_log_stream.py  (api_logs 리스트를 스트림으로 마이그레이션)
+    from redis_pool import get_redis_client
+
+    count = migrate_from_list(get_redis_client())
+    print(f"{count}개 로그를 {LEGACY_LIST_KEY} 리스트에서 {STREAM_KEY} 스트림으로 옮겼습니다.")
+    sys.exit(0)
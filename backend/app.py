@@ -1,41 +1,110 @@
 from flask import Flask, request, jsonify, session
 from flask_cors import CORS
 from flask_session import Session
-import redis
-import mysql.connector
-import json
 from datetime import datetime, timedelta, timezone
 import os
-from messaging_interface import async_log_api_stats
+import time
+from messaging_interface import async_log_api_stats, shutdown_api_stats_dispatcher, shutdown_kafka_producer, shutdown_eventhub_publisher
 from functools import wraps
 from werkzeug.security import generate_password_hash, check_password_hash
-from threading import Thread
 import hashlib
 from telemetry import telemetry_manager
+from db_pool import get_db_pool
+from redis_pool import get_redis_client
+import message_counters
+import api_log_stream
+from message_search import get_message_search, fetch_messages_by_ids
+from search_cache import get_search_cache
+from messaging_log_view import get_messaging_log_view, shutdown_messaging_log_view
+from session_activity import SessionActivity
+from session_store import create_serializer, SessionDetails
+from pagination import encode_cursor, decode_cursor, fetch_keyset_page, count_messages, InvalidCursorError
 
 app = Flask(__name__)
 CORS(app, supports_credentials=True)  # 세션을 위한 credentials 지원
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'your-secret-key-here')  # 세션을 위한 시크릿 키
 
+# gunicorn preload 모드(gunicorn.conf.py)에서는 프로세스별 자원(텔레메트리 Provider, 백그라운드 스레드)을
+# 마스터가 아닌 워커 fork 이후 init_worker()에서 초기화
+_defer_worker_init = os.getenv('DEFER_WORKER_INIT', 'false').lower() == 'true'
+
 # OpenTelemetry 설정
-telemetry_manager.setup_telemetry(app)
+telemetry_manager.setup_telemetry(app, defer_providers=_defer_worker_init)
 
 # Flask-Session 설정
 app.config['SESSION_TYPE'] = 'redis'
-app.config['SESSION_REDIS'] = redis.Redis(
-    host=os.getenv('REDIS_HOST', 'my-redis-master'),
-    port=6379,
-    password=os.getenv('REDIS_PASSWORD'),
-    db=1  # 세션용 별도 DB 사용
-)
+app.config['SESSION_REDIS'] = get_redis_client(db=1, decode_responses=False)  # 세션용 별도 DB 사용 (공유 연결 풀)
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=1)  # 세션 만료 시간을 1시간으로 설정
 app.config['SESSION_COOKIE_SECURE'] = False  # 개발 환경에서는 False, 프로덕션에서는 True
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'  # CSRF 보호
+# 변경되지 않은 세션은 요청마다 다시 저장하지 않음 (만료 연장은 update_session_activity의 touch로 처리)
+app.config['SESSION_REFRESH_EACH_REQUEST'] = False
 
 # Flask-Session 초기화
 Session(app)
 
+# 세션 직렬화 형식 (SESSION_SERIALIZER=compact|msgpack|json, 기존 형식의 세션도 읽을 수 있음)
+app.session_interface.serializer = create_serializer(app, os.getenv('SESSION_SERIALIZER', 'compact').lower())
+
+# 세션에서 거의 읽지 않는 필드 (user_agent, remote_addr)는 별도 Hash에 저장
+session_details = SessionDetails(
+    lambda: app.config['SESSION_REDIS'],
+    lifetime=app.permanent_session_lifetime.total_seconds()
+)
+
+# 세션 활동 시간 기록 (SESSION_ACTIVITY_WRITE_INTERVAL초마다 한 번만 세션 저장, 그 사이에는 EXPIRE로 만료 연장)
+session_activity = SessionActivity(
+    lambda: app.config['SESSION_REDIS'],
+    key_prefix=app.session_interface.key_prefix,
+    lifetime=app.permanent_session_lifetime.total_seconds(),
+    write_interval=float(os.getenv('SESSION_ACTIVITY_WRITE_INTERVAL', '60')),
+    touch=os.getenv('SESSION_ACTIVITY_TOUCH', 'true').lower() == 'true',
+    related_prefixes=(session_details.key_prefix,)
+)
+
+# 메시지 검색 엔진 (SEARCH_ENGINE=fulltext|like)
+message_search = get_message_search()
+
+# 검색 결과 캐시 (메시지 ID 목록만 저장)
+search_cache = get_search_cache(lambda: get_redis_connection())
+
+# 기존 api_logs 리스트가 남아 있으면 스트림으로 마이그레이션
+try:
+    api_log_stream.migrate_from_list(get_redis_client())
+except Exception as e:
+    print(f"Redis log migration error: {str(e)}")
+
+def init_worker():
+    """요청을 처리할 프로세스에서 한 번 호출합니다. (개발 서버는 import 시, gunicorn은 post_fork)
+    
+    DB/Redis 연결 풀, Kafka Producer 등은 pid를 확인하여 fork 이후 처음 사용할 때 새로 생성됩니다.
+    """
+    telemetry_manager.setup_after_fork()
+    
+    # 메시징 로그 뷰 (첫 조회 전에 미리 tail 시작)
+    get_messaging_log_view()
+    
+    # 메시지 카운터 주기적 재조정 (0이면 비활성화)
+    counter_reconcile_interval = int(os.getenv('MESSAGE_COUNTER_RECONCILE_INTERVAL', '3600'))
+    if counter_reconcile_interval > 0:
+        message_counters.start_reconciler(lambda: get_db_pool().connection(), counter_reconcile_interval, get_redis_client)
+
+def shutdown_worker():
+    """대기 중인 로그/메시지를 내보내고 텔레메트리를 종료합니다. (gunicorn worker_exit, 개발 서버 종료 시)
+    
+    텔레메트리가 종료되기 전에 Redis 로그/API 통계/메시징 전송을 먼저 정리합니다.
+    """
+    shutdown_messaging_log_view()
+    api_log_stream.shutdown_log_shipper()
+    shutdown_api_stats_dispatcher()
+    shutdown_kafka_producer()
+    shutdown_eventhub_publisher()
+    telemetry_manager.shutdown()
+
+if not _defer_worker_init:
+    init_worker()
+
 # datetime 객체를 JSON 직렬화 가능한 형태로 변환하는 함수
 def serialize_datetime(obj):
     if isinstance(obj, datetime):
@@ -58,18 +127,23 @@ def log_operation(operation_name, component="api", log_success=True, log_errors=
         @wraps(func)
         def wrapper(*args, **kwargs):
             tracer = telemetry_manager.get_tracer()
-            meter = telemetry_manager.get_meter()
-            
-            # 사용자 정보 추출
-            user_id = session.get('user_id', 'anonymous') if 'user_id' in session else 'anonymous'
+            start = time.perf_counter()
+            status = "error"
             
             with tracer.start_as_current_span(f"{operation_name}") as span:
+                # low overhead 모드에서는 샘플링되지 않은 요청의 속성/성공 로그를 생략 (메트릭은 항상 기록)
+                detailed = span.is_recording() or not telemetry_manager.low_overhead
+                user_id = None
                 try:
-                    # 공통 span 속성 설정
-                    span.set_attribute("user.id", user_id)
-                    span.set_attribute("operation.name", operation_name)
-                    span.set_attribute("component", component)
-                    span.set_attribute("remote.addr", request.remote_addr)
+                    if detailed:
+                        # 사용자 정보 추출
+                        user_id = session.get('user_id', 'anonymous')
+                        
+                        # 공통 span 속성 설정
+                        span.set_attribute("user.id", user_id)
+                        span.set_attribute("operation.name", operation_name)
+                        span.set_attribute("component", component)
+                        span.set_attribute("remote.addr", request.remote_addr)
                     
                     # 메트릭 기록
                     telemetry_manager.record_metric(f"{operation_name}_total", 1, {"status": "started"})
@@ -78,39 +152,62 @@ def log_operation(operation_name, component="api", log_success=True, log_errors=
                     result = func(*args, **kwargs)
                     
                     # 성공 로깅
-                    if log_success:
-                        telemetry_manager.log_info(f"{operation_name} completed successfully", {
+                    if log_success and detailed:
+                        telemetry_manager.log_info("%s completed successfully", lambda: {
                             "action": f"{operation_name}_success",
                             "user_id": user_id,
                             "component": component,
                             "remote_addr": request.remote_addr
-                        })
+                        }, args=(operation_name,), component=component)
                     
                     # 성공 메트릭
                     telemetry_manager.record_metric(f"{operation_name}_total", 1, {"status": "success"})
+                    status = "success"
                     
                     return result
                     
                 except Exception as e:
+                    if user_id is None:
+                        user_id = session.get('user_id', 'anonymous')
+                    
                     # 오류 span 속성 설정
                     span.set_attribute("error", True)
                     span.set_attribute("error.message", str(e))
                     
+                    # 샘플링되지 않은 요청의 오류는 항상 샘플링되는 별도 Span으로 기록
+                    if not span.is_recording():
+                        telemetry_manager.record_error_span(operation_name, e, {
+                            "user.id": user_id,
+                            "operation.name": operation_name,
+                            "component": component,
+                            "remote.addr": request.remote_addr
+                        }, parent_span=span)
+                    
                     # 오류 로깅
                     if log_errors:
-                        telemetry_manager.log_error(f"{operation_name} failed: {str(e)}", {
+                        telemetry_manager.log_error("%s failed: %s", lambda: {
                             "action": f"{operation_name}_error",
                             "user_id": user_id,
                             "error": str(e),
                             "component": component,
                             "remote_addr": request.remote_addr
-                        })
+                        }, args=(operation_name, e), component=component)
                     
                     # 오류 메트릭
                     telemetry_manager.record_metric(f"{operation_name}_total", 1, {"status": "error"})
                     
                     raise
                     
+                finally:
+                    # 작업별/상태별 처리 시간 (p50/p99 조회용)
+                    telemetry_manager.record_histogram("operation_duration_ms", (time.perf_counter() - start) * 1000, {
+                        "operation": operation_name,
+                        "component": component,
+                        "status": status
+                    })
+        
+        # 라우트별 샘플링 비율을 작업 이름으로 설정할 수 있도록 기록
+        wrapper.operation_name = operation_name
         return wrapper
     return decorator
 
@@ -127,7 +224,8 @@ def log_security_event(event_type, log_success=True, log_failures=True):
                 
                 # 성공 로깅 (로그인, 회원가입 성공 등)
                 if log_success:
-                    username = kwargs.get('username') or (request.json.get('username') if request.json else None)
+                    data = request.get_json(silent=True)
+                    username = kwargs.get('username') or (data.get('username') if data else None)
                     telemetry_manager.log_info(f"{event_type} successful", {
                         "action": f"{event_type}_success",
                         "username": username,
@@ -141,7 +239,8 @@ def log_security_event(event_type, log_success=True, log_failures=True):
             except Exception as e:
                 # 실패 로깅 (잘못된 인증 정보 등)
                 if log_failures:
-                    username = kwargs.get('username') or (request.json.get('username') if request.json else None)
+                    data = request.get_json(silent=True)
+                    username = kwargs.get('username') or (data.get('username') if data else None)
                     telemetry_manager.log_warn(f"{event_type} failed: {str(e)}", {
                         "action": f"{event_type}_failed",
                         "username": username,
@@ -158,87 +257,30 @@ def log_security_event(event_type, log_success=True, log_failures=True):
 # 세션 활동 시간 업데이트 미들웨어
 @app.before_request
 def update_session_activity():
-    """요청마다 세션 활동 시간을 업데이트합니다."""
+    """세션 활동 시간을 업데이트합니다. (일정 간격마다만 세션을 다시 저장)"""
     if 'user_id' in session:
-        # Flask-Session이 자동으로 세션을 Redis에 저장하므로
-        # 단순히 last_activity만 업데이트
-        session['last_activity'] = datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
-        session.modified = True  # 세션 변경사항을 Redis에 저장
-        
-        # 세션 활동 업데이트 로깅 (너무 자주 로깅되지 않도록 간헐적으로)
-        import random
-        if random.random() < 0.01:  # 1% 확률로만 로깅
-            telemetry_manager.log_info(f"Session activity updated for user {session['user_id']}", {
+        # 세션을 실제로 다시 저장할 때만 로깅 (세션당 최대 SESSION_ACTIVITY_WRITE_INTERVAL초에 한 번)
+        if session_activity.update(session):
+            user_id = session['user_id']
+            telemetry_manager.log_info("Session activity updated for user %s", lambda: {
                 "action": "session_activity_update",
-                "username": session['user_id'],
+                "username": user_id,
                 "remote_addr": request.remote_addr,
                 "component": "session"
-            })
+            }, args=(user_id,), component="session")
 
 # # 스레드 풀 생성
 # thread_pool = ThreadPoolExecutor(max_workers=5)
 
 # MariaDB 연결 함수
 def get_db_connection():
-    try:
-        connection = mysql.connector.connect(
-            host=os.getenv('MYSQL_HOST', 'my-mariadb'),
-            user=os.getenv('MYSQL_USER', 'testuser'),
-            password=os.getenv('MYSQL_PASSWORD'),
-            database="yejun-db",
-            connect_timeout=30
-        )
-        
-        # 데이터베이스 연결 성공 로깅
-        telemetry_manager.log_info("Database connection established", {
-            "action": "db_connect",
-            "host": os.getenv('MYSQL_HOST', 'my-mariadb'),
-            "database": "yejun-db",
-            "component": "database"
-        })
-        
-        return connection
-    except Exception as e:
-        # 데이터베이스 연결 실패 로깅
-        telemetry_manager.log_error(f"Database connection failed: {str(e)}", {
-            "action": "db_connect_error",
-            "host": os.getenv('MYSQL_HOST', 'my-mariadb'),
-            "database": "yejun-db",
-            "error": str(e),
-            "component": "database"
-        })
-        raise
+    """프로세스 전역 풀에서 연결을 빌려옵니다. with 문으로 사용하면 자동으로 반환됩니다."""
+    return get_db_pool().connection()
 
 # Redis 연결 함수
 def get_redis_connection():
-    try:
-        connection = redis.Redis(
-            host=os.getenv('REDIS_HOST', 'my-redis-master'),
-            port=6379,
-            password=os.getenv('REDIS_PASSWORD'),
-            decode_responses=True,
-            db=0
-        )
-        
-        # Redis 연결 성공 로깅
-        telemetry_manager.log_info("Redis connection established", {
-            "action": "redis_connect",
-            "host": os.getenv('REDIS_HOST', 'my-redis-master'),
-            "port": 6379,
-            "component": "redis"
-        })
-        
-        return connection
-    except Exception as e:
-        # Redis 연결 실패 로깅
-        telemetry_manager.log_error(f"Redis connection failed: {str(e)}", {
-            "action": "redis_connect_error",
-            "host": os.getenv('REDIS_HOST', 'my-redis-master'),
-            "port": 6379,
-            "error": str(e),
-            "component": "redis"
-        })
-        raise
+    """공유 연결 풀을 사용하는 Redis 클라이언트를 반환합니다. 닫을 필요가 없습니다."""
+    return get_redis_client()
 
 # 메시징 시스템 설정
 def get_messaging_system():
@@ -266,34 +308,25 @@ def get_messaging_system():
         print(f"❌ 메시징 시스템 초기화 오류: {str(e)}")
         return None
 
-# 로깅 함수
+# 로깅 함수 (큐에 추가만 하고 Redis 기록은 백그라운드에서 배치로 처리)
 def log_to_redis(action, details):
-    try:
-        redis_client = get_redis_connection()
-        log_entry = {
-            'timestamp': datetime.utcnow().replace(tzinfo=timezone.utc).isoformat(),
-            'action': action,
-            'details': details
-        }
-        redis_client.lpush('api_logs', json.dumps(log_entry))
-        redis_client.ltrim('api_logs', 0, 99)  # 최근 100개 로그만 유지
-        redis_client.close()
-        
-        # OpenTelemetry 로그 전송
-        telemetry_manager.log_info(f"Redis log: {action} - {details}", {
-            "action": action,
-            "component": "redis_logging"
-        })
-    except Exception as e:
-        print(f"Redis logging error: {str(e)}")
-        # OpenTelemetry 오류 로그 전송
-        telemetry_manager.log_error(f"Redis logging error: {str(e)}", {
-            "action": "redis_logging_error",
-            "error": str(e)
-        })
+    api_log_stream.get_log_shipper().submit(action, details)
 
 # API 통계 로깅은 messaging_interface에서 처리됩니다.
 
+# 커서 기반 페이지네이션 응답 생성
+def build_cursor_pagination(limit, next_cursor, prev_cursor, total_count):
+    pagination = {
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "has_more": next_cursor is not None
+    }
+    if total_count is not None:
+        pagination["total"] = total_count
+        pagination["total_pages"] = (total_count + limit - 1) // limit
+    return pagination
+
 # 로그인 데코레이터
 def login_required(f):
     @wraps(f)
@@ -310,14 +343,23 @@ def login_required(f):
 def save_to_db():
     user_id = session['user_id']
     
-    db = get_db_connection()
     data = request.json
-    cursor = db.cursor()
-    sql = "INSERT INTO messages (message, created_at, user_id) VALUES (%s, %s, %s)"
-    cursor.execute(sql, (data['message'], datetime.now(), user_id))
-    db.commit()
-    cursor.close()
-    db.close()
+    with get_db_connection() as db:
+        cursor = db.cursor()
+        sql = "INSERT INTO messages (message, created_at, user_id) VALUES (%s, %s, %s)"
+        cursor.execute(sql, (data['message'], datetime.now(), user_id))
+        # 메시지 수 카운터를 같은 트랜잭션에서 갱신
+        message_counters.increment(cursor, user_id)
+        db.commit()
+        cursor.close()
+    
+    # 새 메시지와 일치하는 검색 캐시만 무효화
+    try:
+        invalidated = search_cache.invalidate_matching(data['message'], message_search.matches)
+        if invalidated:
+            print(f"Search cache invalidated: {invalidated} queries")
+    except Exception as redis_error:
+        print(f"Redis cache invalidation error: {str(redis_error)}")
     
     # 로깅
     log_to_redis('db_insert', f"Message saved: {data['message'][:30]}... by {user_id}")
@@ -341,37 +383,67 @@ def get_from_db():
     if limit < 1 or limit > 100:
         limit = 20
     
+    cursor_token = request.args.get('cursor')
+    if cursor_token:
+        # 커서 기반 페이지네이션: (user_id, id) 인덱스 범위 스캔, total은 요청 시에만 조회
+        total_mode = request.args.get('total', 'none')
+        try:
+            decode_cursor(cursor_token)
+        except InvalidCursorError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        
+        with get_db_connection() as db:
+            cursor = db.cursor(dictionary=True)
+            messages, next_cursor, prev_cursor = fetch_keyset_page(
+                cursor, "user_id = %s", (user_id,), limit, cursor_token
+            )
+            total_count = count_messages(cursor, total_mode, user_id)
+            cursor.close()
+        
+        async_log_api_stats('/db/messages', 'GET', 'success', user_id)
+        
+        return jsonify({
+            "messages": messages,
+            "pagination": build_cursor_pagination(limit, next_cursor, prev_cursor, total_count)
+        })
+    
     # offset 계산
     offset = (page - 1) * limit
+    total_mode = request.args.get('total', 'exact')
     
-    db = get_db_connection()
-    cursor = db.cursor(dictionary=True)
-    
-    # 전체 메시지 수 조회
-    cursor.execute("SELECT COUNT(*) as total FROM messages WHERE user_id = %s", (user_id,))
-    total_count = cursor.fetchone()['total']
+    with get_db_connection() as db:
+        cursor = db.cursor(dictionary=True)
+        
+        # 전체 메시지 수 조회
+        total_count = count_messages(cursor, total_mode, user_id)
+        
+        # 페이지네이션된 메시지 조회
+        cursor.execute("SELECT * FROM messages WHERE user_id = %s ORDER BY id DESC LIMIT %s OFFSET %s", 
+                      (user_id, limit + 1, offset))
+        messages = cursor.fetchall()
+        cursor.close()
     
-    # 페이지네이션된 메시지 조회
-    cursor.execute("SELECT * FROM messages WHERE user_id = %s ORDER BY id DESC LIMIT %s OFFSET %s", 
-                  (user_id, limit, offset))
-    messages = cursor.fetchall()
-    cursor.close()
-    db.close()
+    has_more = len(messages) > limit
+    messages = messages[:limit]
     
     # 비동기 로깅으로 변경
     async_log_api_stats('/db/messages', 'GET', 'success', user_id)
     
     # 페이지네이션 정보와 함께 반환
+    pagination = {
+        "offset": offset,
+        "limit": limit,
+        "has_more": has_more,
+        "current_page": (offset // limit) + 1,
+        # 다음 페이지부터 커서 방식으로 이어서 조회할 수 있도록 제공
+        "next_cursor": encode_cursor(messages[-1]['id'], "next") if has_more else None
+    }
+    if total_count is not None:
+        pagination["total"] = total_count
+        pagination["total_pages"] = (total_count + limit - 1) // limit
     return jsonify({
         "messages": messages,
-        "pagination": {
-            "offset": offset,
-            "limit": limit,
-            "total": total_count,
-            "has_more": offset + limit < total_count,
-            "current_page": (offset // limit) + 1,
-            "total_pages": (total_count + limit - 1) // limit
-        }
+        "pagination": pagination
     })
 
 # Redis 로그 조회
@@ -392,19 +464,29 @@ def get_redis_logs():
         limit = 20
     
     redis_client = get_redis_connection()
-    all_logs = redis_client.lrange('api_logs', 0, -1)
-    redis_client.close()
-    
-    # JSON 파싱
-    logs = [json.loads(log) for log in all_logs]
     
-    # 전체 로그 수
-    total_count = len(logs)
+    cursor_token = request.args.get('cursor')
+    if cursor_token or request.args.get('since') or request.args.get('until'):
+        # 커서 기반 페이지네이션: 스트림 ID 범위(XREVRANGE/XRANGE)로 페이지 크기만큼만 조회
+        try:
+            since = api_log_stream.time_bound(request.args.get('since'))
+            until = api_log_stream.time_bound(request.args.get('until'))
+            logs, next_cursor, prev_cursor = api_log_stream.read_page(
+                redis_client, limit, cursor_token, since=since, until=until
+            )
+        except (InvalidCursorError, ValueError) as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        
+        # 시간 범위 필터가 있으면 전체 수를 세지 않음
+        total_count = None if since or until else redis_client.xlen(api_log_stream.STREAM_KEY)
+        return jsonify({
+            "logs": logs,
+            "pagination": build_cursor_pagination(limit, next_cursor, prev_cursor, total_count)
+        })
     
-    # 페이지네이션 적용
+    # page 방식: 최신 page * limit개만 읽음
     start_idx = (page - 1) * limit
-    end_idx = start_idx + limit
-    paginated_logs = logs[start_idx:end_idx]
+    paginated_logs, total_count = api_log_stream.read_offset_page(redis_client, start_idx, limit)
     
     return jsonify({
         "logs": paginated_logs,
@@ -431,20 +513,20 @@ def register():
     # 비밀번호 해시화
     hashed_password = generate_password_hash(password)
     
-    db = get_db_connection()
-    cursor = db.cursor()
-    
-    # 사용자명 중복 체크
-    cursor.execute("SELECT username FROM users WHERE username = %s", (username,))
-    if cursor.fetchone():
-        return jsonify({"status": "error", "message": "이미 존재하는 사용자명입니다"}), 400
-    
-    # 사용자 정보 저장
-    sql = "INSERT INTO users (username, password) VALUES (%s, %s)"
-    cursor.execute(sql, (username, hashed_password))
-    db.commit()
-    cursor.close()
-    db.close()
+    with get_db_connection() as db:
+        cursor = db.cursor()
+        
+        # 사용자명 중복 체크
+        cursor.execute("SELECT username FROM users WHERE username = %s", (username,))
+        if cursor.fetchone():
+            cursor.close()
+            return jsonify({"status": "error", "message": "이미 존재하는 사용자명입니다"}), 400
+        
+        # 사용자 정보 저장
+        sql = "INSERT INTO users (username, password) VALUES (%s, %s)"
+        cursor.execute(sql, (username, hashed_password))
+        db.commit()
+        cursor.close()
     
     return jsonify({"status": "success", "message": "회원가입이 완료되었습니다"})
 
@@ -459,12 +541,11 @@ def login():
     if not username or not password:
         return jsonify({"status": "error", "message": "사용자명과 비밀번호는 필수입니다"}), 400
     
-    db = get_db_connection()
-    cursor = db.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
-    user = cursor.fetchone()
-    cursor.close()
-    db.close()
+    with get_db_connection() as db:
+        cursor = db.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
+        user = cursor.fetchone()
+        cursor.close()
     
     if user and check_password_hash(user['password'], password):
         # 세션을 영구적으로 설정
@@ -472,13 +553,20 @@ def login():
         session['user_id'] = username
         session['login_time'] = datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
         session['last_activity'] = datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
-        session['user_agent'] = request.headers.get('User-Agent', '')
-        session['remote_addr'] = request.remote_addr or 'unknown'
         session['browser_id'] = hashlib.md5(f"{request.headers.get('User-Agent', '')}:{request.remote_addr or 'unknown'}".encode()).hexdigest()[:12]
         
         # Flask-Session이 자동으로 Redis에 저장
         session.modified = True
         
+        # 자주 읽지 않는 필드는 세션 밖의 Hash에 저장 (/session/status에서만 조회)
+        try:
+            session_details.save(session.sid, {
+                "user_agent": request.headers.get('User-Agent', ''),
+                "remote_addr": request.remote_addr or 'unknown'
+            })
+        except Exception as redis_error:
+            print(f"Session details save error: {str(redis_error)}")
+        
         return jsonify({
             "status": "success", 
             "message": "로그인 성공",
@@ -487,6 +575,16 @@ def login():
     
     return jsonify({"status": "error", "message": "잘못된 인증 정보"}), 401
 
+def _session_user_agent():
+    """세션 상세 Hash에서 user_agent를 읽습니다. (기존 형식의 세션은 세션 값 사용)"""
+    if 'user_agent' in session:
+        return session['user_agent']
+    try:
+        return session_details.get(session.sid, 'user_agent')
+    except Exception as redis_error:
+        print(f"Session details read error: {str(redis_error)}")
+        return None
+
 # 세션 상태 확인 엔드포인트
 @app.route('/session/status', methods=['GET'])
 @log_operation("session_status_check", "session", log_success=False)  # 성공 로깅 비활성화
@@ -499,7 +597,7 @@ def session_status():
             "username": username,
             "session_permanent": session.permanent,
             "browser_id": session.get('browser_id'),
-            "user_agent": session.get('user_agent'),
+            "user_agent": _session_user_agent(),
             "login_time": session.get('login_time'),
             "last_activity": session.get('last_activity')
         })
@@ -516,6 +614,12 @@ def session_status():
 def logout():
     username = session.get('user_id', 'unknown')
     
+    # 세션 상세 Hash 삭제
+    try:
+        session_details.delete(session.sid)
+    except Exception as redis_error:
+        print(f"Session details delete error: {str(redis_error)}")
+    
     # Flask-Session이 자동으로 세션을 삭제
     session.clear()
     session.permanent = False
@@ -539,34 +643,63 @@ def get_all_messages():
     if limit < 1 or limit > 100:
         limit = 20
     
+    cursor_token = request.args.get('cursor')
+    if cursor_token:
+        # 커서 기반 페이지네이션: 기본 키 범위 스캔, total은 요청 시에만 조회 (approx 지원)
+        total_mode = request.args.get('total', 'none')
+        try:
+            decode_cursor(cursor_token)
+        except InvalidCursorError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        
+        with get_db_connection() as db:
+            cursor = db.cursor(dictionary=True)
+            messages, next_cursor, prev_cursor = fetch_keyset_page(cursor, None, None, limit, cursor_token)
+            total_count = count_messages(cursor, total_mode)
+            cursor.close()
+        
+        async_log_api_stats('/db/messages/all', 'GET', 'success', user_id)
+        
+        return jsonify({
+            "messages": messages,
+            "pagination": build_cursor_pagination(limit, next_cursor, prev_cursor, total_count)
+        })
+    
     # offset 계산
     offset = (page - 1) * limit
+    total_mode = request.args.get('total', 'exact')
     
-    db = get_db_connection()
-    cursor = db.cursor(dictionary=True)
-    
-    # 전체 메시지 수 조회
-    cursor.execute("SELECT COUNT(*) as total FROM messages")
-    total_count = cursor.fetchone()['total']
+    with get_db_connection() as db:
+        cursor = db.cursor(dictionary=True)
+        
+        # 전체 메시지 수 조회
+        total_count = count_messages(cursor, total_mode)
+        
+        # 페이지네이션된 메시지 조회
+        cursor.execute("SELECT * FROM messages ORDER BY id DESC LIMIT %s OFFSET %s", (limit + 1, offset))
+        messages = cursor.fetchall()
+        cursor.close()
     
-    # 페이지네이션된 메시지 조회
-    cursor.execute("SELECT * FROM messages ORDER BY id DESC LIMIT %s OFFSET %s", (limit, offset))
-    messages = cursor.fetchall()
-    cursor.close()
-    db.close()
+    has_more = len(messages) > limit
+    messages = messages[:limit]
     
     # 비동기 로깅으로 변경
     async_log_api_stats('/db/messages/all', 'GET', 'success', user_id)
     
+    pagination = {
+        "page": page,
+        "limit": limit,
+        "current_page": page,
+        "has_more": has_more,
+        # 다음 페이지부터 커서 방식으로 이어서 조회할 수 있도록 제공
+        "next_cursor": encode_cursor(messages[-1]['id'], "next") if has_more else None
+    }
+    if total_count is not None:
+        pagination["total"] = total_count
+        pagination["total_pages"] = (total_count + limit - 1) // limit
     return jsonify({
         "messages": messages,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total_count,
-            "current_page": page,
-            "total_pages": (total_count + limit - 1) // limit
-        }
+        "pagination": pagination
     })
 
 # 메시지 검색 (DB에서 검색 + Redis 캐시)
@@ -599,97 +732,56 @@ def search_messages():
             }
         })
     
-    # 캐시 키 생성 (쿼리 해시만 사용)
-    query_hash = hashlib.md5(query.encode()).hexdigest()[:12]
-    cache_key = f"search:{query_hash}"
+    offset = (page - 1) * limit
     
-    # Redis에서 캐시 확인
+    # Redis에서 캐시 확인 (ID 목록만 캐시되어 있으므로 요청 페이지만 DB에서 조회)
+    cache_entry = None
     try:
-        redis_client = get_redis_connection()
-        cached_data = redis_client.get(cache_key)
-        
-        if cached_data:
-            cache_info = json.loads(cached_data)
-            # 캐시 히트 카운트 증가
-            cache_info['hit_count'] += 1
-            redis_client.set(cache_key, json.dumps(cache_info, default=serialize_datetime))
-            redis_client.expire(cache_key, 60)  # 1분 만료
-            redis_client.close()
-            
-            print(f"Cache HIT for query: {query} (hits: {cache_info['hit_count']})")
-            
-            # 비동기 로깅으로 변경
-            async_log_api_stats('/db/messages/search', 'GET', 'cache_hit', user_id)
-            
-            # 캐시된 결과에 페이지네이션 적용
-            all_results = cache_info['results']
-            total_count = len(all_results)
-            start_idx = (page - 1) * limit
-            end_idx = start_idx + limit
-            paginated_results = all_results[start_idx:end_idx]
-            
-            return jsonify({
-                "results": paginated_results,
-                "pagination": {
-                    "page": page,
-                    "limit": limit,
-                    "total": total_count,
-                    "current_page": page,
-                    "total_pages": (total_count + limit - 1) // limit
-                }
-            })
-        
-        redis_client.close()
+        cache_entry = search_cache.get(query)
     except Exception as redis_error:
         print(f"Redis cache error: {str(redis_error)}")
     
-    # 캐시 미스 - DB에서 검색
-    print(f"Cache MISS for query: {query}")
-    
-    db = get_db_connection()
-    cursor = db.cursor(dictionary=True)
-    
-    # 전체 검색 결과 수 조회
-    count_sql = "SELECT COUNT(*) as total FROM messages WHERE message LIKE %s"
-    cursor.execute(count_sql, (f"%{query}%",))
-    total_count = cursor.fetchone()['total']
-    
-    # 페이지네이션된 검색 결과 조회
-    sql = "SELECT * FROM messages WHERE message LIKE %s ORDER BY id DESC LIMIT %s OFFSET %s"
-    offset = (page - 1) * limit
-    cursor.execute(sql, (f"%{query}%", limit, offset))
-    results = cursor.fetchall()
-    cursor.close()
-    db.close()
-    
-    # 검색 결과를 캐시에 저장 (전체 결과)
-    try:
-        # 전체 결과를 다시 조회하여 캐시에 저장
-        db = get_db_connection()
+    if cache_entry is not None and search_cache.is_fresh(cache_entry):
+        source = "hit"
+    else:
+        # 캐시 미스/만료 - single-flight로 한 요청만 DB에서 검색하고 나머지는 결과(또는 stale)를 공유
+        print(f"Cache MISS for query: {query}")
+        
+        def load_search_ids():
+            with get_db_connection() as db:
+                cursor = db.cursor(dictionary=True)
+                # 전체 검색 결과 수 조회 (FULLTEXT 인덱스)
+                total = message_search.count(cursor, query)
+                # 캐시할 ID 목록 조회 (최대 SEARCH_CACHE_MAX_IDS개)
+                ids = [row['id'] for row in message_search.search(cursor, query, search_cache.max_ids, 0, columns="id")]
+                cursor.close()
+            return ids, total
+        
+        cache_entry, source = search_cache.fill(query, load_search_ids, stale=cache_entry)
+        print(f"Cache {source.upper()} for query: {query}")
+    
+    if source not in ("fill", "db"):
+        # 캐시 히트 카운트 증가 (레지스트리에만 기록, 결과 항목은 다시 쓰지 않음)
+        try:
+            hit_count = search_cache.record_hit(query)
+            print(f"Cache HIT for query: {query} (hits: {hit_count})")
+        except Exception as redis_error:
+            print(f"Redis cache error: {str(redis_error)}")
+    
+    # 요청 페이지는 ID 목록 범위 안이면 기본 키로, 아니면 직접 조회
+    page_ids = search_cache.page_ids(cache_entry, offset, limit)
+    with get_db_connection() as db:
         cursor = db.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM messages WHERE message LIKE %s ORDER BY id DESC", (f"%{query}%",))
-        all_results = cursor.fetchall()
+        if page_ids is not None:
+            results = fetch_messages_by_ids(cursor, page_ids)
+        else:
+            results = message_search.search(cursor, query, limit, offset)
         cursor.close()
-        db.close()
-        
-        redis_client = get_redis_connection()
-        cache_data = {
-            "query": query,
-            "results": all_results,
-            "timestamp": datetime.utcnow().replace(tzinfo=timezone.utc).isoformat(),
-            "expires_at": (datetime.utcnow() + timedelta(minutes=1)).replace(tzinfo=timezone.utc).isoformat(),
-            "hit_count": 1
-        }
-        redis_client.set(cache_key, json.dumps(cache_data, default=serialize_datetime))
-        redis_client.expire(cache_key, 60)  # 1분 만료
-        redis_client.close()
-        print(f"Cache STORED for query: {query}")
-    except Exception as redis_error:
-        print(f"Redis cache store error: {str(redis_error)}")
     
     # 검색 이력을 Kafka에 저장
-    async_log_api_stats('/db/messages/search', 'GET', 'success', user_id)
+    async_log_api_stats('/db/messages/search', 'GET', 'success' if source in ("fill", "db") else 'cache_hit', user_id)
     
+    total_count = cache_entry['total']
     return jsonify({
         "results": results,
         "pagination": {
@@ -718,24 +810,28 @@ def get_messaging_logs():
     if limit < 1 or limit > 100:
         limit = 20
     
-    # 메시징 시스템에서 로그 조회
-    messaging = get_messaging_system()
-    if messaging is None:
-        return jsonify({"status": "error", "message": "메시징 시스템을 초기화할 수 없습니다"}), 500
-        
-    all_logs = messaging.get_messages('api-logs', limit=1000)
-    messaging.close()
-    
-    # 시간 역순으로 정렬
-    all_logs.sort(key=lambda x: x['timestamp'], reverse=True)
-    
-    # 전체 로그 수
-    total_count = len(all_logs)
-    
-    # 페이지네이션 적용
     start_idx = (page - 1) * limit
-    end_idx = start_idx + limit
-    paginated_logs = all_logs[start_idx:end_idx]
+    
+    # 백그라운드에서 유지되는 최신 로그 뷰에서 바로 조회
+    log_view = get_messaging_log_view()
+    if log_view is not None:
+        paginated_logs, total_count = log_view.page(start_idx, limit)
+    else:
+        # 뷰 비활성화 시 메시징 시스템에서 직접 조회
+        messaging = get_messaging_system()
+        if messaging is None:
+            return jsonify({"status": "error", "message": "메시징 시스템을 초기화할 수 없습니다"}), 500
+            
+        # 파티션별 최신 1000개만 읽어 시간순으로 합친 결과를 최신순으로 정렬
+        all_logs = messaging.get_latest('api-logs', 1000)
+        messaging.close()
+        all_logs.reverse()
+        
+        # 전체 로그 수
+        total_count = len(all_logs)
+        
+        # 페이지네이션 적용
+        paginated_logs = all_logs[start_idx:start_idx + limit]
     
     return jsonify({
         "logs": paginated_logs,
@@ -755,41 +851,41 @@ def get_messaging_logs():
 def get_search_cache_stats():
     user_id = session['user_id']
     
+    # 페이지네이션 파라미터 처리 (히트 수 상위 순)
+    page = request.args.get('page', 1, type=int)
+    limit = request.args.get('limit', 20, type=int)
+    
+    # 파라미터 유효성 검사
+    if page < 1:
+        page = 1
+    if limit < 1 or limit > 100:
+        limit = 20
+    
     try:
-        redis_client = get_redis_connection()
-        
-        # 모든 검색 캐시 키 조회
-        cache_pattern = f"search:*"
-        cache_keys = redis_client.keys(cache_pattern)
-        
-        cache_stats = []
-        total_hits = 0
-        
-        for key in cache_keys:
-            try:
-                cached_data = redis_client.get(key)
-                if cached_data:
-                    cache_info = json.loads(cached_data)
-                    cache_stats.append({
-                        'query': cache_info['query'],
-                        'hit_count': cache_info['hit_count'],
-                        'timestamp': cache_info['timestamp'],
-                        'expires_at': cache_info['expires_at'],
-                        'results_count': len(cache_info['results'])
-                    })
-                    total_hits += cache_info['hit_count']
-            except Exception as e:
-                print(f"Error parsing cache data for key {key}: {str(e)}")
-                continue
+        registered = None
+        if request.args.get('rebuild', '').lower() in ('1', 'true'):
+            # 레지스트리 도입 전에 캐시된 항목 등록 (SCAN)
+            registered = search_cache.rebuild_registry()
         
-        redis_client.close()
+        stats = search_cache.stats(offset=(page - 1) * limit, limit=limit)
+        total_count = stats['total_cached_queries']
         
-        return jsonify({
+        response = {
             "status": "success",
-            "total_cached_queries": len(cache_stats),
-            "total_hits": total_hits,
-            "cache_stats": cache_stats
-        })
+            "total_cached_queries": total_count,
+            "total_hits": stats['total_hits'],
+            "cache_stats": stats['cache_stats'],
+            "pagination": {
+                "page": page,
+                "limit": limit,
+                "total": total_count,
+                "current_page": page,
+                "total_pages": (total_count + limit - 1) // limit
+            }
+        }
+        if registered is not None:
+            response["registered_count"] = registered
+        return jsonify(response)
         
     except Exception as redis_error:
         print(f"Redis cache stats error: {str(redis_error)}")
@@ -805,28 +901,17 @@ def clear_search_cache():
     query = data.get('query', '').strip() if data else ''
     
     try:
-        redis_client = get_redis_connection()
-        
         if query:
             # 특정 쿼리 캐시만 삭제
-            query_hash = hashlib.md5(query.encode()).hexdigest()[:12]
-            cache_key = f"search:{query_hash}"
-            deleted_count = redis_client.delete(cache_key)
+            deleted_count = search_cache.delete(query)
             
             message = f"쿼리 '{query}'의 캐시가 삭제되었습니다." if deleted_count > 0 else f"쿼리 '{query}'의 캐시를 찾을 수 없습니다."
         else:
             # 모든 검색 캐시 삭제
-            cache_pattern = f"search:*"
-            cache_keys = redis_client.keys(cache_pattern)
-            deleted_count = 0
-            
-            for key in cache_keys:
-                deleted_count += redis_client.delete(key)
+            deleted_count = search_cache.clear_all()
             
             message = f"{deleted_count}개의 검색 캐시가 삭제되었습니다."
         
-        redis_client.close()
-        
         return jsonify({
             "status": "success",
             "message": message,
@@ -837,6 +922,13 @@ def clear_search_cache():
         print(f"Redis cache clear error: {str(redis_error)}")
         return jsonify({"status": "error", "message": "캐시 삭제 중 오류가 발생했습니다"}), 500
 
+# 라우트 → 작업 이름 매핑 (OTEL_TRACES_SAMPLER_OVERRIDES에 작업 이름을 사용할 수 있도록)
+for rule in app.url_map.iter_rules():
+    operation = getattr(app.view_functions.get(rule.endpoint), 'operation_name', None)
+    if operation:
+        for method in rule.methods:
+            telemetry_manager.register_operation_route(method, rule.rule, operation)
+
 if __name__ == '__main__':
     # 애플리케이션 시작 로깅
     telemetry_manager.log_info("AKS Demo Backend application starting", {
@@ -854,7 +946,7 @@ if __name__ == '__main__':
             "action": "app_shutdown",
             "component": "application"
         })
-        telemetry_manager.shutdown()
+        shutdown_worker()
     except Exception as e:
         # 애플리케이션 오류 로깅
         telemetry_manager.log_error(f"Application error: {str(e)}", {
@@ -862,4 +954,4 @@ if __name__ == '__main__':
             "error": str(e),
             "component": "application"
         })
-        telemetry_manager.shutdown() 
\ No newline at end of file
+        shutdown_worker() 
\ No newline at end of file
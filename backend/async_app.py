@@ -0,0 +1,857 @@
+"""asyncio 백엔드 (Quart)
+
+app.py와 같은 API(/db/*, /logs/*, /cache/search/*, /register, /login, /logout, /session/status)를
+하나의 이벤트 루프에서 처리합니다. DB/Redis/메시징 I/O를 기다리는 동안 스레드를 점유하지 않으므로
+프로세스당 수천 개의 요청을 동시에 처리할 수 있습니다.
+
+사용법: hypercorn -c file:hypercorn.conf.py async_app:app
+
+- MariaDB: aiomysql (async_db), Redis: redis.asyncio (redis_pool.get_async_redis_client)
+- Kafka/Event Hubs: aiokafka / azure.eventhub.aio (async_messaging)
+- 세션, 검색 캐시, API 로그 스트림, 메시지 카운터의 저장 형식이 app.py와 같아 두 백엔드를 함께 운영할 수 있습니다.
+"""
+import os
+import re
+import time
+import asyncio
+import hashlib
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from quart import Quart, request, jsonify, session
+from quart_cors import cors
+from werkzeug.security import generate_password_hash, check_password_hash
+from telemetry import telemetry_manager
+from redis_pool import get_redis_client, get_async_redis_client, close_async_redis_clients
+import api_log_stream
+import async_db
+import async_log_stream
+from async_db import get_async_db_pool, close_async_db_pool
+from async_messaging import get_async_messaging, log_api_stats, shutdown_async_messaging
+from async_search_cache import get_async_search_cache
+from async_session import AsyncRedisSessionInterface, AsyncSessionActivity, AsyncSessionDetails
+from message_search import get_message_search
+from messaging_log_view import get_messaging_log_view, shutdown_messaging_log_view
+from session_store import create_serializer
+from pagination import encode_cursor, decode_cursor, InvalidCursorError
+
+app = Quart(__name__)
+# 세션을 위한 credentials 지원 (flask-cors supports_credentials와 같이 요청 Origin을 허용)
+app = cors(app, allow_credentials=True, allow_origin=re.compile(r".*"))
+app.secret_key = os.getenv('FLASK_SECRET_KEY', 'your-secret-key-here')
+
+# OpenTelemetry 설정 (HTTP 서버 Span은 ASGI 미들웨어로 기록)
+telemetry_manager.setup_telemetry()
+telemetry_manager.instrument_asgi_app(app)
+
+# 세션 설정 (app.py의 Flask-Session 설정과 같은 값)
+app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=1)
+app.config['SESSION_COOKIE_SECURE'] = False
+app.config['SESSION_COOKIE_HTTPONLY'] = True
+app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+app.config['SESSION_REFRESH_EACH_REQUEST'] = False
+
+
+def get_session_redis():
+    """세션용 Redis 클라이언트 (DB 1, 바이트 그대로 사용)"""
+    return get_async_redis_client(db=1, decode_responses=False)
+
+
+def get_redis_connection():
+    """로그/검색 캐시용 Redis 클라이언트 (DB 0)"""
+    return get_async_redis_client()
+
+
+# Flask-Session과 같은 키/직렬화 형식의 Redis 세션
+app.session_interface = AsyncRedisSessionInterface(
+    get_session_redis,
+    create_serializer(app, os.getenv('SESSION_SERIALIZER', 'compact').lower())
+)
+
+# 세션에서 거의 읽지 않는 필드 (user_agent, remote_addr)는 별도 Hash에 저장
+session_details = AsyncSessionDetails(
+    get_session_redis,
+    lifetime=app.permanent_session_lifetime.total_seconds()
+)
+
+# 세션 활동 시간 기록 (SESSION_ACTIVITY_WRITE_INTERVAL초마다 한 번만 세션 저장, 그 사이에는 EXPIRE로 만료 연장)
+session_activity = AsyncSessionActivity(
+    get_session_redis,
+    key_prefix=app.session_interface.key_prefix,
+    lifetime=app.permanent_session_lifetime.total_seconds(),
+    write_interval=float(os.getenv('SESSION_ACTIVITY_WRITE_INTERVAL', '60')),
+    touch=os.getenv('SESSION_ACTIVITY_TOUCH', 'true').lower() == 'true',
+    related_prefixes=(session_details.key_prefix,)
+)
+
+# 메시지 검색 엔진 (SEARCH_ENGINE=fulltext|like)
+message_search = get_message_search()
+
+# 검색 결과 캐시 (메시지 ID 목록만 저장)
+search_cache = get_async_search_cache(get_redis_connection)
+
+# Redis API 로그 기록기 (이벤트 루프가 시작된 뒤 init_worker에서 생성)
+log_shipper = None
+# 메시지 카운터 재조정 태스크
+counter_reconciler = None
+
+
+@app.before_serving
+async def init_worker():
+    """워커 프로세스의 이벤트 루프가 시작되면 한 번 호출됩니다."""
+    global log_shipper, counter_reconciler
+    telemetry_manager.setup_after_fork()
+    log_shipper = async_log_stream.create_log_shipper(get_redis_connection)
+
+    loop = asyncio.get_event_loop()
+    # 기존 api_logs 리스트가 남아 있으면 스트림으로 마이그레이션 (한 번만 실행되므로 동기 클라이언트 사용)
+    try:
+        await loop.run_in_executor(None, api_log_stream.migrate_from_list, get_redis_client())
+    except Exception as e:
+        print(f"Redis log migration error: {str(e)}")
+
+    # DB 연결 풀 워밍업
+    try:
+        await get_async_db_pool().open()
+    except Exception as e:
+        telemetry_manager.log_warn(f"Database pool warm-up failed: {str(e)}", {
+            "action": "db_pool_warm_up_error",
+            "error": str(e),
+            "component": "database"
+        })
+
+    # 메시징 로그 뷰 (lease를 얻은 워커 하나만 백그라운드 스레드에서 tail, 조회는 Redis에서)
+    get_messaging_log_view()
+
+    # 메시지 카운터 주기적 재조정 (aiomysql 풀을 사용하는 이벤트 루프 태스크, 0이면 비활성화)
+    counter_reconcile_interval = int(os.getenv('MESSAGE_COUNTER_RECONCILE_INTERVAL', '3600'))
+    if counter_reconcile_interval > 0:
+        counter_reconciler = loop.create_task(
+            async_db.run_counter_reconciler(counter_reconcile_interval, get_async_redis_client)
+        )
+
+
+@app.after_serving
+async def shutdown_worker():
+    """대기 중인 로그/메시지를 내보내고 연결 풀과 텔레메트리를 종료합니다."""
+    shutdown_messaging_log_view()
+    if counter_reconciler is not None:
+        counter_reconciler.cancel()
+        try:
+            await counter_reconciler
+        except asyncio.CancelledError:
+            pass
+    if log_shipper is not None:
+        await log_shipper.shutdown(float(os.getenv('REDIS_LOG_SHUTDOWN_TIMEOUT', '5')))
+    await shutdown_async_messaging()
+    await close_async_db_pool()
+    await close_async_redis_clients()
+    telemetry_manager.shutdown()
+
+
+# ===== 공통 로깅 데코레이터 (app.log_operation의 asyncio 버전) =====
+def log_operation(operation_name, component="api", log_success=True, log_errors=True):
+    """
+    코루틴 실행을 자동으로 로깅하는 데코레이터
+
+    Args:
+        operation_name: 작업 이름 (예: "db_insert", "user_login")
+        component: 컴포넌트 이름 (예: "database", "authentication")
+        log_success: 성공 시 로깅 여부
+        log_errors: 오류 시 로깅 여부
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            tracer = telemetry_manager.get_tracer()
+            start = time.perf_counter()
+            status = "error"
+
+            with tracer.start_as_current_span(f"{operation_name}") as span:
+                # low overhead 모드에서는 샘플링되지 않은 요청의 속성/성공 로그를 생략 (메트릭은 항상 기록)
+                detailed = span.is_recording() or not telemetry_manager.low_overhead
+                user_id = None
+                try:
+                    if detailed:
+                        user_id = session.get('user_id', 'anonymous')
+                        span.set_attribute("user.id", user_id)
+                        span.set_attribute("operation.name", operation_name)
+                        span.set_attribute("component", component)
+                        span.set_attribute("remote.addr", request.remote_addr)
+
+                    telemetry_manager.record_metric(f"{operation_name}_total", 1, {"status": "started"})
+
+                    result = await func(*args, **kwargs)
+
+                    if log_success and detailed:
+                        remote_addr = request.remote_addr
+                        telemetry_manager.log_info("%s completed successfully", lambda: {
+                            "action": f"{operation_name}_success",
+                            "user_id": user_id,
+                            "component": component,
+                            "remote_addr": remote_addr
+                        }, args=(operation_name,), component=component)
+
+                    telemetry_manager.record_metric(f"{operation_name}_total", 1, {"status": "success"})
+                    status = "success"
+
+                    return result
+
+                except Exception as e:
+                    if user_id is None:
+                        user_id = session.get('user_id', 'anonymous')
+                    remote_addr = request.remote_addr
+
+                    span.set_attribute("error", True)
+                    span.set_attribute("error.message", str(e))
+
+                    # 샘플링되지 않은 요청의 오류는 항상 샘플링되는 별도 Span으로 기록
+                    if not span.is_recording():
+                        telemetry_manager.record_error_span(operation_name, e, {
+                            "user.id": user_id,
+                            "operation.name": operation_name,
+                            "component": component,
+                            "remote.addr": remote_addr
+                        }, parent_span=span)
+
+                    if log_errors:
+                        telemetry_manager.log_error("%s failed: %s", lambda: {
+                            "action": f"{operation_name}_error",
+                            "user_id": user_id,
+                            "error": str(e),
+                            "component": component,
+                            "remote_addr": remote_addr
+                        }, args=(operation_name, e), component=component)
+
+                    telemetry_manager.record_metric(f"{operation_name}_total", 1, {"status": "error"})
+                    raise
+
+                finally:
+                    # 작업별/상태별 처리 시간 (p50/p99 조회용)
+                    telemetry_manager.record_histogram("operation_duration_ms", (time.perf_counter() - start) * 1000, {
+                        "operation": operation_name,
+                        "component": component,
+                        "status": status
+                    })
+
+        # 라우트별 샘플링 비율을 작업 이름으로 설정할 수 있도록 기록
+        wrapper.operation_name = operation_name
+        return wrapper
+    return decorator
+
+
+# ===== 보안 관련 로깅 데코레이터 =====
+def log_security_event(event_type, log_success=True, log_failures=True):
+    """
+    보안 관련 이벤트를 로깅하는 데코레이터
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                result = await func(*args, **kwargs)
+
+                # 성공 로깅 (로그인, 회원가입 성공 등)
+                if log_success:
+                    data = await request.get_json(silent=True)
+                    username = kwargs.get('username') or (data.get('username') if data else None)
+                    telemetry_manager.log_info(f"{event_type} successful", {
+                        "action": f"{event_type}_success",
+                        "username": username,
+                        "remote_addr": request.remote_addr,
+                        "user_agent": request.headers.get('User-Agent', ''),
+                        "component": "authentication"
+                    })
+
+                return result
+
+            except Exception as e:
+                # 실패 로깅 (잘못된 인증 정보 등)
+                if log_failures:
+                    data = await request.get_json(silent=True)
+                    username = kwargs.get('username') or (data.get('username') if data else None)
+                    telemetry_manager.log_warn(f"{event_type} failed: {str(e)}", {
+                        "action": f"{event_type}_failed",
+                        "username": username,
+                        "error": str(e),
+                        "remote_addr": request.remote_addr,
+                        "user_agent": request.headers.get('User-Agent', ''),
+                        "component": "authentication"
+                    })
+                raise
+
+        return wrapper
+    return decorator
+
+
+# 세션 활동 시간 업데이트 미들웨어
+@app.before_request
+async def update_session_activity():
+    """세션 활동 시간을 업데이트합니다. (일정 간격마다만 세션을 다시 저장)"""
+    if 'user_id' in session:
+        if await session_activity.update(session):
+            user_id = session['user_id']
+            remote_addr = request.remote_addr
+            telemetry_manager.log_info("Session activity updated for user %s", lambda: {
+                "action": "session_activity_update",
+                "username": user_id,
+                "remote_addr": remote_addr,
+                "component": "session"
+            }, args=(user_id,), component="session")
+
+
+# 로깅 함수 (큐에 추가만 하고 Redis 기록은 백그라운드 태스크에서 배치로 처리)
+def log_to_redis(action, details):
+    log_shipper.submit(action, details)
+
+
+# 비밀번호 해시는 CPU를 오래 사용하므로 이벤트 루프가 아닌 스레드 풀에서 계산
+async def run_blocking(func, *args):
+    return await asyncio.get_event_loop().run_in_executor(None, func, *args)
+
+
+# 커서 기반 페이지네이션 응답 생성
+def build_cursor_pagination(limit, next_cursor, prev_cursor, total_count):
+    pagination = {
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "has_more": next_cursor is not None
+    }
+    if total_count is not None:
+        pagination["total"] = total_count
+        pagination["total_pages"] = (total_count + limit - 1) // limit
+    return pagination
+
+
+# 페이지네이션 파라미터 처리
+def page_params():
+    page = request.args.get('page', 1, type=int)
+    limit = request.args.get('limit', 20, type=int)
+    if page < 1:
+        page = 1
+    if limit < 1 or limit > 100:
+        limit = 20
+    return page, limit
+
+
+# 로그인 데코레이터
+def login_required(f):
+    @wraps(f)
+    async def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            return jsonify({"status": "error", "message": "로그인이 필요합니다"}), 401
+        return await f(*args, **kwargs)
+    return decorated_function
+
+
+# MariaDB 엔드포인트
+@app.route('/db/message', methods=['POST'])
+@login_required
+@log_operation("save_message_to_db", "database")
+async def save_to_db():
+    user_id = session['user_id']
+
+    data = await request.get_json()
+    async with get_async_db_pool().connection() as db:
+        async with db.cursor() as cursor:
+            sql = "INSERT INTO messages (message, created_at, user_id) VALUES (%s, %s, %s)"
+            await cursor.execute(sql, (data['message'], datetime.now(), user_id))
+            # 메시지 수 카운터를 같은 트랜잭션에서 갱신
+            await async_db.increment_counter(cursor, user_id)
+        await db.commit()
+
+    # 새 메시지와 일치하는 검색 캐시만 무효화
+    try:
+        invalidated = await search_cache.invalidate_matching(data['message'], message_search.matches)
+        if invalidated:
+            print(f"Search cache invalidated: {invalidated} queries")
+    except Exception as redis_error:
+        print(f"Redis cache invalidation error: {str(redis_error)}")
+
+    log_to_redis('db_insert', f"Message saved: {data['message'][:30]}... by {user_id}")
+
+    log_api_stats('/db/message', 'POST', 'success', user_id)
+    return jsonify({"status": "success"})
+
+
+@app.route('/db/message', methods=['GET'])
+@login_required
+@log_operation("get_messages_from_db", "database")
+async def get_from_db():
+    user_id = session['user_id']
+    page, limit = page_params()
+
+    cursor_token = request.args.get('cursor')
+    if cursor_token:
+        # 커서 기반 페이지네이션: (user_id, id) 인덱스 범위 스캔, total은 요청 시에만 조회
+        total_mode = request.args.get('total', 'none')
+        try:
+            decode_cursor(cursor_token)
+        except InvalidCursorError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        async with get_async_db_pool().connection() as db:
+            async with db.cursor() as cursor:
+                messages, next_cursor, prev_cursor = await async_db.fetch_keyset_page(
+                    cursor, "user_id = %s", (user_id,), limit, cursor_token
+                )
+                total_count = await async_db.count_messages(cursor, total_mode, user_id)
+
+        log_api_stats('/db/messages', 'GET', 'success', user_id)
+
+        return jsonify({
+            "messages": messages,
+            "pagination": build_cursor_pagination(limit, next_cursor, prev_cursor, total_count)
+        })
+
+    offset = (page - 1) * limit
+    total_mode = request.args.get('total', 'exact')
+
+    async with get_async_db_pool().connection() as db:
+        async with db.cursor() as cursor:
+            total_count = await async_db.count_messages(cursor, total_mode, user_id)
+            await cursor.execute("SELECT * FROM messages WHERE user_id = %s ORDER BY id DESC LIMIT %s OFFSET %s",
+                                 (user_id, limit + 1, offset))
+            messages = list(await cursor.fetchall())
+
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+
+    log_api_stats('/db/messages', 'GET', 'success', user_id)
+
+    pagination = {
+        "offset": offset,
+        "limit": limit,
+        "has_more": has_more,
+        "current_page": (offset // limit) + 1,
+        # 다음 페이지부터 커서 방식으로 이어서 조회할 수 있도록 제공
+        "next_cursor": encode_cursor(messages[-1]['id'], "next") if has_more else None
+    }
+    if total_count is not None:
+        pagination["total"] = total_count
+        pagination["total_pages"] = (total_count + limit - 1) // limit
+    return jsonify({
+        "messages": messages,
+        "pagination": pagination
+    })
+
+
+# Redis 로그 조회
+@app.route('/logs/redis', methods=['GET'])
+@login_required
+@log_operation("get_redis_logs", "logs")
+async def get_redis_logs():
+    page, limit = page_params()
+    redis_client = get_redis_connection()
+
+    cursor_token = request.args.get('cursor')
+    if cursor_token or request.args.get('since') or request.args.get('until'):
+        # 커서 기반 페이지네이션: 스트림 ID 범위(XREVRANGE/XRANGE)로 페이지 크기만큼만 조회
+        try:
+            since = api_log_stream.time_bound(request.args.get('since'))
+            until = api_log_stream.time_bound(request.args.get('until'))
+            logs, next_cursor, prev_cursor = await async_log_stream.read_page(
+                redis_client, limit, cursor_token, since=since, until=until
+            )
+        except (InvalidCursorError, ValueError) as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        # 시간 범위 필터가 있으면 전체 수를 세지 않음
+        total_count = None if since or until else await redis_client.xlen(api_log_stream.STREAM_KEY)
+        return jsonify({
+            "logs": logs,
+            "pagination": build_cursor_pagination(limit, next_cursor, prev_cursor, total_count)
+        })
+
+    # page 방식: 최신 page * limit개만 읽음
+    start_idx = (page - 1) * limit
+    paginated_logs, total_count = await async_log_stream.read_offset_page(redis_client, start_idx, limit)
+
+    return jsonify({
+        "logs": paginated_logs,
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total_count,
+            "current_page": page,
+            "total_pages": (total_count + limit - 1) // limit
+        }
+    })
+
+
+# 회원가입 엔드포인트
+@app.route('/register', methods=['POST'])
+@log_security_event("user_registration")
+async def register():
+    data = await request.get_json()
+    username = data.get('username')
+    password = data.get('password')
+
+    if not username or not password:
+        return jsonify({"status": "error", "message": "사용자명과 비밀번호는 필수입니다"}), 400
+
+    hashed_password = await run_blocking(generate_password_hash, password)
+
+    async with get_async_db_pool().connection() as db:
+        async with db.cursor() as cursor:
+            # 사용자명 중복 체크
+            await cursor.execute("SELECT username FROM users WHERE username = %s", (username,))
+            if await cursor.fetchone():
+                return jsonify({"status": "error", "message": "이미 존재하는 사용자명입니다"}), 400
+
+            await cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)", (username, hashed_password))
+        await db.commit()
+
+    return jsonify({"status": "success", "message": "회원가입이 완료되었습니다"})
+
+
+# 로그인 엔드포인트
+@app.route('/login', methods=['POST'])
+@log_security_event("user_login")
+async def login():
+    data = await request.get_json()
+    username = data.get('username')
+    password = data.get('password')
+
+    if not username or not password:
+        return jsonify({"status": "error", "message": "사용자명과 비밀번호는 필수입니다"}), 400
+
+    async with get_async_db_pool().connection() as db:
+        async with db.cursor() as cursor:
+            await cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
+            user = await cursor.fetchone()
+
+    if user and await run_blocking(check_password_hash, user['password'], password):
+        now = datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
+        session.permanent = True
+        session['user_id'] = username
+        session['login_time'] = now
+        session['last_activity'] = now
+        session['browser_id'] = hashlib.md5(f"{request.headers.get('User-Agent', '')}:{request.remote_addr or 'unknown'}".encode()).hexdigest()[:12]
+        session.modified = True
+
+        # 자주 읽지 않는 필드는 세션 밖의 Hash에 저장 (/session/status에서만 조회)
+        try:
+            await session_details.save(session.sid, {
+                "user_agent": request.headers.get('User-Agent', ''),
+                "remote_addr": request.remote_addr or 'unknown'
+            })
+        except Exception as redis_error:
+            print(f"Session details save error: {str(redis_error)}")
+
+        return jsonify({
+            "status": "success",
+            "message": "로그인 성공",
+            "username": username
+        })
+
+    return jsonify({"status": "error", "message": "잘못된 인증 정보"}), 401
+
+
+async def _session_user_agent():
+    """세션 상세 Hash에서 user_agent를 읽습니다. (기존 형식의 세션은 세션 값 사용)"""
+    if 'user_agent' in session:
+        return session['user_agent']
+    try:
+        return await session_details.get(session.sid, 'user_agent')
+    except Exception as redis_error:
+        print(f"Session details read error: {str(redis_error)}")
+        return None
+
+
+# 세션 상태 확인 엔드포인트
+@app.route('/session/status', methods=['GET'])
+@log_operation("session_status_check", "session", log_success=False)  # 성공 로깅 비활성화
+async def session_status():
+    if 'user_id' in session:
+        return jsonify({
+            "status": "success",
+            "logged_in": True,
+            "username": session['user_id'],
+            "session_permanent": session.permanent,
+            "browser_id": session.get('browser_id'),
+            "user_agent": await _session_user_agent(),
+            "login_time": session.get('login_time'),
+            "last_activity": session.get('last_activity')
+        })
+    else:
+        return jsonify({
+            "status": "success",
+            "logged_in": False,
+            "username": None
+        })
+
+
+# 로그아웃 엔드포인트
+@app.route('/logout', methods=['POST'])
+@log_security_event("user_logout")
+async def logout():
+    try:
+        await session_details.delete(session.sid)
+    except Exception as redis_error:
+        print(f"Session details delete error: {str(redis_error)}")
+
+    # 비워진 세션은 응답 시 Redis에서 삭제됨
+    session.clear()
+    session.permanent = False
+
+    return jsonify({"status": "success", "message": "로그아웃 성공"})
+
+
+# 전체 메시지 조회 (모든 사용자의 메시지)
+@app.route('/db/messages', methods=['GET'])
+@login_required
+@log_operation("get_all_messages", "database")
+async def get_all_messages():
+    user_id = session['user_id']
+    page, limit = page_params()
+
+    cursor_token = request.args.get('cursor')
+    if cursor_token:
+        # 커서 기반 페이지네이션: 기본 키 범위 스캔, total은 요청 시에만 조회
+        total_mode = request.args.get('total', 'none')
+        try:
+            decode_cursor(cursor_token)
+        except InvalidCursorError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        async with get_async_db_pool().connection() as db:
+            async with db.cursor() as cursor:
+                messages, next_cursor, prev_cursor = await async_db.fetch_keyset_page(
+                    cursor, None, None, limit, cursor_token
+                )
+                total_count = await async_db.count_messages(cursor, total_mode)
+
+        log_api_stats('/db/messages/all', 'GET', 'success', user_id)
+
+        return jsonify({
+            "messages": messages,
+            "pagination": build_cursor_pagination(limit, next_cursor, prev_cursor, total_count)
+        })
+
+    offset = (page - 1) * limit
+    total_mode = request.args.get('total', 'exact')
+
+    async with get_async_db_pool().connection() as db:
+        async with db.cursor() as cursor:
+            total_count = await async_db.count_messages(cursor, total_mode)
+            await cursor.execute("SELECT * FROM messages ORDER BY id DESC LIMIT %s OFFSET %s", (limit + 1, offset))
+            messages = list(await cursor.fetchall())
+
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+
+    log_api_stats('/db/messages/all', 'GET', 'success', user_id)
+
+    pagination = {
+        "page": page,
+        "limit": limit,
+        "current_page": page,
+        "has_more": has_more,
+        # 다음 페이지부터 커서 방식으로 이어서 조회할 수 있도록 제공
+        "next_cursor": encode_cursor(messages[-1]['id'], "next") if has_more else None
+    }
+    if total_count is not None:
+        pagination["total"] = total_count
+        pagination["total_pages"] = (total_count + limit - 1) // limit
+    return jsonify({
+        "messages": messages,
+        "pagination": pagination
+    })
+
+
+# 메시지 검색 (DB에서 검색 + Redis 캐시)
+@app.route('/db/messages/search', methods=['GET'])
+@login_required
+@log_operation("search_messages", "search")
+async def search_messages():
+    query = request.args.get('q', '').strip()
+    user_id = session['user_id']
+    page, limit = page_params()
+
+    if not query:
+        return jsonify({
+            "results": [],
+            "pagination": {
+                "page": page,
+                "limit": limit,
+                "total": 0,
+                "current_page": page,
+                "total_pages": 0
+            }
+        })
+
+    offset = (page - 1) * limit
+
+    # Redis에서 캐시 확인 (ID 목록만 캐시되어 있으므로 요청 페이지만 DB에서 조회)
+    cache_entry = None
+    try:
+        cache_entry = await search_cache.get(query)
+    except Exception as redis_error:
+        print(f"Redis cache error: {str(redis_error)}")
+
+    if cache_entry is not None and search_cache.is_fresh(cache_entry):
+        source = "hit"
+    else:
+        # 캐시 미스/만료 - single-flight로 한 요청만 DB에서 검색하고 나머지는 결과(또는 stale)를 공유
+        async def load_search_ids():
+            async with get_async_db_pool().connection() as db:
+                async with db.cursor() as cursor:
+                    total = await async_db.search_count(cursor, message_search, query)
+                    rows = await async_db.search(cursor, message_search, query, search_cache.max_ids, 0, columns="id")
+            return [row['id'] for row in rows], total
+
+        cache_entry, source = await search_cache.fill(query, load_search_ids, stale=cache_entry)
+
+    if source not in ("fill", "db"):
+        # 캐시 히트 카운트 증가 (레지스트리에만 기록, 결과 항목은 다시 쓰지 않음)
+        try:
+            await search_cache.record_hit(query)
+        except Exception as redis_error:
+            print(f"Redis cache error: {str(redis_error)}")
+
+    # 요청 페이지는 ID 목록 범위 안이면 기본 키로, 아니면 직접 조회
+    page_ids = search_cache.page_ids(cache_entry, offset, limit)
+    async with get_async_db_pool().connection() as db:
+        async with db.cursor() as cursor:
+            if page_ids is not None:
+                results = await async_db.fetch_messages_by_ids(cursor, page_ids)
+            else:
+                results = await async_db.search(cursor, message_search, query, limit, offset)
+
+    log_api_stats('/db/messages/search', 'GET', 'success' if source in ("fill", "db") else 'cache_hit', user_id)
+
+    total_count = cache_entry['total']
+    return jsonify({
+        "results": results,
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total_count,
+            "current_page": page,
+            "total_pages": (total_count + limit - 1) // limit
+        }
+    })
+
+
+# 메시징 시스템 로그 조회 엔드포인트
+@app.route('/logs/messaging', methods=['GET'])
+@login_required
+@log_operation("get_messaging_logs", "messaging")
+async def get_messaging_logs():
+    page, limit = page_params()
+    start_idx = (page - 1) * limit
+
+    # 백그라운드에서 유지되는 최신 로그 뷰에서 바로 조회
+    log_view = get_messaging_log_view()
+    if log_view is not None:
+        try:
+            pipe = get_async_redis_client().pipeline(transaction=False)
+            log_view.queue_page(pipe, start_idx, limit)
+            paginated_logs, total_count = log_view.page_result(await pipe.execute())
+        except Exception as e:
+            print(f"Messaging log view read error: {str(e)}")
+            paginated_logs, total_count = [], 0
+    else:
+        # 뷰 비활성화 시 메시징 시스템에서 직접 조회
+        try:
+            messaging = get_async_messaging()
+        except Exception as e:
+            print(f"❌ 메시징 시스템 초기화 오류: {str(e)}")
+            return jsonify({"status": "error", "message": "메시징 시스템을 초기화할 수 없습니다"}), 500
+
+        # 파티션별 최신 1000개만 읽어 시간순으로 합친 결과를 최신순으로 정렬
+        all_logs = await messaging.get_latest('api-logs', 1000)
+        all_logs.reverse()
+        total_count = len(all_logs)
+        paginated_logs = all_logs[start_idx:start_idx + limit]
+
+    return jsonify({
+        "logs": paginated_logs,
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total_count,
+            "current_page": page,
+            "total_pages": (total_count + limit - 1) // limit
+        }
+    })
+
+
+# 검색 캐시 통계 조회
+@app.route('/cache/search/stats', methods=['GET'])
+@login_required
+@log_operation("get_cache_stats", "cache", log_success=False)  # 성공 로깅 비활성화
+async def get_search_cache_stats():
+    page, limit = page_params()
+
+    try:
+        registered = None
+        if request.args.get('rebuild', '').lower() in ('1', 'true'):
+            # 레지스트리 도입 전에 캐시된 항목 등록 (SCAN)
+            registered = await search_cache.rebuild_registry()
+
+        stats = await search_cache.stats(offset=(page - 1) * limit, limit=limit)
+        total_count = stats['total_cached_queries']
+
+        response = {
+            "status": "success",
+            "total_cached_queries": total_count,
+            "total_hits": stats['total_hits'],
+            "cache_stats": stats['cache_stats'],
+            "pagination": {
+                "page": page,
+                "limit": limit,
+                "total": total_count,
+                "current_page": page,
+                "total_pages": (total_count + limit - 1) // limit
+            }
+        }
+        if registered is not None:
+            response["registered_count"] = registered
+        return jsonify(response)
+
+    except Exception as redis_error:
+        print(f"Redis cache stats error: {str(redis_error)}")
+        return jsonify({"status": "error", "message": "캐시 통계 조회 중 오류가 발생했습니다"}), 500
+
+
+# 검색 캐시 삭제
+@app.route('/cache/search/clear', methods=['POST'])
+@login_required
+@log_operation("clear_cache", "cache")
+async def clear_search_cache():
+    data = await request.get_json(silent=True)
+    query = data.get('query', '').strip() if data else ''
+
+    try:
+        if query:
+            # 특정 쿼리 캐시만 삭제
+            deleted_count = await search_cache.delete(query)
+            message = f"쿼리 '{query}'의 캐시가 삭제되었습니다." if deleted_count > 0 else f"쿼리 '{query}'의 캐시를 찾을 수 없습니다."
+        else:
+            # 모든 검색 캐시 삭제
+            deleted_count = await search_cache.clear_all()
+            message = f"{deleted_count}개의 검색 캐시가 삭제되었습니다."
+
+        return jsonify({
+            "status": "success",
+            "message": message,
+            "deleted_count": deleted_count
+        })
+
+    except Exception as redis_error:
+        print(f"Redis cache clear error: {str(redis_error)}")
+        return jsonify({"status": "error", "message": "캐시 삭제 중 오류가 발생했습니다"}), 500
+
+
+# 라우트 → 작업 이름 매핑 (OTEL_TRACES_SAMPLER_OVERRIDES에 작업 이름을 사용할 수 있도록)
+for rule in app.url_map.iter_rules():
+    operation = getattr(app.view_functions.get(rule.endpoint), 'operation_name', None)
+    if operation:
+        for method in rule.methods:
+            telemetry_manager.register_operation_route(method, rule.rule, operation)
+
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=5000)
@@ -0,0 +1,266 @@
+import os
+import time
+import asyncio
+from contextlib import asynccontextmanager
+import aiomysql
+import message_counters
+from db_pool import PoolTimeoutError
+from message_search import ER_FT_MATCHING_KEY_NOT_FOUND, ids_query, order_by_ids
+from pagination import keyset_query, keyset_page
+from telemetry import telemetry_manager
+
+
+class AsyncDatabasePool:
+    """asyncio용 MariaDB 연결 풀 (aiomysql)
+
+    설정은 DatabaseConnectionPool과 같은 환경 변수를 사용합니다.
+    연결을 기다리는 동안 이벤트 루프를 막지 않으므로 max_size보다 많은 요청이 동시에 대기할 수 있습니다.
+    - max_lifetime: 유휴 연결 재사용 제한 시간(초), 초과 시 폐기 후 재연결 (aiomysql pool_recycle)
+    - borrow_timeout: 연결을 빌려올 때 최대 대기 시간(초)
+    """
+
+    def __init__(self, connect_kwargs, min_size=1, max_size=10, max_lifetime=1800, borrow_timeout=10,
+                 name="mariadb-async"):
+        self.connect_kwargs = connect_kwargs
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.max_lifetime = max_lifetime
+        self.borrow_timeout = borrow_timeout
+        self.name = name
+        self._pool = None
+        # 동시에 처음 연결하는 요청들이 각자 풀을 만들지 않도록 open()을 직렬화
+        self._open_lock = asyncio.Lock()
+
+        telemetry_manager.register_gauge(
+            "db_pool_connections_in_use", lambda: self._pool.size - self._pool.freesize if self._pool else 0,
+            {"pool": self.name}, description="사용 중인 DB 연결 수"
+        )
+        telemetry_manager.register_gauge(
+            "db_pool_connections_idle", lambda: self._pool.freesize if self._pool else 0,
+            {"pool": self.name}, description="유휴 DB 연결 수"
+        )
+
+    async def open(self):
+        """min_size만큼 연결을 미리 생성합니다. 이미 열려 있으면 아무것도 하지 않습니다."""
+        async with self._open_lock:
+            if self._pool is not None:
+                return
+            try:
+                self._pool = await aiomysql.create_pool(
+                    minsize=self.min_size,
+                    maxsize=self.max_size,
+                    pool_recycle=self.max_lifetime if self.max_lifetime > 0 else -1,
+                    autocommit=False,
+                    cursorclass=aiomysql.DictCursor,
+                    **self.connect_kwargs
+                )
+                telemetry_manager.log_info("Database connection pool opened", lambda: {
+                    "action": "db_connect",
+                    "host": self.connect_kwargs.get('host'),
+                    "database": self.connect_kwargs.get('db'),
+                    "asyncio": True,
+                    "component": "database"
+                }, component="database")
+            except Exception as e:
+                telemetry_manager.log_error("Database connection failed: %s", lambda: {
+                    "action": "db_connect_error",
+                    "host": self.connect_kwargs.get('host'),
+                    "database": self.connect_kwargs.get('db'),
+                    "error": str(e),
+                    "component": "database"
+                }, args=(e,), component="database")
+                raise
+
+    @asynccontextmanager
+    async def connection(self):
+        """async with 문으로 연결을 빌려오고 블록이 끝나면 반환합니다."""
+        if self._pool is None:
+            await self.open()
+        start = time.monotonic()
+        try:
+            connection = await asyncio.wait_for(self._pool.acquire(), self.borrow_timeout)
+        except asyncio.TimeoutError:
+            telemetry_manager.record_metric("db_pool_borrow_timeouts_total", 1, {"pool": self.name})
+            raise PoolTimeoutError(
+                f"{self.borrow_timeout}초 안에 {self.name} 연결을 빌려오지 못했습니다 (max_size={self.max_size})"
+            )
+        telemetry_manager.record_histogram(
+            "db_pool_wait_time_ms", (time.monotonic() - start) * 1000, {"pool": self.name}
+        )
+        try:
+            yield connection
+        finally:
+            # 커밋되지 않은 트랜잭션은 되돌린 뒤 반환 (되돌리지 못하면 aiomysql이 연결을 닫음)
+            if not connection.closed and connection.get_transaction_status():
+                try:
+                    await connection.rollback()
+                except Exception:
+                    pass
+            self._pool.release(connection)
+
+    def stats(self):
+        """풀 상태를 반환합니다."""
+        size = self._pool.size if self._pool else 0
+        idle = self._pool.freesize if self._pool else 0
+        return {"size": size, "in_use": size - idle, "idle": idle, "max_size": self.max_size}
+
+    async def close(self):
+        """연결을 모두 닫고 풀을 종료합니다."""
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+
+_pool = None
+
+
+def get_async_db_pool():
+    """환경 변수 설정으로 이벤트 루프 전역 연결 풀을 반환합니다. (연결은 처음 사용할 때 생성)
+
+    get_db_pool과 같은 MYSQL_*/DB_POOL_* 설정을 사용하며, DB_POOL_MAX_SIZE가 프로세스당 최대 연결 수입니다.
+    """
+    global _pool
+    if _pool is None:
+        _pool = AsyncDatabasePool(
+            connect_kwargs={
+                "host": os.getenv('MYSQL_HOST', 'my-mariadb'),
+                "user": os.getenv('MYSQL_USER', 'testuser'),
+                "password": os.getenv('MYSQL_PASSWORD') or '',
+                "db": "yejun-db",
+                "connect_timeout": int(os.getenv('DB_CONNECT_TIMEOUT', '30'))
+            },
+            min_size=int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+            max_size=int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            max_lifetime=float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),
+            borrow_timeout=float(os.getenv('DB_POOL_BORROW_TIMEOUT', '10'))
+        )
+    return _pool
+
+
+async def close_async_db_pool():
+    """연결 풀을 닫습니다. (이벤트 루프 종료 전에 호출)"""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.close()
+
+
+# ===== 조회 헬퍼 (pagination, message_counters, message_search의 asyncio 버전) =====
+
+async def fetch_keyset_page(cursor, where, params, limit, token=None):
+    """pagination.fetch_keyset_page의 asyncio 버전"""
+    sql, args, direction = keyset_query(where, params, limit, token)
+    await cursor.execute(sql, args)
+    return keyset_page(await cursor.fetchall(), limit, direction, token)
+
+
+async def increment_counter(cursor, user_id, delta=1):
+    """message_counters.increment의 asyncio 버전 (메시지 INSERT와 같은 트랜잭션에서 호출)"""
+    await cursor.execute(message_counters.INCREMENT_SQL, message_counters.increment_args(user_id, delta))
+
+
+async def count_messages(cursor, mode, user_id=None):
+    """pagination.count_messages의 asyncio 버전"""
+    if mode == "none":
+        return None
+    await cursor.execute(message_counters.COUNTER_SQL, (message_counters.scope_for(user_id),))
+    row = await cursor.fetchone()
+    if row is None:
+        await cursor.execute(*message_counters.fallback_count_query(user_id))
+        row = await cursor.fetchone()
+    return message_counters.row_total(row)
+
+
+async def _repair_counter_scope(db, cursor, scope):
+    """message_counters._repair_scope의 asyncio 버전"""
+    try:
+        await cursor.execute(message_counters.LOCK_COUNTER_SQL, (scope,))
+        row = await cursor.fetchone()
+        await cursor.execute(*message_counters.fallback_count_query(message_counters.user_for_scope(scope)))
+        item = message_counters.repaired_item(scope, row, await cursor.fetchone())
+        if item is not None:
+            await cursor.execute(message_counters.REPAIR_SQL, (scope, item["actual"]))
+        await db.commit()
+        return item
+    except Exception:
+        await db.rollback()
+        raise
+
+
+async def reconcile_counters(db, repair=False):
+    """message_counters.reconcile의 asyncio 버전"""
+    async with db.cursor() as cursor:
+        await cursor.execute(message_counters.COUNTER_SNAPSHOT_SQL)
+        counter_rows = await cursor.fetchall()
+        await cursor.execute(message_counters.ACTUAL_COUNTS_SQL)
+        drift = message_counters.find_drift(counter_rows, await cursor.fetchall())
+        await db.commit()
+
+        if repair and drift:
+            # 스냅샷의 차이는 진행 중이던 트랜잭션 때문일 수 있으므로 잠근 뒤 다시 확인
+            repaired = [await _repair_counter_scope(db, cursor, d["scope"]) for d in drift]
+            drift = [item for item in repaired if item is not None]
+
+    message_counters.record_drift(drift, repair)
+    return drift
+
+
+async def acquire_counter_lease(client, interval):
+    """message_counters.acquire_lease의 asyncio 버전 (redis.asyncio 클라이언트)"""
+    try:
+        return bool(await client.set(message_counters.RECONCILE_LEASE_KEY, os.getpid(), nx=True,
+                                     px=int(interval * 1000)))
+    except Exception as e:
+        print(f"Message counter lease error: {str(e)}")
+        return False
+
+
+async def run_counter_reconciler(interval, get_client):
+    """message_counters.start_reconciler의 asyncio 버전 (이벤트 루프의 태스크로 실행, aiomysql 풀 사용)"""
+    while True:
+        if await acquire_counter_lease(get_client(), interval):
+            try:
+                async with get_async_db_pool().connection() as db:
+                    await reconcile_counters(db, repair=True)
+            except Exception as e:
+                telemetry_manager.log_error("Message counter reconciliation failed: %s", lambda: {
+                    "action": "message_counter_reconcile_error",
+                    "error": str(e),
+                    "component": "database"
+                }, args=(e,), component="database")
+        await asyncio.sleep(interval)
+
+
+async def _run_search(cursor, message_search, statements):
+    """MessageSearch._run의 asyncio 버전 (FULLTEXT 인덱스가 없으면 LIKE로 대체)"""
+    fulltext, like = statements
+    if fulltext is not None:
+        try:
+            await cursor.execute(*fulltext)
+            return
+        except aiomysql.Error as e:
+            if not e.args or e.args[0] != ER_FT_MATCHING_KEY_NOT_FOUND:
+                raise
+            message_search.log_fallback()
+    await cursor.execute(*like)
+
+
+async def search_count(cursor, message_search, query):
+    """MessageSearch.count의 asyncio 버전"""
+    await _run_search(cursor, message_search, message_search.count_statements(query))
+    return (await cursor.fetchone())['total']
+
+
+async def search(cursor, message_search, query, limit=None, offset=0, columns="*"):
+    """MessageSearch.search의 asyncio 버전"""
+    await _run_search(cursor, message_search, message_search.search_statements(query, limit, offset, columns))
+    return list(await cursor.fetchall())
+
+
+async def fetch_messages_by_ids(cursor, ids):
+    """message_search.fetch_messages_by_ids의 asyncio 버전"""
+    if not ids:
+        return []
+    await cursor.execute(*ids_query(ids))
+    return order_by_ids(await cursor.fetchall(), ids)
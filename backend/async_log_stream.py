@@ -0,0 +1,141 @@
+import os
+import time
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+import api_log_stream
+from api_log_stream import STREAM_KEY
+from telemetry import telemetry_manager
+
+
+class AsyncRedisLogShipper:
+    """RedisLogShipper의 asyncio 버전
+
+    submit()은 제한된 큐에 추가만 하며 (await 없음), 플러셔 태스크가 batch_size개가 모이거나
+    첫 로그 이후 flush_interval이 지나면 한 번의 파이프라인으로 기록합니다.
+    큐가 가득 차면 가장 오래된 로그를 버립니다.
+    """
+
+    def __init__(self, get_client, capacity=10000, batch_size=100, flush_interval=0.2):
+        self.get_client = get_client
+        self.capacity = max(1, capacity)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+
+        self._queue = deque()
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self.counters = {'enqueued': 0, 'dropped': 0, 'written': 0, 'failed': 0}
+        self._task = asyncio.get_event_loop().create_task(self._run())
+
+        telemetry_manager.register_gauge(
+            "redis_log_queue_depth", lambda: len(self._queue),
+            description="Redis 기록 대기 중인 로그 수"
+        )
+
+    def _count(self, result, value=1):
+        self.counters[result] += value
+        telemetry_manager.record_metric("redis_log_events_total", value, {"result": result})
+
+    def submit(self, action, details):
+        """로그를 큐에 추가합니다. 추가되면 True, 종료 중이라 버려지면 False를 반환합니다."""
+        if self._closed:
+            self._count('dropped')
+            return False
+        if len(self._queue) >= self.capacity:
+            self._queue.popleft()
+            self._count('dropped')
+        self._queue.append((datetime.utcnow().replace(tzinfo=timezone.utc).isoformat(), action, details))
+        self._count('enqueued')
+        if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def _run(self):
+        while self._queue or not self._closed:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if len(self._queue) < self.batch_size and not self._closed:
+                # 배치가 찰 때까지 최대 flush_interval 동안 대기
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.batch_size))]
+            await self._flush(batch)
+
+    async def _flush(self, batch):
+        start = time.perf_counter()
+        try:
+            pipe = self.get_client().pipeline(transaction=False)
+            for timestamp, action, details in batch:
+                api_log_stream.append(pipe, action, details, timestamp)
+            await pipe.execute()
+        except Exception as e:
+            self._count('failed', len(batch))
+            print(f"Redis logging error: {str(e)}")
+            telemetry_manager.log_error("Redis logging error: %s", lambda: {
+                "action": "redis_logging_error",
+                "error": str(e),
+                "batch_size": len(batch),
+                "component": "redis_logging"
+            }, args=(e,), component="redis_logging")
+            return
+
+        telemetry_manager.record_histogram("redis_log_flush_latency_ms", (time.perf_counter() - start) * 1000)
+        telemetry_manager.record_histogram("redis_log_batch_size", len(batch))
+        self._count('written', len(batch))
+        for _, action, details in batch:
+            # OpenTelemetry 로그 전송 (redis_logging 컴포넌트 레이트 리밋, 버려지면 포맷하지 않음)
+            telemetry_manager.log_info("Redis log: %s - %s", lambda: {
+                "action": action,
+                "component": "redis_logging"
+            }, args=(action, details), component="redis_logging")
+
+    def stats(self):
+        """카운터와 현재 큐 깊이를 반환합니다."""
+        return dict(self.counters, queue_depth=len(self._queue))
+
+    async def shutdown(self, timeout=5):
+        """새 로그를 막고 큐에 남은 로그를 기록한 뒤 플러셔를 종료합니다."""
+        self._closed = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        remaining = len(self._queue)
+        if remaining:
+            print(f"Redis log shipper stopped with {remaining} unwritten logs")
+
+
+def create_log_shipper(get_client):
+    """환경 변수 설정으로 로그 기록기를 생성합니다. (실행 중인 이벤트 루프에서 호출)"""
+    return AsyncRedisLogShipper(
+        get_client,
+        capacity=int(os.getenv('REDIS_LOG_QUEUE_CAPACITY', '10000')),
+        batch_size=int(os.getenv('REDIS_LOG_BATCH_SIZE', '100')),
+        flush_interval=int(os.getenv('REDIS_LOG_FLUSH_INTERVAL_MS', '200')) / 1000
+    )
+
+
+async def read_page(client, limit, token=None, since=None, until=None):
+    """api_log_stream.read_page의 asyncio 버전"""
+    newest, oldest, direction = api_log_stream.page_range(token, since, until)
+    if direction == "next":
+        entries = await client.xrevrange(STREAM_KEY, max=newest, min=oldest, count=limit + 1)
+    else:
+        entries = await client.xrange(STREAM_KEY, min=oldest, max=newest, count=limit + 1)
+    return api_log_stream.page_result(entries, limit, direction, token)
+
+
+async def read_offset_page(client, offset, limit):
+    """api_log_stream.read_offset_page의 asyncio 버전"""
+    pipe = client.pipeline(transaction=False)
+    pipe.xrevrange(STREAM_KEY, count=offset + limit)
+    pipe.xlen(STREAM_KEY)
+    entries, total = await pipe.execute()
+    return api_log_stream.offset_page_result(entries, offset), total
@@ -0,0 +1,567 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import deque
+from messaging_interface import (EventHubBatchPublisher, EventHubMessaging, ApiStatsDispatcher, api_stats_event,
+                                 _log_entry, _merge_latest, _on_kafka_send_success, _on_kafka_send_error)
+from telemetry import telemetry_manager
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMessagingInterface(ABC):
+    """asyncio 메시징 시스템을 위한 추상 인터페이스 (MessagingInterface의 asyncio 버전)
+
+    메시지 형식과 토픽은 MessagingInterface 구현과 같으므로 동기 백엔드와 같은 토픽을 공유합니다.
+    """
+
+    @abstractmethod
+    async def send_message(self, topic, message):
+        """메시지를 전송합니다. (클라이언트 버퍼에 추가되면 True)"""
+        pass
+
+    @abstractmethod
+    async def get_latest(self, topic, n, timeout=5):
+        """파티션마다 최신 n개만 읽어 시간순(오래된 순)으로 합친 최신 n개를 반환합니다."""
+        pass
+
+    @abstractmethod
+    async def close(self):
+        """버퍼에 남은 메시지를 전송하고 연결을 종료합니다."""
+        pass
+
+
+class AsyncKafkaMessaging(AsyncMessagingInterface):
+    """Kafka 메시징 구현 (aiokafka)"""
+
+    def __init__(self):
+        try:
+            from aiokafka import AIOKafkaProducer, AIOKafkaConsumer, TopicPartition
+            self.AIOKafkaProducer = AIOKafkaProducer
+            self.AIOKafkaConsumer = AIOKafkaConsumer
+            self.TopicPartition = TopicPartition
+        except ImportError:
+            raise ImportError("aiokafka 패키지가 설치되지 않았습니다.")
+
+        self.kafka_servers = os.getenv('KAFKA_SERVERS', 'my-kafka')
+        self.kafka_servers += ':9092'
+        self.kafka_username = os.getenv('KAFKA_USERNAME', 'user1')
+        self.kafka_password = os.getenv('KAFKA_PASSWORD', '')
+        self._producer = None
+        self._producer_lock = asyncio.Lock()
+
+        logger.info(f"Kafka 설정 (asyncio): {self.kafka_servers}")
+
+    def _security_config(self):
+        if self.kafka_password:
+            return {
+                'security_protocol': 'SASL_PLAINTEXT',
+                'sasl_mechanism': 'PLAIN',
+                'sasl_plain_username': self.kafka_username,
+                'sasl_plain_password': self.kafka_password
+            }
+        return {'security_protocol': 'PLAINTEXT'}
+
+    def _producer_config(self):
+        """KafkaMessaging과 같은 환경 변수로 Producer 배치/전송 설정을 반환합니다."""
+        acks = os.getenv('KAFKA_ACKS', '1')
+        config = {
+            'bootstrap_servers': self.kafka_servers,
+            'value_serializer': lambda v: json.dumps(v).encode('utf-8'),
+            'linger_ms': int(os.getenv('KAFKA_LINGER_MS', '5')),
+            'max_batch_size': int(os.getenv('KAFKA_BATCH_SIZE', '16384')),
+            'compression_type': os.getenv('KAFKA_COMPRESSION_TYPE') or None,
+            'acks': acks if acks == 'all' else int(acks)
+        }
+        config.update(self._security_config())
+        return config
+
+    async def get_producer(self):
+        """이벤트 루프 전역 Producer를 반환합니다. 없으면 생성하고 시작합니다."""
+        if self._producer is None:
+            async with self._producer_lock:
+                if self._producer is None:
+                    producer = self.AIOKafkaProducer(**self._producer_config())
+                    await producer.start()
+                    self._producer = producer
+                    logger.info(f"Kafka Producer 생성됨 (asyncio, pid={os.getpid()})")
+        return self._producer
+
+    async def send_message(self, topic, message):
+        """Kafka에 메시지를 전송합니다."""
+        tracer = telemetry_manager.get_tracer()
+
+        with tracer.start_as_current_span("kafka_send_message") as span:
+            try:
+                span.set_attribute("messaging.system", "kafka")
+                span.set_attribute("messaging.topic", topic)
+                span.set_attribute("messaging.message_size", len(str(message)))
+
+                # 클라이언트 버퍼에 추가만 하고 전송 결과는 콜백으로 처리
+                producer = await self.get_producer()
+                future = await producer.send(topic, message)
+
+                def on_done(result):
+                    if result.cancelled():
+                        return
+                    if result.exception() is not None:
+                        _on_kafka_send_error(topic, result.exception())
+                    else:
+                        _on_kafka_send_success(topic, result.result())
+
+                future.add_done_callback(on_done)
+                return True
+            except Exception as e:
+                span.set_attribute("error", True)
+                span.set_attribute("error.message", str(e))
+                telemetry_manager.record_metric("kafka_messages_sent_total", 1, {"topic": topic, "status": "error"})
+                logger.error(f"❌ Kafka send error: {str(e)}")
+                return False
+
+    async def get_latest(self, topic, n, timeout=5):
+        """파티션별 끝 오프셋 - n부터 끝까지만 읽어 시간순으로 합친 최신 n개를 반환합니다."""
+        consumer = self.AIOKafkaConsumer(
+            bootstrap_servers=self.kafka_servers,
+            value_deserializer=lambda m: json.loads(m.decode('utf-8')),
+            enable_auto_commit=False,
+            **self._security_config()
+        )
+        try:
+            await consumer.start()
+            await consumer.topics()  # 토픽 메타데이터 조회
+            partitions = consumer.partitions_for_topic(topic) or set()
+            tps = [self.TopicPartition(topic, partition) for partition in sorted(partitions)]
+            if not tps:
+                return []
+            consumer.assign(tps)
+            beginning = await consumer.beginning_offsets(tps)
+            end = await consumer.end_offsets(tps)
+            pending = {}
+            for tp in tps:
+                start = max(beginning[tp], end[tp] - n)
+                consumer.seek(tp, start)
+                if start < end[tp]:
+                    pending[tp] = end[tp]
+
+            records = []
+            deadline = time.monotonic() + timeout
+            while pending and time.monotonic() < deadline:
+                batch = await consumer.getmany(
+                    *pending, timeout_ms=max(1, int((deadline - time.monotonic()) * 1000))
+                )
+                for tp, messages in batch.items():
+                    end_offset = pending.get(tp)
+                    if end_offset is None:
+                        continue
+                    for message in messages:
+                        if message.offset < end_offset:
+                            try:
+                                records.append((tp.partition, message.offset, _log_entry(message.value)))
+                            except Exception as e:
+                                logger.error(f"Kafka log parsing error: {str(e)}")
+                    if messages and messages[-1].offset >= end_offset - 1:
+                        pending.pop(tp)
+            if pending:
+                logger.warning(f"Kafka 최신 로그 조회 시간 초과: {len(pending)}개 파티션 미완료")
+            return _merge_latest(records, n)
+        except Exception as e:
+            logger.error(f"❌ Kafka receive error: {str(e)}")
+            return []
+        finally:
+            await consumer.stop()
+
+    async def close(self):
+        """버퍼에 남은 메시지를 전송하고 Producer를 종료합니다."""
+        producer, self._producer = self._producer, None
+        if producer is None:
+            return
+        try:
+            await producer.stop()
+            logger.info("Kafka Producer가 정상 종료되었습니다. (asyncio)")
+        except Exception as e:
+            logger.error(f"❌ Kafka Producer 종료 오류: {str(e)}")
+
+
+class AsyncEventHubBatchPublisher(EventHubBatchPublisher):
+    """EventHubBatchPublisher의 asyncio 버전 (azure.eventhub.aio Producer 사용)
+
+    버퍼링/배치 조건은 같으며, flush 스레드 대신 이벤트 루프의 태스크가 전송합니다.
+    """
+
+    def __init__(self, producer_client, event_factory=None, max_batch_events=100,
+                 max_batch_bytes=256 * 1024, max_latency=0.5, max_pending=10000):
+        if event_factory is None:
+            from azure.eventhub import EventData
+            event_factory = EventData
+        self.producer = producer_client
+        self.event_factory = event_factory
+        self.max_batch_events = max(1, max_batch_events)
+        self.max_batch_bytes = max_batch_bytes
+        self.max_latency = max_latency
+        self.max_pending = max_pending
+
+        self._buffers = {}
+        self._pending = 0
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self._task = asyncio.get_event_loop().create_task(self._run())
+
+    def add(self, message, partition_key=None):
+        """이벤트를 버퍼에 추가합니다. 버퍼가 가득 차 버려지면 False를 반환합니다."""
+        if self._closed or self._pending >= self.max_pending:
+            telemetry_manager.record_metric("eventhub_messages_sent_total", 1, {"status": "dropped"})
+            return False
+        body = json.dumps(message)
+        buffer = self._buffers.get(partition_key)
+        if buffer is None:
+            buffer = {"events": [], "bytes": 0, "since": time.monotonic()}
+            self._buffers[partition_key] = buffer
+            # 새 버퍼의 max_latency 대기 시간을 다시 계산하도록 깨움
+            self._wakeup.set()
+        buffer["events"].append(body)
+        buffer["bytes"] += len(body)
+        self._pending += 1
+        if self._is_ready(buffer, time.monotonic()):
+            self._wakeup.set()
+        return True
+
+    async def _run(self):
+        while True:
+            ready, wait = self._take_ready(force=self._closed)
+            if not ready:
+                if self._closed:
+                    return
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            for partition_key, events in ready:
+                await self._send(partition_key, events)
+
+    async def _send(self, partition_key, events):
+        """이벤트를 가능한 한 꽉 채운 EventDataBatch로 나누어 전송합니다."""
+        index = 0
+        while index < len(events):
+            batch = await self.producer.create_batch(partition_key=partition_key)
+            count = 0
+            while index < len(events):
+                try:
+                    batch.add(self.event_factory(events[index]))
+                except ValueError:
+                    # 배치 최대 크기 초과: 현재 배치를 전송하고 새 배치 시작
+                    if count == 0:
+                        logger.error("❌ Event Hubs 이벤트가 배치 최대 크기를 초과하여 버려졌습니다.")
+                        telemetry_manager.record_metric("eventhub_messages_sent_total", 1, {"status": "dropped"})
+                        index += 1
+                        continue
+                    break
+                index += 1
+                count += 1
+            if count:
+                await self._send_batch(batch, count)
+
+    async def _send_batch(self, batch, count):
+        start = time.perf_counter()
+        try:
+            await self.producer.send_batch(batch)
+            status = "success"
+        except Exception as e:
+            status = "error"
+            logger.error(f"❌ Event Hubs send error: {str(e)}")
+        telemetry_manager.record_histogram(
+            "eventhub_flush_latency_ms", (time.perf_counter() - start) * 1000, {"status": status}
+        )
+        if batch.max_size_in_bytes:
+            telemetry_manager.record_histogram(
+                "eventhub_batch_fill_ratio", batch.size_in_bytes / batch.max_size_in_bytes
+            )
+        telemetry_manager.record_histogram("eventhub_batch_events", count)
+        telemetry_manager.record_metric("eventhub_messages_sent_total", count, {"status": status})
+
+    async def flush(self):
+        """버퍼에 남은 모든 이벤트를 즉시 전송합니다."""
+        ready, _ = self._take_ready(force=True)
+        for partition_key, events in ready:
+            await self._send(partition_key, events)
+
+    async def close(self, timeout=10):
+        """버퍼를 비우고 Producer 클라이언트를 닫습니다."""
+        self._closed = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        try:
+            await self.producer.close()
+        except Exception as e:
+            logger.error(f"❌ Event Hubs Producer 종료 오류: {str(e)}")
+
+
+class AsyncEventHubMessaging(AsyncMessagingInterface):
+    """Azure Event Hubs 메시징 구현 (azure.eventhub.aio)"""
+
+    def __init__(self):
+        try:
+            from azure.eventhub.aio import EventHubProducerClient, EventHubConsumerClient
+            self.EventHubProducerClient = EventHubProducerClient
+            self.EventHubConsumerClient = EventHubConsumerClient
+        except ImportError:
+            raise ImportError("azure-eventhub 패키지가 설치되지 않았습니다.")
+
+        self.connection_str = os.getenv('EVENTHUB_CONNECTION_STRING', '')
+        self.eventhub_name = os.getenv('EVENTHUB_NAME', 'api-logs')
+        self.consumer_group = os.getenv('EVENTHUB_CONSUMER_GROUP', '$Default')
+        self._publisher = None
+
+        if not self.connection_str:
+            logger.warning("EVENTHUB_CONNECTION_STRING 환경 변수가 설정되지 않았습니다. Event Hubs 기능이 제한됩니다.")
+
+        logger.info(f"Event Hubs 설정 (asyncio): {self.eventhub_name}")
+
+    def get_consumer(self, topic):
+        """Event Hubs Consumer를 생성합니다."""
+        return self.EventHubConsumerClient.from_connection_string(
+            conn_str=self.connection_str,
+            consumer_group=self.consumer_group,
+            eventhub_name=self.eventhub_name
+        )
+
+    def get_publisher(self):
+        """이벤트 루프 전역 배치 Publisher를 반환합니다. 없으면 생성합니다."""
+        if self._publisher is None:
+            self._publisher = AsyncEventHubBatchPublisher(
+                self.EventHubProducerClient.from_connection_string(
+                    conn_str=self.connection_str,
+                    eventhub_name=self.eventhub_name
+                ),
+                max_batch_events=int(os.getenv('EVENTHUB_BATCH_MAX_EVENTS', '100')),
+                max_batch_bytes=int(os.getenv('EVENTHUB_BATCH_MAX_BYTES', str(256 * 1024))),
+                max_latency=int(os.getenv('EVENTHUB_BATCH_MAX_LATENCY_MS', '500')) / 1000
+            )
+            logger.info(f"Event Hubs 배치 Publisher 생성됨 (asyncio, pid={os.getpid()})")
+        return self._publisher
+
+    async def send_message(self, topic, message):
+        """Event Hubs에 메시지를 전송합니다."""
+        if not self.connection_str:
+            logger.error("❌ Event Hubs 연결 문자열이 설정되지 않았습니다.")
+            return False
+
+        try:
+            # 같은 사용자의 이벤트는 같은 파티션으로 보내 순서를 유지
+            partition_key = message.get('user_id') if isinstance(message, dict) else None
+            return self.get_publisher().add(message, partition_key=partition_key)
+        except Exception as e:
+            logger.error(f"❌ Event Hubs send error: {str(e)}")
+            return False
+
+    async def _read_partition_latest(self, topic, partition_id, n, deadline):
+        """한 파티션에서 마지막 시퀀스 번호까지 최신 n개를 읽습니다."""
+        consumer = self.get_consumer(topic)
+        records = []
+        receiver = None
+        try:
+            properties = await consumer.get_partition_properties(partition_id)
+            start = EventHubMessaging._latest_position(properties, n)
+            if start is None:
+                return records
+            last = properties['last_enqueued_sequence_number']
+            done = asyncio.Event()
+
+            async def on_event_batch(partition_context, events):
+                for event in events:
+                    if event.sequence_number > last:
+                        continue
+                    try:
+                        records.append((partition_id, event.sequence_number,
+                                        _log_entry(json.loads(event.body_as_str()))))
+                    except Exception as e:
+                        logger.error(f"Event parsing error: {str(e)}")
+                    if event.sequence_number >= last:
+                        done.set()
+
+            # receive_batch는 close()가 호출될 때까지 반환하지 않으므로 별도 태스크로 실행
+            receiver = asyncio.get_event_loop().create_task(consumer.receive_batch(
+                on_event_batch=on_event_batch,
+                partition_id=partition_id,
+                starting_position=start,
+                starting_position_inclusive=True,
+                max_batch_size=min(n, 300),
+                max_wait_time=1
+            ))
+            try:
+                await asyncio.wait_for(done.wait(), max(0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                logger.warning(f"Event Hubs 최신 로그 조회 시간 초과: partition={partition_id}")
+            return list(records)
+        finally:
+            await consumer.close()
+            if receiver is not None:
+                receiver.cancel()
+
+    async def get_latest(self, topic, n, timeout=5):
+        """파티션별로 최신 n개를 시퀀스 번호로 찾아 동시에 읽고 시간순으로 합친 최신 n개를 반환합니다."""
+        if not self.connection_str:
+            logger.error("❌ Event Hubs 연결 문자열이 설정되지 않았습니다.")
+            return []
+
+        try:
+            deadline = time.monotonic() + timeout
+            consumer = self.get_consumer(topic)
+            async with consumer:
+                partition_ids = await consumer.get_partition_ids()
+            results = await asyncio.gather(*[
+                self._read_partition_latest(topic, partition_id, n, deadline) for partition_id in partition_ids
+            ])
+            return _merge_latest([record for partition_records in results for record in partition_records], n)
+        except Exception as e:
+            logger.error(f"❌ Event Hubs receive error: {str(e)}")
+            return []
+
+    async def close(self):
+        """버퍼에 남은 이벤트를 전송하고 Publisher를 종료합니다."""
+        publisher, self._publisher = self._publisher, None
+        if publisher is not None:
+            await publisher.close()
+            logger.info("Event Hubs Publisher가 정상 종료되었습니다. (asyncio)")
+
+
+def create_async_messaging():
+    """MESSAGING_TYPE 환경 변수에 따라 asyncio 메시징 시스템을 생성합니다."""
+    messaging_type = os.getenv('MESSAGING_TYPE', 'kafka').lower()
+
+    if messaging_type == 'eventhub':
+        return AsyncEventHubMessaging()
+    elif messaging_type == 'kafka':
+        return AsyncKafkaMessaging()
+    else:
+        raise ValueError(f"지원하지 않는 메시징 타입: {messaging_type}")
+
+
+class AsyncApiStatsDispatcher:
+    """ApiStatsDispatcher의 asyncio 버전
+
+    submit()은 요청 처리 중에 기다리지 않도록 await 없이 큐에 추가만 하며, 워커 태스크가 전송합니다.
+    overflow_policy는 drop_oldest / drop_newest를 지원합니다. (block은 요청을 기다리게 하므로 drop_newest로 동작)
+    """
+
+    def __init__(self, get_messaging, capacity=1000, workers=2, overflow_policy='drop_oldest', topic='api-logs'):
+        if overflow_policy not in ApiStatsDispatcher.OVERFLOW_POLICIES:
+            raise ValueError(f"지원하지 않는 overflow 정책: {overflow_policy}")
+        self.get_messaging = get_messaging
+        self.capacity = max(1, capacity)
+        self.overflow_policy = overflow_policy
+        self.topic = topic
+
+        self._queue = deque()
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self.counters = {'enqueued': 0, 'dropped': 0, 'sent': 0, 'failed': 0}
+        loop = asyncio.get_event_loop()
+        self._workers = [loop.create_task(self._run()) for _ in range(max(1, workers))]
+
+        telemetry_manager.register_gauge(
+            "api_stats_queue_depth", lambda: len(self._queue), {"topic": self.topic},
+            description="전송 대기 중인 API 통계 이벤트 수"
+        )
+
+    def _count(self, result, value=1):
+        self.counters[result] += value
+        telemetry_manager.record_metric("api_stats_events_total", value, {"topic": self.topic, "result": result})
+
+    def submit(self, event):
+        """이벤트를 큐에 추가합니다. 추가되면 True, 버려지면 False를 반환합니다."""
+        if self._closed:
+            self._count('dropped')
+            return False
+        if len(self._queue) >= self.capacity:
+            if self.overflow_policy != 'drop_oldest':
+                self._count('dropped')
+                return False
+            self._queue.popleft()
+            self._count('dropped')
+        self._queue.append(event)
+        self._count('enqueued')
+        self._wakeup.set()
+        return True
+
+    async def _run(self):
+        while True:
+            if not self._queue:
+                if self._closed:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            await self._send(self._queue.popleft())
+
+    async def _send(self, event):
+        try:
+            if await self.get_messaging().send_message(self.topic, event):
+                self._count('sent')
+            else:
+                self._count('failed')
+                logger.error(f"❌ API 로그 전송 실패: {event['endpoint']}")
+        except Exception as e:
+            self._count('failed')
+            logger.error(f"❌ 로깅 오류: {str(e)}")
+
+    def stats(self):
+        """카운터와 현재 큐 깊이를 반환합니다."""
+        return dict(self.counters, queue_depth=len(self._queue))
+
+    async def shutdown(self, timeout=5):
+        """새 이벤트를 막고 큐에 남은 이벤트를 전송한 뒤 워커를 종료합니다."""
+        self._closed = True
+        self._wakeup.set()
+        done, pending = await asyncio.wait(self._workers, timeout=timeout)
+        for worker in pending:
+            worker.cancel()
+        remaining = len(self._queue)
+        if remaining:
+            logger.warning(f"API 통계 큐 종료 시 {remaining}개 이벤트를 전송하지 못했습니다.")
+
+
+# 이벤트 루프 전역 메시징 인스턴스와 API 통계 디스패처 (async_app의 before_serving 이후 생성)
+_messaging = None
+_dispatcher = None
+
+
+def get_async_messaging():
+    """API 로그 전송/조회에 재사용하는 메시징 인스턴스를 반환합니다."""
+    global _messaging
+    if _messaging is None:
+        _messaging = create_async_messaging()
+    return _messaging
+
+
+def log_api_stats(endpoint, method, status, user_id):
+    """API 통계를 제한된 큐에 추가합니다. 전송은 워커 태스크가 처리합니다. (async_log_api_stats의 asyncio 버전)"""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = AsyncApiStatsDispatcher(
+            get_async_messaging,
+            capacity=int(os.getenv('API_STATS_QUEUE_CAPACITY', '1000')),
+            workers=int(os.getenv('API_STATS_WORKERS', '2')),
+            overflow_policy=os.getenv('API_STATS_OVERFLOW_POLICY', 'drop_oldest').lower()
+        )
+    _dispatcher.submit(api_stats_event(endpoint, method, status, user_id))
+
+
+async def shutdown_async_messaging(timeout=None):
+    """큐에 남은 API 통계를 전송하고 메시징 클라이언트를 종료합니다."""
+    global _messaging, _dispatcher
+    dispatcher, _dispatcher = _dispatcher, None
+    if dispatcher is not None:
+        if timeout is None:
+            timeout = float(os.getenv('API_STATS_SHUTDOWN_TIMEOUT', '5'))
+        await dispatcher.shutdown(timeout)
+    messaging, _messaging = _messaging, None
+    if messaging is not None:
+        await messaging.close()
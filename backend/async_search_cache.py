@@ -0,0 +1,360 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+from datetime import datetime, timezone
+from redis.exceptions import RedisError
+from search_cache import (SearchCache, index_terms, message_terms, _RELEASE_LOCK_SCRIPT, _REGISTER_SCRIPT, _HIT_SCRIPT,
+                          _PRUNE_SCRIPT, _BEGIN_FILL_SCRIPT, _INDEX_SCRIPT)
+from telemetry import telemetry_manager
+
+
+class AsyncSearchCache(SearchCache):
+    """SearchCache의 asyncio 버전 (redis.asyncio 클라이언트 사용)
+
+    키, 레지스트리, Lua 스크립트와 항목 형식이 SearchCache와 같으므로 동기 백엔드(app.py)와
+    같은 Redis를 공유할 수 있습니다. (한쪽의 무효화/전체 삭제가 다른 쪽에도 반영됨)
+
+    프로세스 내 single-flight는 스레드 대신 Future로 기다리며, 키를 만드는 모든 메서드는
+    세대 번호를 먼저 await generation()으로 읽어 key(query, generation)에 전달합니다.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._reclaim_task = None
+
+    async def generation(self):
+        """현재 세대 번호를 반환합니다. (generation_refresh_ms 동안 캐시)"""
+        now = time.monotonic()
+        if self._generation_value is None or now - self._generation_checked >= self.generation_refresh:
+            self._generation_value = int(await self.get_client().get(self._generation_key()) or 0)
+            self._generation_checked = now
+        return self._generation_value
+
+    async def _run_script(self, client, script, generation, *args, extra_keys=()):
+        """레지스트리 스크립트를 실행합니다. (client가 파이프라인이면 파이프라인에 추가)"""
+        registered = self._scripts.get(script)
+        if registered is None:
+            registered = self._scripts.setdefault(script, self.get_client().register_script(script))
+        keys = self._registry_keys(generation) + list(extra_keys)
+        return await registered(keys=keys, args=list(args), client=client)
+
+    async def get(self, query):
+        """캐시 항목을 한 번의 왕복(GET + PTTL)으로 읽습니다. 없으면 None."""
+        key = self.key(query, await self.generation())
+        pipe = self.get_client().pipeline(transaction=False)
+        pipe.get(key)
+        pipe.pttl(key)
+        cached_data, ttl_ms = await pipe.execute()
+        if not cached_data:
+            return None
+        entry = json.loads(cached_data)
+        entry['ttl_ms'] = ttl_ms
+        return entry
+
+    async def record_hit(self, query):
+        """레지스트리의 히트 수를 증가시키고 증가된 값을 반환합니다. (결과 항목은 다시 쓰지 않음)"""
+        expire = self.ttl + self.stale_ttl
+        generation = await self.generation()
+        client = self.get_client()
+        if self.ttl_mode != "sliding":
+            return await self._run_script(client, _HIT_SCRIPT, generation, self._digest(query), "")
+        pipe = client.pipeline(transaction=False)
+        await self._run_script(pipe, _HIT_SCRIPT, generation, self._digest(query), time.time() + expire)
+        pipe.expire(self.key(query, generation), expire)
+        return (await pipe.execute())[0]
+
+    async def store(self, query, ids, total, write_version=None):
+        """검색 결과 ID 목록을 저장하고 항목을 반환합니다. (SearchCache.store 참고)"""
+        entry = self._build_entry(query, ids, total)
+        payload = json.dumps({k: v for k, v in entry.items() if k != 'ttl_ms'}, separators=(',', ':'))
+        if len(payload) > self.max_entry_bytes:
+            telemetry_manager.record_metric("search_cache_store_skipped_total", 1, {"reason": "entry_too_large"})
+            return entry
+
+        expire = self.ttl + self.stale_ttl
+        now = time.time()
+        meta = json.dumps({"query": query, "results_count": total, "created": entry['timestamp']},
+                          separators=(',', ':'))
+        generation = await self.generation()
+        pipe = self.get_client().pipeline(transaction=False)
+        await self._run_script(pipe, _REGISTER_SCRIPT, generation, self._digest(query), now + expire, meta,
+                               payload, expire, write_version if write_version is not None else "",
+                               query, " ".join(index_terms(query)), extra_keys=(self.key(query, generation),))
+        await self._run_script(pipe, _PRUNE_SCRIPT, generation, now, self.PRUNE_BATCH)
+        stored, _ = await pipe.execute()
+        if not stored:
+            telemetry_manager.record_metric("search_cache_store_skipped_total", 1, {"reason": "concurrent_write"})
+        return entry
+
+    async def fill(self, query, loader, stale=None):
+        """single-flight로 캐시를 채우고 항목을 반환합니다.
+
+        Args:
+            loader: DB를 조회해 (ids, total)을 반환하는 코루틴 함수
+            stale: 만료되었지만 남아 있는 이전 항목 (있으면 기다리는 요청에 반환)
+
+        Returns:
+            (entry, source) - source: fill, local, remote, stale, db (Redis를 사용할 수 없어 캐시 없이 DB 조회)
+        """
+        try:
+            generation = await self.generation()
+        except RedisError as e:
+            # 세대 번호를 읽을 수 없으면 캐시 키를 만들 수 없으므로 DB에서 바로 조회
+            print(f"Redis cache error: {str(e)}")
+            return self._build_entry(query, *(await loader())), "db"
+        key = self.key(query, generation)
+        flight = self._flights.get(key)
+        if flight is not None:
+            # 같은 프로세스에서 이미 채우는 중
+            if stale is not None:
+                return self._coalesced(stale, "stale")
+            try:
+                entry = await asyncio.wait_for(asyncio.shield(flight), self.fill_wait)
+            except Exception:
+                entry = None
+            if entry is not None:
+                return self._coalesced(entry, "local")
+            return self._build_entry(query, *(await loader())), "fill"
+
+        flight = self._flights[key] = asyncio.get_event_loop().create_future()
+        try:
+            entry, source = await self._fill_as_leader(query, generation, loader, stale)
+            flight.set_result(entry)
+            return entry, source
+        finally:
+            self._flights.pop(key, None)
+            if not flight.done():
+                flight.set_result(None)
+
+    async def _fill_as_leader(self, query, generation, loader, stale):
+        client = self.get_client()
+        lock_key = self._lock_key(query, generation)
+        token = uuid.uuid4().hex
+        try:
+            acquired = bool(await client.set(lock_key, token, nx=True, px=self.lock_lease_ms))
+        except Exception as e:
+            # Redis를 사용할 수 없으면 락 없이 DB 조회
+            print(f"Redis cache lock error: {str(e)}")
+            acquired = None
+
+        if acquired is False:
+            # 다른 파드가 채우는 중
+            if stale is not None:
+                return self._coalesced(stale, "stale")
+            deadline = time.monotonic() + self.fill_wait
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                try:
+                    entry = await self.get(query)
+                except Exception:
+                    break
+                if entry is not None and self.is_fresh(entry):
+                    return self._coalesced(entry, "remote")
+
+        write_version = None
+        if acquired is not None:
+            try:
+                write_version = await self._run_script(client, _BEGIN_FILL_SCRIPT, generation,
+                                                       *self._begin_args(query))
+            except Exception as e:
+                print(f"Redis cache error: {str(e)}")
+
+        try:
+            ids, total = await loader()
+            telemetry_manager.record_metric("search_cache_fills_total", 1)
+            try:
+                return await self.store(query, ids, total, write_version), "fill"
+            except Exception as e:
+                print(f"Redis cache store error: {str(e)}")
+                return self._build_entry(query, ids, total), "fill"
+        finally:
+            if acquired:
+                try:
+                    await client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    print(f"Redis cache unlock error: {str(e)}")
+
+    async def delete(self, query):
+        """특정 검색어의 캐시를 삭제합니다. 삭제된 결과 항목 수를 반환합니다."""
+        generation = await self.generation()
+        pipe = self.get_client().pipeline(transaction=False)
+        pipe.delete(self.key(query, generation))
+        await self._run_script(pipe, _PRUNE_SCRIPT, generation, 0, 0, self._digest(query))
+        return (await pipe.execute())[0]
+
+    async def invalidate_matching(self, message, matches):
+        """새로 저장된 메시지와 일치하는 검색어의 캐시만 삭제하고, 삭제한 검색어 수를 반환합니다."""
+        terms = message_terms(message, self.max_message_terms)
+        if terms is None:
+            # term이 너무 많으면 색인 조회 대신 전체 무효화
+            telemetry_manager.record_metric("search_cache_invalidation_fallbacks_total", 1)
+            return await self.clear_all()
+
+        client = self.get_client()
+        generation = await self.generation()
+
+        pipe = client.pipeline(transaction=False)
+        pipe.get(self._generation_key())
+        for keys in self._candidate_keys(generation, terms):
+            pipe.sunion(keys)
+        current, *found = await pipe.execute()
+
+        current = int(current or 0)
+        if current != generation:
+            # 다른 파드에서 전체 삭제됨
+            self._generation_value = generation = current
+            self._generation_checked = time.monotonic()
+            pipe = client.pipeline(transaction=False)
+            for keys in self._candidate_keys(generation, terms):
+                pipe.sunion(keys)
+            found = await pipe.execute()
+
+        candidates = sorted(set().union(*found))
+        digests = []
+        if candidates:
+            queries = await client.hmget(self._registry_keys(generation)[4], candidates)
+            digests = self._matched(candidates, queries, message, matches)
+
+        if digests:
+            pipe = client.pipeline(transaction=False)
+            pipe.unlink(*[f"{self.prefix}:{generation}:{digest}" for digest in digests])
+            await self._run_script(pipe, _PRUNE_SCRIPT, generation, 0, 0, *digests)
+            await pipe.execute()
+            telemetry_manager.record_metric("search_cache_invalidations_total", len(digests))
+        return len(digests)
+
+    async def stats(self, offset=0, limit=20):
+        """히트 수 상위 검색어 통계를 레지스트리에서 조회합니다. (최대 두 번의 왕복)"""
+        client = self.get_client()
+        generation = await self.generation()
+        hits_key, expiry_key, meta_key, total_key = self._registry_keys(generation)[:4]
+
+        pipe = client.pipeline(transaction=False)
+        await self._run_script(pipe, _PRUNE_SCRIPT, generation, time.time(), self.PRUNE_BATCH)
+        pipe.zrevrange(hits_key, offset, offset + limit - 1, withscores=True)
+        pipe.zcard(hits_key)
+        pipe.get(total_key)
+        _, top, total_queries, total_hits = await pipe.execute()
+
+        cache_stats = []
+        if top:
+            digests = [digest for digest, _ in top]
+            pipe = client.pipeline(transaction=False)
+            pipe.hmget(meta_key, digests)
+            pipe.zmscore(expiry_key, digests)
+            metas, expiries = await pipe.execute()
+
+            for (digest, hits), meta, expiry in zip(top, metas, expiries):
+                try:
+                    if meta:
+                        cache_info = json.loads(meta)
+                        expires_at = datetime.fromtimestamp(expiry - self.stale_ttl, timezone.utc) if expiry else None
+                        cache_stats.append({
+                            'query': cache_info['query'],
+                            'hit_count': int(hits),
+                            'timestamp': cache_info['created'],
+                            'expires_at': expires_at.isoformat() if expires_at else None,
+                            'results_count': cache_info['results_count']
+                        })
+                except Exception as e:
+                    print(f"Error parsing cache registry data for {digest}: {str(e)}")
+
+        return {
+            "total_cached_queries": total_queries,
+            "total_hits": int(total_hits or 0),
+            "cache_stats": cache_stats
+        }
+
+    async def _scan_keys(self, client, match):
+        """match와 일치하는 키를 SCAN으로 SCAN_COUNT개씩 나누어 반환합니다."""
+        batch = []
+        async for key in client.scan_iter(match=match, count=self.SCAN_COUNT):
+            batch.append(key)
+            if len(batch) >= self.SCAN_COUNT:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def rebuild_registry(self):
+        """레지스트리에 없는 현재 세대의 캐시 항목을 SCAN으로 찾아 등록합니다. 등록된 항목 수를 반환합니다."""
+        client = self.get_client()
+        generation = await self.generation()
+        hits_key, expiry_key, meta_key, _ = self._registry_keys(generation)[:4]
+        now = time.time()
+        registered = 0
+        async for keys in self._scan_keys(client, f"{self.prefix}:{generation}:*"):
+            pipe = client.pipeline(transaction=False)
+            for key in keys:
+                pipe.get(key)
+                pipe.pttl(key)
+            values = await pipe.execute()
+
+            pipe = client.pipeline(transaction=False)
+            for key, cached_data, ttl_ms in zip(keys, values[::2], values[1::2]):
+                if not cached_data or ttl_ms < 0:
+                    continue
+                try:
+                    cache_info = json.loads(cached_data)
+                except ValueError:
+                    continue
+                digest = key.rsplit(':', 1)[1]
+                meta = json.dumps({"query": cache_info['query'], "results_count": cache_info['total'],
+                                   "created": cache_info['timestamp']}, separators=(',', ':'))
+                pipe.zadd(hits_key, {digest: 0}, nx=True)
+                pipe.zadd(expiry_key, {digest: now + ttl_ms / 1000}, nx=True)
+                pipe.hsetnx(meta_key, digest, meta)
+                await self._run_script(pipe, _INDEX_SCRIPT, generation, digest, cache_info['query'],
+                                       " ".join(index_terms(cache_info['query'])))
+            results = await pipe.execute()
+            registered += sum(1 for added in results[::4] if added)
+        return registered
+
+    async def clear_all(self):
+        """세대 번호를 올려 모든 검색 캐시를 무효화하고, 무효화된 검색어 수를 반환합니다.
+
+        이전 세대의 키는 백그라운드 태스크가 정리합니다.
+        """
+        client = self.get_client()
+        generation = await client.incr(self._generation_key())
+        self._generation_value = generation
+        self._generation_checked = time.monotonic()
+        cleared = await client.zcard(self._registry_keys(generation - 1)[0])
+        telemetry_manager.record_metric("search_cache_generation_bumps_total", 1)
+
+        if self._reclaim_task is None or self._reclaim_task.done():
+            self._reclaim_task = asyncio.get_event_loop().create_task(self.reclaim())
+        return cleared
+
+    async def reclaim(self):
+        """이전 세대의 키를 SCAN으로 찾아 UNLINK로 일괄 삭제합니다. 삭제한 키 수를 반환합니다."""
+        reclaimed = 0
+        try:
+            client = self.get_client()
+            generation = int(await client.get(self._generation_key()) or 0)
+            async for keys in self._scan_keys(client, f"{self.prefix}*"):
+                stale = [key for key in keys if self._is_stale_key(key, generation)]
+                if stale:
+                    reclaimed += await client.unlink(*stale)
+            telemetry_manager.record_metric("search_cache_reclaimed_keys_total", reclaimed)
+        except Exception as e:
+            print(f"Redis cache reclaim error: {str(e)}")
+        return reclaimed
+
+
+def get_async_search_cache(get_client):
+    """환경 변수 설정으로 검색 캐시를 생성합니다. (get_search_cache와 같은 설정)"""
+    return AsyncSearchCache(
+        get_client,
+        ttl=int(os.getenv('SEARCH_CACHE_TTL', '300')),
+        max_ids=int(os.getenv('SEARCH_CACHE_MAX_IDS', '1000')),
+        max_entry_bytes=int(os.getenv('SEARCH_CACHE_MAX_ENTRY_BYTES', str(64 * 1024))),
+        stale_ttl=int(os.getenv('SEARCH_CACHE_STALE_TTL', '30')),
+        lock_lease_ms=int(os.getenv('SEARCH_CACHE_LOCK_LEASE_MS', '5000')),
+        fill_wait_ms=int(os.getenv('SEARCH_CACHE_FILL_WAIT_MS', '3000')),
+        ttl_mode=os.getenv('SEARCH_CACHE_TTL_MODE', 'fixed').lower(),
+        generation_refresh_ms=int(os.getenv('SEARCH_CACHE_GENERATION_REFRESH_MS', '1000')),
+        max_message_terms=int(os.getenv('SEARCH_CACHE_MAX_MESSAGE_TERMS', '1000'))
+    )
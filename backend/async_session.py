@@ -0,0 +1,120 @@
+import secrets
+from quart.sessions import SessionInterface
+from flask_session.base import ServerSideSession
+from session_activity import SessionActivity
+from session_store import SessionDetails
+from telemetry import telemetry_manager
+
+
+class AsyncRedisSessionInterface(SessionInterface):
+    """Quart용 Redis 서버 사이드 세션 (redis.asyncio 클라이언트 사용)
+
+    Flask-Session RedisSessionInterface와 같은 형식으로 저장합니다.
+    - 키: {key_prefix}{sid}, 쿠키 값: sid (서명 없음), 만료: PERMANENT_SESSION_LIFETIME
+    - 직렬화: session_store.create_serializer (SESSION_SERIALIZER)
+    따라서 동기 백엔드(app.py)에서 로그인한 세션을 그대로 사용할 수 있습니다.
+
+    SESSION_REFRESH_EACH_REQUEST가 False이면 변경된 세션만 다시 저장합니다. (만료 연장은 AsyncSessionActivity)
+    """
+
+    session_class = ServerSideSession
+
+    def __init__(self, get_client, serializer, key_prefix="session:", sid_length=32, permanent=True):
+        self.get_client = get_client
+        self.serializer = serializer
+        self.key_prefix = key_prefix
+        self.sid_length = sid_length
+        self.permanent = permanent
+
+    def _new_session(self):
+        return self.session_class(sid=secrets.token_urlsafe(self.sid_length), permanent=self.permanent)
+
+    async def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if not sid:
+            return self._new_session()
+        data = await self.get_client().get(f"{self.key_prefix}{sid}")
+        if data:
+            return self.session_class(self.serializer.decode(data), sid=sid)
+        return self._new_session()
+
+    async def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        key = f"{self.key_prefix}{session.sid}"
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if not session:
+            # 로그아웃 등으로 비워진 세션은 삭제
+            if session.modified:
+                await self.get_client().delete(key)
+                response.delete_cookie(name, domain=domain, path=path)
+                response.vary.add("Cookie")
+            return
+
+        if not (session.modified or app.config["SESSION_REFRESH_EACH_REQUEST"]):
+            return
+
+        await self.get_client().set(
+            key, self.serializer.encode(session), ex=int(app.permanent_session_lifetime.total_seconds())
+        )
+
+        if not self.should_set_cookie(app, session):
+            return
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app)
+        )
+        response.vary.add("Cookie")
+
+
+class AsyncSessionActivity(SessionActivity):
+    """SessionActivity의 asyncio 버전 (get_client는 redis.asyncio 클라이언트)"""
+
+    async def update(self, session):
+        """활동 시간을 갱신합니다. 세션을 다시 저장하면 True, 저장을 생략하면 False를 반환합니다."""
+        written, prefixes = self._mark(session)
+        await self._touch(session, prefixes)
+        return written
+
+    async def _touch(self, session, prefixes):
+        """세션 ID 기준 키들의 만료 시간을 한 번의 파이프라인으로 연장합니다."""
+        sid = getattr(session, 'sid', None)
+        if not sid or not prefixes:
+            return
+        try:
+            pipe = self.get_client().pipeline(transaction=False)
+            for prefix in prefixes:
+                pipe.expire(f"{prefix}{sid}", self.lifetime)
+            await pipe.execute()
+            telemetry_manager.record_metric("session_touch_total", 1, {"status": "success"})
+        except Exception as e:
+            print(f"Session touch error: {str(e)}")
+            telemetry_manager.record_metric("session_touch_total", 1, {"status": "error"})
+
+
+class AsyncSessionDetails(SessionDetails):
+    """SessionDetails의 asyncio 버전 (get_client는 redis.asyncio 클라이언트)"""
+
+    async def save(self, sid, fields):
+        pipe = self.get_client().pipeline(transaction=False)
+        pipe.delete(self.key(sid))
+        pipe.hset(self.key(sid), mapping=fields)
+        pipe.expire(self.key(sid), self.lifetime)
+        await pipe.execute()
+
+    async def get(self, sid, field):
+        value = await self.get_client().hget(self.key(sid), field)
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def delete(self, sid):
+        await self.get_client().delete(self.key(sid))
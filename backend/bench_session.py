@@ -0,0 +1,91 @@
+"""세션 직렬화 벤치마크
+
+사용법: python bench_session.py [동시 사용자 수] [반복 횟수]
+
+로그인 세션 하나를 직렬화 형식별로 저장(encode)/로드(decode)하는 시간과 세션당 크기를 비교하고,
+동시 사용자 수에 대한 Redis 세션 값 크기를 추정합니다.
+- pickle (full): 기존 Flask-Session pickle 형식, 전체 필드
+- msgpack (full): Flask-Session 기본 msgpack 형식, 전체 필드
+- msgpack (trimmed): user_agent/remote_addr를 session_details Hash로 분리한 세션
+- compact (trimmed): 고정 레이아웃 직렬화기 (SESSION_SERIALIZER=compact)
+
+Redis 키/만료 정보 등 키마다 붙는 오버헤드는 포함하지 않습니다. (session_details Hash는 로그인 시에만 쓰고 요청마다 읽지 않음)
+"""
+import sys
+import time
+import pickle
+import hashlib
+from datetime import datetime, timezone
+from flask import Flask
+from flask_session.base import MsgSpecSerializer
+from session_store import CompactSessionSerializer
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36")
+REMOTE_ADDR = "10.244.1.23"
+
+
+class _PickleSerializer:
+    def encode(self, session):
+        return pickle.dumps(dict(session))
+
+    def decode(self, data):
+        return pickle.loads(data)
+
+
+def full_session():
+    now = datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
+    return {
+        "_permanent": True,
+        "user_id": "alice",
+        "login_time": now,
+        "last_activity": now,
+        "user_agent": USER_AGENT,
+        "remote_addr": REMOTE_ADDR,
+        "browser_id": hashlib.md5(f"{USER_AGENT}:{REMOTE_ADDR}".encode()).hexdigest()[:12],
+    }
+
+
+def trimmed_session():
+    session = full_session()
+    del session["user_agent"]
+    del session["remote_addr"]
+    return session
+
+
+def measure(serializer, session, iterations):
+    data = serializer.encode(session)
+    assert serializer.decode(data) == session
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        serializer.encode(session)
+    save = (time.perf_counter() - start) / iterations * 1_000_000
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        serializer.decode(data)
+    load = (time.perf_counter() - start) / iterations * 1_000_000
+    return save, load, len(data)
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    app = Flask(__name__)
+
+    cases = [
+        ("pickle (full)", _PickleSerializer(), full_session()),
+        ("msgpack (full)", MsgSpecSerializer(app=app, format="msgpack"), full_session()),
+        ("msgpack (trimmed)", MsgSpecSerializer(app=app, format="msgpack"), trimmed_session()),
+        ("compact (trimmed)", CompactSessionSerializer(app), trimmed_session()),
+    ]
+
+    print(f"{'format':<20} {'save µs':>8} {'load µs':>8} {'bytes':>6} {f'{users} users':>14}")
+    for name, serializer, session in cases:
+        save, load, size = measure(serializer, session, iterations)
+        print(f"{name:<20} {save:8.2f} {load:8.2f} {size:6d} {size * users / 1024 / 1024:11.2f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""log_operation의 요청당 텔레메트리 오버헤드 벤치마크
+
+사용법: python bench_telemetry.py [요청 수]
+
+Flask 테스트 클라이언트로 다음 모드의 요청당 처리 시간을 비교합니다.
+- off: 텔레메트리 비활성화 (Flask 자동 계측 제거, log_operation 없는 라우트), 다른 모드의 비교 기준
+- full: 모든 요청 샘플링 (OTEL_TRACES_SAMPLER_ARG=1.0)
+- sampled: 10% 샘플링 + low overhead 모드
+- unsampled: 샘플링 0% + low overhead 모드 (기록하지 않는 span 생성, 컨텍스트 전파, 메트릭 기록은 남음)
+
+익스포터는 메모리 익스포터로 대체하므로 네트워크 비용은 포함되지 않습니다.
+세션은 Redis 대신 쿠키 세션을 사용합니다.
+"""
+import os
+import sys
+import time
+import logging
+
+# 벤치마크에 필요 없는 백그라운드 작업 비활성화
+os.environ.setdefault('MESSAGING_LOG_VIEW_SIZE', '0')
+os.environ.setdefault('MESSAGE_COUNTER_RECONCILE_INTERVAL', '0')
+
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk._logs.export import InMemoryLogExporter
+from telemetry import TelemetryManager, telemetry_manager
+
+TelemetryManager._setup_span_exporters = lambda self: [InMemorySpanExporter()]
+TelemetryManager._setup_log_exporters = lambda self: [InMemoryLogExporter()]
+
+from flask import jsonify
+from flask.sessions import SecureCookieSessionInterface
+from opentelemetry.instrumentation.flask import FlaskInstrumentor
+from app import app, log_operation
+
+MODES = [
+    ("full", 1.0, False),
+    ("sampled", 0.1, True),
+    ("unsampled", 0.0, True),
+]
+
+
+@app.route('/bench/baseline')
+def bench_baseline():
+    return jsonify({"status": "ok"})
+
+
+@app.route('/bench/operation')
+@log_operation("bench_operation", "bench")
+def bench_operation():
+    return jsonify({"status": "ok"})
+
+
+def measure(client, path, requests):
+    for _ in range(min(200, requests)):
+        client.get(path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    logging.disable(logging.INFO)
+    app.session_interface = SecureCookieSessionInterface()
+    client = app.test_client()
+
+    results = []
+    for name, ratio, low_overhead in MODES:
+        telemetry_manager.configure_sampling(ratio=ratio, low_overhead=low_overhead)
+        results.append((name, measure(client, '/bench/operation', requests)))
+
+    # Flask 자동 계측을 제거한 뒤에는 다시 적용하지 않으므로 off는 마지막에 측정
+    FlaskInstrumentor().uninstrument_app(app)
+    off = measure(client, '/bench/baseline', requests)
+    print(f"{'off':<10} {off:8.1f} µs/req")
+    for name, elapsed in results:
+        print(f"{name:<10} {elapsed:8.1f} µs/req  (+{elapsed - off:.1f} µs)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+import mysql.connector
+from telemetry import telemetry_manager
+
+
+class PoolTimeoutError(Exception):
+    """대기 시간 안에 연결을 빌려오지 못했을 때 발생합니다."""
+    pass
+
+
+class _PoolEntry:
+    """풀에서 관리하는 연결과 생성 시각"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+
+
+class DatabaseConnectionPool:
+    """프로세스 전역 MariaDB 연결 풀
+
+    - min_size: 워밍업 시 미리 열어두는 연결 수
+    - max_size: 동시에 열 수 있는 최대 연결 수
+    - max_lifetime: 연결 최대 수명(초), 초과 시 폐기 후 재연결
+    - borrow_timeout: 연결을 빌려올 때 최대 대기 시간(초)
+    - health_check: 빌려줄 때 ping으로 연결 상태 확인 여부
+    """
+
+    def __init__(self, connect_kwargs, min_size=1, max_size=10, max_lifetime=1800,
+                 borrow_timeout=10, health_check=True, name="mariadb"):
+        self.connect_kwargs = connect_kwargs
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.max_lifetime = max_lifetime
+        self.borrow_timeout = borrow_timeout
+        self.health_check = health_check
+        self.name = name
+
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        telemetry_manager.register_gauge(
+            "db_pool_connections_in_use", lambda: self._in_use, {"pool": self.name},
+            description="사용 중인 DB 연결 수"
+        )
+        telemetry_manager.register_gauge(
+            "db_pool_connections_idle", lambda: len(self._idle), {"pool": self.name},
+            description="유휴 DB 연결 수"
+        )
+
+    def warm_up(self):
+        """min_size만큼 연결을 미리 생성합니다."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                entry = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+
+    def _connect(self):
+        """새 연결을 생성합니다."""
+        try:
+            connection = mysql.connector.connect(**self.connect_kwargs)
+            telemetry_manager.log_info("Database connection established", lambda: {
+                "action": "db_connect",
+                "host": self.connect_kwargs.get('host'),
+                "database": self.connect_kwargs.get('database'),
+                "component": "database"
+            }, component="database")
+            return _PoolEntry(connection)
+        except Exception as e:
+            telemetry_manager.log_error("Database connection failed: %s", lambda: {
+                "action": "db_connect_error",
+                "host": self.connect_kwargs.get('host'),
+                "database": self.connect_kwargs.get('database'),
+                "error": str(e),
+                "component": "database"
+            }, args=(e,), component="database")
+            raise
+
+    def _is_expired(self, entry):
+        return self.max_lifetime > 0 and time.monotonic() - entry.created_at > self.max_lifetime
+
+    def _is_healthy(self, entry):
+        try:
+            return entry.connection.is_connected()
+        except Exception:
+            return False
+
+    def _close_entry(self, entry):
+        try:
+            entry.connection.close()
+        except Exception:
+            pass
+
+    def _acquire(self):
+        """풀에서 연결을 빌려옵니다. 필요하면 새로 생성합니다."""
+        start = time.monotonic()
+        deadline = start + self.borrow_timeout
+        entry = None
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeoutError(f"{self.name} 연결 풀이 종료되었습니다")
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    telemetry_manager.record_metric("db_pool_borrow_timeouts_total", 1, {"pool": self.name})
+                    raise PoolTimeoutError(
+                        f"{self.borrow_timeout}초 안에 {self.name} 연결을 빌려오지 못했습니다 (max_size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+            self._in_use += 1
+
+        try:
+            # 수명이 지났거나 상태 확인에 실패한 연결은 교체
+            if entry is not None and (self._is_expired(entry) or
+                                      (self.health_check and not self._is_healthy(entry))):
+                self._close_entry(entry)
+                entry = None
+            if entry is None:
+                entry = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        telemetry_manager.record_histogram(
+            "db_pool_wait_time_ms", (time.monotonic() - start) * 1000, {"pool": self.name}
+        )
+        return entry
+
+    def _release(self, entry, discard=False):
+        """연결을 풀에 반환합니다. discard면 연결을 닫습니다."""
+        if not discard:
+            try:
+                # 커밋되지 않은 트랜잭션이 다음 사용자에게 넘어가지 않도록 정리
+                if entry.connection.in_transaction:
+                    entry.connection.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed or self._is_expired(entry):
+                self._size -= 1
+                close_entry = True
+            else:
+                self._idle.append(entry)
+                close_entry = False
+            self._cond.notify()
+
+        if close_entry:
+            self._close_entry(entry)
+
+    @contextmanager
+    def connection(self):
+        """with 문으로 연결을 빌려오고 블록이 끝나면 반환합니다."""
+        entry = self._acquire()
+        discard = False
+        try:
+            yield entry.connection
+        except Exception:
+            try:
+                entry.connection.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            self._release(entry, discard=discard)
+
+    def stats(self):
+        """풀 상태를 반환합니다."""
+        with self._cond:
+            return {
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "max_size": self.max_size
+            }
+
+    def close(self):
+        """유휴 연결을 모두 닫고 풀을 종료합니다."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._close_entry(entry)
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_db_pool():
+    """환경 변수 설정으로 프로세스 전역 연결 풀을 반환합니다.
+
+    fork 이후 자식 프로세스에서는 부모의 연결(소켓 공유)을 사용하지 않고 새 풀을 생성합니다.
+    부모의 연결은 닫지 않고 버립니다. (닫으면 부모 프로세스의 연결이 끊어짐)
+    """
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                pool = DatabaseConnectionPool(
+                    connect_kwargs={
+                        "host": os.getenv('MYSQL_HOST', 'my-mariadb'),
+                        "user": os.getenv('MYSQL_USER', 'testuser'),
+                        "password": os.getenv('MYSQL_PASSWORD'),
+                        "database": "yejun-db",
+                        "connect_timeout": int(os.getenv('DB_CONNECT_TIMEOUT', '30'))
+                    },
+                    min_size=int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+                    max_size=int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+                    max_lifetime=float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),
+                    borrow_timeout=float(os.getenv('DB_POOL_BORROW_TIMEOUT', '10')),
+                    health_check=os.getenv('DB_POOL_HEALTH_CHECK', 'true').lower() == 'true'
+                )
+                try:
+                    pool.warm_up()
+                except Exception as e:
+                    telemetry_manager.log_warn(f"Database pool warm-up failed: {str(e)}", {
+                        "action": "db_pool_warm_up_error",
+                        "error": str(e),
+                        "component": "database"
+                    })
+                _pool = pool
+                _pool_pid = os.getpid()
+    return _pool
@@ -0,0 +1,50 @@
+"""gunicorn 운영 서버 설정
+
+사용법: gunicorn -c gunicorn.conf.py app:app
+
+- 마스터가 앱을 한 번 import(preload)한 뒤 워커를 fork하여 import 비용과 메모리를 공유합니다.
+- 텔레메트리 Provider/Exporter와 백그라운드 스레드는 워커 fork 이후(post_fork) 워커마다 초기화합니다.
+  DB/Redis 연결 풀, Kafka Producer, Event Hubs Publisher는 pid를 확인하여 워커에서 처음 사용할 때 새로 생성됩니다.
+- 종료 시(SIGTERM) 진행 중인 요청을 graceful_timeout 동안 마친 뒤 대기 중인 로그/메시지를 내보내고
+  telemetry_manager.shutdown()을 호출합니다.
+"""
+import os
+import multiprocessing
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+# 워커/스레드 모델 (gthread: 워커 프로세스마다 스레드 풀로 요청 처리)
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.getenv('GUNICORN_WORKERS', str(multiprocessing.cpu_count())))
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+# 메모리 누수 대비 워커 재시작 (0이면 비활성화)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '0'))
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+if preload_app:
+    # app.py가 import 시 프로세스별 자원을 초기화하지 않도록 (post_fork의 init_worker에서 초기화)
+    os.environ['DEFER_WORKER_INIT'] = 'true'
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    """워커 프로세스에서 텔레메트리 Provider와 백그라운드 스레드를 초기화합니다."""
+    if server.cfg.preload_app:
+        from app import init_worker
+        init_worker()
+        server.log.info(f"Worker initialized (pid={worker.pid})")
+
+
+def worker_exit(server, worker):
+    """대기 중인 로그/메시지를 내보내고 텔레메트리를 종료합니다."""
+    from app import shutdown_worker
+    shutdown_worker()
@@ -0,0 +1,25 @@
+"""hypercorn 운영 서버 설정 (asyncio 백엔드)
+
+사용법: hypercorn -c file:hypercorn.conf.py async_app:app
+
+- 워커 프로세스마다 하나의 이벤트 루프에서 요청을 처리합니다. 동시 요청 수는 스레드 수가 아니라
+  DB 연결 풀(DB_POOL_MAX_SIZE)과 Redis 연결 풀(REDIS_POOL_MAX_CONNECTIONS) 크기로 제한됩니다.
+- DB/Redis 연결 풀, 로그 기록기, 메시징 클라이언트는 async_app의 before_serving에서 워커마다 생성되고
+  종료 시(SIGTERM) graceful_timeout 동안 진행 중인 요청을 마친 뒤 after_serving에서 정리됩니다.
+"""
+import os
+import multiprocessing
+
+bind = [os.getenv('HYPERCORN_BIND', '0.0.0.0:5000')]
+
+# 워커 모델 (asyncio 또는 uvloop)
+worker_class = os.getenv('HYPERCORN_WORKER_CLASS', 'asyncio')
+workers = int(os.getenv('HYPERCORN_WORKERS', str(multiprocessing.cpu_count())))
+
+keep_alive_timeout = int(os.getenv('HYPERCORN_KEEPALIVE', '5'))
+graceful_timeout = int(os.getenv('HYPERCORN_GRACEFUL_TIMEOUT', '30'))
+backlog = int(os.getenv('HYPERCORN_BACKLOG', '2048'))
+
+accesslog = os.getenv('HYPERCORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.getenv('HYPERCORN_LOG_LEVEL', 'info')
@@ -0,0 +1,214 @@
+import os
+import sys
+import time
+import threading
+from telemetry import telemetry_manager
+
+# 전체 메시지 수를 저장하는 scope
+GLOBAL_SCOPE = "__all__"
+
+
+# 카운터 갱신/조회 쿼리 (async_db와 공유)
+INCREMENT_SQL = ("INSERT INTO message_counters (scope, total) VALUES (%s, %s), (%s, %s) "
+                 "ON DUPLICATE KEY UPDATE total = total + VALUES(total)")
+COUNTER_SQL = "SELECT total FROM message_counters WHERE scope = %s"
+
+
+def _user_scope(user_id):
+    return f"user:{user_id}"
+
+
+def increment_args(user_id, delta=1):
+    return (GLOBAL_SCOPE, delta, _user_scope(user_id), delta)
+
+
+def scope_for(user_id=None):
+    return GLOBAL_SCOPE if user_id is None else _user_scope(user_id)
+
+
+def fallback_count_query(user_id=None):
+    """카운터가 없을 때 사용하는 COUNT(*) 쿼리와 바인딩 값을 반환합니다."""
+    if user_id is None:
+        return "SELECT COUNT(*) AS total FROM messages", ()
+    return "SELECT COUNT(*) AS total FROM messages WHERE user_id = %s", (user_id,)
+
+
+def row_total(row):
+    return int(row['total'] if isinstance(row, dict) else row[0])
+
+
+def increment(cursor, user_id, delta=1):
+    """메시지 저장/삭제 시 전체 및 사용자별 카운터를 갱신합니다.
+
+    메시지 INSERT/DELETE와 같은 트랜잭션에서 호출해야 카운터와 실제 행이 함께 커밋됩니다.
+    대량 처리 시에는 delta에 변경된 행 수를 전달합니다. (삭제는 음수)
+    """
+    cursor.execute(INCREMENT_SQL, increment_args(user_id, delta))
+
+
+def get_count(cursor, user_id=None):
+    """카운터 테이블에서 메시지 수를 O(1)로 읽습니다.
+
+    카운터가 아직 없으면 (재조정 전의 기존 데이터) COUNT(*)로 대신 계산합니다.
+    """
+    cursor.execute(COUNTER_SQL, (scope_for(user_id),))
+    row = cursor.fetchone()
+    if row is not None:
+        return row_total(row)
+
+    cursor.execute(*fallback_count_query(user_id))
+    return row_total(cursor.fetchone())
+
+
+# 재조정 쿼리 (async_db와 공유)
+# 1단계: 잠금 없는 스냅샷으로 불일치 scope 찾기
+COUNTER_SNAPSHOT_SQL = "SELECT scope, total FROM message_counters"
+ACTUAL_COUNTS_SQL = "SELECT user_id, COUNT(*) AS total FROM messages GROUP BY user_id"
+# 2단계: scope별 짧은 트랜잭션에서 카운터 행만 잠그고 다시 계산
+LOCK_COUNTER_SQL = "SELECT total FROM message_counters WHERE scope = %s FOR UPDATE"
+REPAIR_SQL = ("INSERT INTO message_counters (scope, total) VALUES (%s, %s) "
+              "ON DUPLICATE KEY UPDATE total = VALUES(total)")
+
+# 재조정 실행 권한 (모든 파드/워커 중 interval마다 하나만 실행)
+RECONCILE_LEASE_KEY = "message_counters:reconcile_lease"
+
+
+def user_for_scope(scope):
+    """scope에 해당하는 user_id를 반환합니다. (전체 scope는 None)"""
+    return None if scope == GLOBAL_SCOPE else scope[len(_user_scope("")):]
+
+
+def _is_drift(current, expected):
+    return current != expected if current is not None else bool(expected)
+
+
+def find_drift(counter_rows, actual_rows):
+    """카운터 행과 실제 사용자별 COUNT 결과를 비교하여 차이 목록을 반환합니다."""
+    counters = {row['scope']: int(row['total']) for row in counter_rows}
+    actual = {_user_scope(row['user_id']): int(row['total']) for row in actual_rows}
+    actual[GLOBAL_SCOPE] = sum(actual.values())
+
+    drift = []
+    for scope in set(actual) | set(counters):
+        expected = actual.get(scope, 0)
+        current = counters.get(scope)
+        if _is_drift(current, expected):
+            drift.append({"scope": scope, "counter": current, "actual": expected})
+    return drift
+
+
+def repaired_item(scope, row, count_row):
+    """잠근 카운터 행과 다시 계산한 COUNT로 차이 항목을 만듭니다. 차이가 없어졌으면 None"""
+    current = row_total(row) if row is not None else None
+    expected = row_total(count_row)
+    if not _is_drift(current, expected):
+        return None
+    return {"scope": scope, "counter": current, "actual": expected}
+
+
+def record_drift(drift, repair):
+    if drift:
+        telemetry_manager.record_metric("message_counter_drift_total", len(drift), {"repaired": str(repair).lower()})
+        telemetry_manager.log_warn(f"Message counter drift detected: {len(drift)} scopes", {
+            "action": "message_counter_drift",
+            "repaired": repair,
+            "component": "database"
+        })
+
+
+def _repair_scope(db, cursor, scope):
+    """scope 하나의 카운터 행을 잠근 채 실제 값을 다시 계산하여 수정합니다.
+
+    카운터 행을 먼저 잠그므로 진행 중인 INSERT의 카운터 갱신은 이 트랜잭션이 끝날 때까지만 대기하고,
+    그 INSERT는 잠금 이후의 COUNT 스냅샷에 포함되지 않아 이중으로 계산되지 않습니다.
+    """
+    try:
+        cursor.execute(LOCK_COUNTER_SQL, (scope,))
+        row = cursor.fetchone()
+        cursor.execute(*fallback_count_query(user_for_scope(scope)))
+        item = repaired_item(scope, row, cursor.fetchone())
+        if item is not None:
+            cursor.execute(REPAIR_SQL, (scope, item["actual"]))
+        db.commit()
+        return item
+    except Exception:
+        db.rollback()
+        raise
+
+
+def reconcile(db, repair=False):
+    """카운터와 실제 messages 테이블을 비교합니다.
+
+    Args:
+        db: MariaDB 연결
+        repair: True면 차이가 나는 카운터를 실제 값으로 수정합니다.
+
+    Returns:
+        차이 목록 [{"scope", "counter", "actual"}, ...]
+
+    전체 비교는 잠금 없는 스냅샷으로 하고, 수정은 차이가 난 scope만 각각의 짧은 트랜잭션에서
+    카운터 행 하나를 잠근 뒤 다시 계산합니다. 따라서 전체 스캔 동안 메시지 저장이 대기하지 않습니다.
+    """
+    cursor = db.cursor(dictionary=True)
+    try:
+        cursor.execute(COUNTER_SNAPSHOT_SQL)
+        counter_rows = cursor.fetchall()
+        cursor.execute(ACTUAL_COUNTS_SQL)
+        drift = find_drift(counter_rows, cursor.fetchall())
+        db.commit()
+
+        if repair and drift:
+            # 스냅샷의 차이는 진행 중이던 트랜잭션 때문일 수 있으므로 잠근 뒤 다시 확인
+            drift = [item for item in (_repair_scope(db, cursor, d["scope"]) for d in drift) if item is not None]
+    finally:
+        cursor.close()
+
+    record_drift(drift, repair)
+    return drift
+
+
+def acquire_lease(client, interval):
+    """이번 interval의 재조정 실행 권한을 얻으면 True를 반환합니다.
+
+    lease는 해제하지 않고 만료되게 두므로 워커/파드 수와 관계없이 interval마다 한 번만 실행됩니다.
+    Redis 오류 시에는 실행하지 않습니다.
+    """
+    try:
+        return bool(client.set(RECONCILE_LEASE_KEY, os.getpid(), nx=True, px=int(interval * 1000)))
+    except Exception as e:
+        print(f"Message counter lease error: {str(e)}")
+        return False
+
+
+def start_reconciler(get_connection, interval, get_client):
+    """시작 시, 이후 interval(초)마다 lease를 얻은 경우에만 카운터를 검사하고 수정하는 백그라운드 스레드를 시작합니다."""
+    def _run():
+        while True:
+            if acquire_lease(get_client(), interval):
+                try:
+                    with get_connection() as db:
+                        reconcile(db, repair=True)
+                except Exception as e:
+                    telemetry_manager.log_error(f"Message counter reconciliation failed: {str(e)}", {
+                        "action": "message_counter_reconcile_error",
+                        "error": str(e),
+                        "component": "database"
+                    })
+            time.sleep(interval)
+
+    thread = threading.Thread(target=_run, name="message-counter-reconciler", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == '__main__':
+    # 사용법: python message_counters.py [--repair]
+    from db_pool import get_db_pool
+
+    repair = '--repair' in sys.argv[1:]
+    with get_db_pool().connection() as db:
+        result = reconcile(db, repair=repair)
+    for item in result:
+        print(f"{item['scope']}: counter={item['counter']} actual={item['actual']}")
+    print(f"{len(result)}개 카운터 불일치" + (" (수정 완료)" if repair and result else ""))
+    sys.exit(1 if result and not repair else 0)
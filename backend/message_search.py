@@ -0,0 +1,161 @@
+import os
+import re
+import mysql.connector
+from telemetry import telemetry_manager
+
+# MariaDB 오류 코드: FULLTEXT 인덱스를 찾을 수 없음
+ER_FT_MATCHING_KEY_NOT_FOUND = 1191
+
+# 검색어 토큰 (한글 포함 유니코드 단어)
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def _tokenize(query, max_terms=10):
+    return _TOKEN_PATTERN.findall(query.lower())[:max_terms]
+
+
+class MessageSearch:
+    """messages.message 검색 엔진
+
+    engine:
+    - fulltext: MariaDB FULLTEXT 인덱스 (ft_messages_message) 사용, 관련도 순 정렬
+    - like: 기존 LIKE '%q%' 전체 스캔 (대체 경로)
+
+    mode (fulltext 전용):
+    - boolean: 모든 검색어를 접두어로 포함해야 일치 (+term*), 한글 조사가 붙은 단어도 일치
+    - natural: 자연어 모드, 하나 이상의 검색어가 포함되면 일치
+    """
+
+    def __init__(self, engine="fulltext", mode="boolean"):
+        if engine not in ("fulltext", "like"):
+            raise ValueError(f"지원하지 않는 검색 엔진: {engine}")
+        if mode not in ("boolean", "natural"):
+            raise ValueError(f"지원하지 않는 FULLTEXT 모드: {mode}")
+        self.engine = engine
+        self.mode = mode
+
+    def _against(self, query):
+        """AGAINST 절과 바인딩할 검색식을 반환합니다. 검색어가 없으면 None."""
+        terms = _tokenize(query)
+        if not terms:
+            return None, None
+        if self.mode == "boolean":
+            return "IN BOOLEAN MODE", " ".join(f"+{term}*" for term in terms)
+        return "IN NATURAL LANGUAGE MODE", " ".join(terms)
+
+    def _statements(self, query, fulltext_sql, like_sql, params=()):
+        """실행할 (FULLTEXT, LIKE) 쿼리와 바인딩 값을 반환합니다.
+
+        fulltext_sql의 AGAINST 절마다 검색식이 바인딩되고, 이어서 params가 바인딩됩니다.
+        like 엔진이거나 검색어에 단어 토큰이 없으면 (예: "c++", "?") FULLTEXT 쿼리는 None이며 LIKE로 검색합니다.
+        """
+        like = (like_sql, (f"%{query}%",) + tuple(params))
+        if self.engine != "fulltext":
+            return None, like
+        modifier, expression = self._against(query)
+        if expression is None:
+            return None, like
+        sql = fulltext_sql.format(modifier=modifier)
+        return (sql, (expression,) * sql.count("AGAINST") + tuple(params)), like
+
+    def count_statements(self, query):
+        """검색 결과 수 쿼리 (_statements 형식)"""
+        return self._statements(
+            query,
+            "SELECT COUNT(*) AS total FROM messages WHERE MATCH(message) AGAINST (%s {modifier})",
+            "SELECT COUNT(*) AS total FROM messages WHERE message LIKE %s"
+        )
+
+    def search_statements(self, query, limit=None, offset=0, columns="*"):
+        """검색 결과 쿼리 (_statements 형식)"""
+        page_sql = " LIMIT %s OFFSET %s" if limit is not None else ""
+        return self._statements(
+            query,
+            f"SELECT {columns} FROM messages WHERE MATCH(message) AGAINST (%s {{modifier}}) "
+            f"ORDER BY MATCH(message) AGAINST (%s {{modifier}}) DESC, id DESC{page_sql}",
+            f"SELECT {columns} FROM messages WHERE message LIKE %s ORDER BY id DESC{page_sql}",
+            (limit, offset) if limit is not None else ()
+        )
+
+    @staticmethod
+    def log_fallback():
+        telemetry_manager.log_warn("FULLTEXT index not found, falling back to LIKE search", {
+            "action": "search_fulltext_fallback",
+            "component": "search"
+        })
+
+    def _run(self, cursor, statements):
+        """FULLTEXT 쿼리를 실행하고, 인덱스가 없으면 LIKE로 대체합니다."""
+        fulltext, like = statements
+        if fulltext is not None:
+            try:
+                cursor.execute(*fulltext)
+                return
+            except mysql.connector.Error as e:
+                if e.errno != ER_FT_MATCHING_KEY_NOT_FOUND:
+                    raise
+                self.log_fallback()
+        cursor.execute(*like)
+
+    def matches(self, query, message):
+        """메시지가 검색 결과에 포함될 수 있으면 True를 반환합니다. (캐시 무효화용)
+
+        DB 검색보다 넓게 판단합니다. (불용어/최소 토큰 길이 무시, FULLTEXT는 LIKE 대체 경로도 고려)
+        """
+        text = message.lower()
+        # LIKE의 %, _ 와일드카드가 포함된 검색어는 항상 일치로 간주
+        if query.lower() in text or "%" in query or "_" in query:
+            return True
+        if self.engine == "like":
+            return False
+        terms = _tokenize(query)
+        tokens = set(_TOKEN_PATTERN.findall(text))
+        if not terms:
+            return False
+        if self.mode == "boolean":
+            return all(any(token.startswith(term) for token in tokens) for term in terms)
+        return any(term in tokens for term in terms)
+
+    def count(self, cursor, query):
+        """검색 결과 수를 반환합니다."""
+        self._run(cursor, self.count_statements(query))
+        return cursor.fetchone()['total']
+
+    def search(self, cursor, query, limit=None, offset=0, columns="*"):
+        """검색 결과를 관련도(FULLTEXT) 또는 최신순(LIKE)으로 반환합니다.
+
+        limit이 None이면 전체 결과를 반환합니다.
+        """
+        self._run(cursor, self.search_statements(query, limit, offset, columns))
+        return cursor.fetchall()
+
+
+def ids_query(ids):
+    """ID 목록의 메시지를 기본 키로 조회하는 쿼리와 바인딩 값을 반환합니다."""
+    placeholders = ", ".join(["%s"] * len(ids))
+    return f"SELECT * FROM messages WHERE id IN ({placeholders})", tuple(ids)
+
+
+def order_by_ids(rows, ids):
+    rows = {row['id']: row for row in rows}
+    return [rows[message_id] for message_id in ids if message_id in rows]
+
+
+def fetch_messages_by_ids(cursor, ids):
+    """ID 목록의 메시지를 기본 키로 조회하여 ID 순서대로 반환합니다."""
+    if not ids:
+        return []
+    cursor.execute(*ids_query(ids))
+    return order_by_ids(cursor.fetchall(), ids)
+
+
+def get_message_search():
+    """환경 변수 설정으로 검색 엔진을 생성합니다.
+
+    SEARCH_ENGINE: fulltext(기본) 또는 like
+    SEARCH_FULLTEXT_MODE: boolean(기본) 또는 natural
+    """
+    return MessageSearch(
+        engine=os.getenv('SEARCH_ENGINE', 'fulltext').lower(),
+        mode=os.getenv('SEARCH_FULLTEXT_MODE', 'boolean').lower()
+    )
@@ -1,8 +1,12 @@
 import os
 import json
+import time
+import atexit
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from threading import Thread
+from threading import Thread, Lock, Condition, Event
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from telemetry import telemetry_manager
 
@@ -10,6 +14,74 @@ from telemetry import telemetry_manager
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 프로세스 전역 Kafka Producer (앱 수명 동안 유지)
+_kafka_producer = None
+_kafka_producer_pid = None
+_kafka_producer_lock = Lock()
+
+def _on_kafka_send_success(topic, record_metadata):
+    """Kafka 전송 완료 콜백"""
+    logger.debug(f"✅ Kafka message sent: topic={record_metadata.topic}, partition={record_metadata.partition}, offset={record_metadata.offset}")
+    telemetry_manager.record_metric("kafka_messages_sent_total", 1, {"topic": topic, "status": "success"})
+
+def _on_kafka_send_error(topic, exc):
+    """Kafka 전송 실패 콜백"""
+    logger.error(f"❌ Kafka send error: {str(exc)}")
+    telemetry_manager.record_metric("kafka_messages_sent_total", 1, {"topic": topic, "status": "error"})
+
+def shutdown_kafka_producer(timeout=10):
+    """버퍼에 남은 메시지를 전송하고 Producer를 종료합니다."""
+    global _kafka_producer, _kafka_producer_pid
+    with _kafka_producer_lock:
+        producer, pid = _kafka_producer, _kafka_producer_pid
+        _kafka_producer = None
+        _kafka_producer_pid = None
+    # 부모 프로세스에서 물려받은 Producer는 이 프로세스가 닫지 않음
+    if producer is None or pid != os.getpid():
+        return
+    try:
+        producer.flush(timeout=timeout)
+        producer.close(timeout=timeout)
+        logger.info("Kafka Producer가 정상 종료되었습니다.")
+    except Exception as e:
+        logger.error(f"❌ Kafka Producer 종료 오류: {str(e)}")
+
+atexit.register(shutdown_kafka_producer)
+
+# 프로세스 전역 Event Hubs 배치 Publisher
+_eventhub_publisher = None
+_eventhub_publisher_pid = None
+_eventhub_publisher_lock = Lock()
+
+def shutdown_eventhub_publisher(timeout=10):
+    """버퍼에 남은 이벤트를 전송하고 Event Hubs Publisher를 종료합니다."""
+    global _eventhub_publisher, _eventhub_publisher_pid
+    with _eventhub_publisher_lock:
+        publisher, pid = _eventhub_publisher, _eventhub_publisher_pid
+        _eventhub_publisher = None
+        _eventhub_publisher_pid = None
+    if publisher is not None and pid == os.getpid():
+        publisher.close(timeout)
+        logger.info("Event Hubs Publisher가 정상 종료되었습니다.")
+
+atexit.register(shutdown_eventhub_publisher)
+
+def _log_entry(data):
+    """API 로그 이벤트에서 조회 응답에 포함할 필드만 추출합니다."""
+    return {
+        'timestamp': data['timestamp'],
+        'endpoint': data['endpoint'],
+        'method': data['method'],
+        'status': data['status'],
+        'user_id': data['user_id'],
+        'message': data['message']
+    }
+
+def _merge_latest(records, n):
+    """파티션별로 읽은 (partition, position, entry) 목록을 시간순으로 합쳐 최신 n개를 반환합니다."""
+    records.sort(key=lambda r: (r[2]['timestamp'], str(r[0]), r[1]))
+    return [entry for _, _, entry in records[-n:]] if n > 0 else []
+
 class MessagingInterface(ABC):
     """메시징 시스템을 위한 추상 인터페이스"""
     
@@ -23,6 +95,25 @@ class MessagingInterface(ABC):
         """메시지를 조회합니다."""
         pass
     
+    def get_latest(self, topic, n, timeout=5):
+        """파티션마다 최신 n개만 읽어 시간순(오래된 순)으로 합친 최신 n개를 반환합니다.
+        
+        기본 구현은 get_messages로 읽은 뒤 정렬합니다.
+        """
+        messages = self.get_messages(topic, limit=n)
+        messages.sort(key=lambda m: m['timestamp'])
+        return messages[-n:] if n > 0 else []
+    
+    def tail(self, topic, on_message, stop_event, backfill=None, refresh_interval=None):
+        """stop_event가 설정될 때까지 토픽의 메시지를 계속 읽어 on_message로 전달합니다.
+        
+        on_message(partition, position, entry)는 파티션별로 position(오프셋/시퀀스 번호)이
+        증가하는 순서로 호출됩니다. backfill이 주어지면 처음부터가 아니라 파티션별
+        최신 backfill개부터 읽습니다. refresh_interval(초)이 주어지면 그 주기로 파티션 목록을
+        확인하여 바뀌었으면 반환하므로, 호출자는 다시 tail하여 새 파티션을 읽을 수 있습니다.
+        """
+        raise NotImplementedError(f"{type(self).__name__}은 tail을 지원하지 않습니다.")
+    
     @abstractmethod
     def close(self):
         """연결을 종료합니다."""
@@ -33,9 +124,10 @@ class KafkaMessaging(MessagingInterface):
     
     def __init__(self):
         try:
-            from kafka import KafkaProducer, KafkaConsumer
+            from kafka import KafkaProducer, KafkaConsumer, TopicPartition
             self.KafkaProducer = KafkaProducer
             self.KafkaConsumer = KafkaConsumer
+            self.TopicPartition = TopicPartition
         except ImportError:
             raise ImportError("kafka-python 패키지가 설치되지 않았습니다.")
         
@@ -46,47 +138,64 @@ class KafkaMessaging(MessagingInterface):
         
         logger.info(f"Kafka 설정: {self.kafka_servers}")
     
-    def get_producer(self):
-        """Kafka Producer를 생성합니다."""
+    def _producer_config(self):
+        """환경 변수로 조정 가능한 Producer 배치/전송 설정을 반환합니다."""
+        acks = os.getenv('KAFKA_ACKS', '1')
+        config = {
+            'bootstrap_servers': self.kafka_servers,
+            'value_serializer': lambda v: json.dumps(v).encode('utf-8'),
+            'linger_ms': int(os.getenv('KAFKA_LINGER_MS', '5')),
+            'batch_size': int(os.getenv('KAFKA_BATCH_SIZE', '16384')),
+            'compression_type': os.getenv('KAFKA_COMPRESSION_TYPE') or None,
+            'acks': acks if acks == 'all' else int(acks),
+            'max_in_flight_requests_per_connection': int(os.getenv('KAFKA_MAX_IN_FLIGHT', '5'))
+        }
         if self.kafka_password:
-            return self.KafkaProducer(
-                bootstrap_servers=self.kafka_servers,
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-                security_protocol='SASL_PLAINTEXT',
-                sasl_mechanism='PLAIN',
-                sasl_plain_username=self.kafka_username,
-                sasl_plain_password=self.kafka_password
-            )
+            config.update({
+                'security_protocol': 'SASL_PLAINTEXT',
+                'sasl_mechanism': 'PLAIN',
+                'sasl_plain_username': self.kafka_username,
+                'sasl_plain_password': self.kafka_password
+            })
         else:
-            return self.KafkaProducer(
-                bootstrap_servers=self.kafka_servers,
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-                security_protocol='PLAINTEXT'
-            )
+            config['security_protocol'] = 'PLAINTEXT'
+        return config
     
-    def get_consumer(self, topic):
-        """Kafka Consumer를 생성합니다."""
+    def get_producer(self):
+        """프로세스 전역 Kafka Producer를 반환합니다. 없으면 생성합니다.
+        
+        fork 이후 자식 프로세스에서는 부모의 Producer(전송 스레드가 없음)를
+        버리고 새로 생성합니다.
+        """
+        global _kafka_producer, _kafka_producer_pid
+        if _kafka_producer is None or _kafka_producer_pid != os.getpid():
+            with _kafka_producer_lock:
+                if _kafka_producer is None or _kafka_producer_pid != os.getpid():
+                    _kafka_producer = self.KafkaProducer(**self._producer_config())
+                    _kafka_producer_pid = os.getpid()
+                    logger.info(f"Kafka Producer 생성됨 (pid={_kafka_producer_pid})")
+        return _kafka_producer
+    
+    def get_consumer(self, topic, **overrides):
+        """Kafka Consumer를 생성합니다. topic이 None이면 구독하지 않습니다. (assign용)"""
+        config = {
+            'bootstrap_servers': self.kafka_servers,
+            'value_deserializer': lambda m: json.loads(m.decode('utf-8')),
+            'auto_offset_reset': 'earliest',
+            'consumer_timeout_ms': 5000
+        }
         if self.kafka_password:
-            return self.KafkaConsumer(
-                topic,
-                bootstrap_servers=self.kafka_servers,
-                value_deserializer=lambda m: json.loads(m.decode('utf-8')),
-                security_protocol='SASL_PLAINTEXT',
-                sasl_mechanism='PLAIN',
-                sasl_plain_username=self.kafka_username,
-                sasl_plain_password=self.kafka_password,
-                auto_offset_reset='earliest',
-                consumer_timeout_ms=5000
-            )
+            config.update({
+                'security_protocol': 'SASL_PLAINTEXT',
+                'sasl_mechanism': 'PLAIN',
+                'sasl_plain_username': self.kafka_username,
+                'sasl_plain_password': self.kafka_password
+            })
         else:
-            return self.KafkaConsumer(
-                topic,
-                bootstrap_servers=self.kafka_servers,
-                value_deserializer=lambda m: json.loads(m.decode('utf-8')),
-                security_protocol='PLAINTEXT',
-                auto_offset_reset='earliest',
-                consumer_timeout_ms=5000
-            )
+            config['security_protocol'] = 'PLAINTEXT'
+        config.update(overrides)
+        topics = (topic,) if topic else ()
+        return self.KafkaConsumer(*topics, **config)
     
     def send_message(self, topic, message):
         """Kafka에 메시지를 전송합니다."""
@@ -98,19 +207,12 @@ class KafkaMessaging(MessagingInterface):
                 span.set_attribute("messaging.topic", topic)
                 span.set_attribute("messaging.message_size", len(str(message)))
                 
+                # 클라이언트 버퍼에 추가만 하고 전송 결과는 콜백으로 처리
                 producer = self.get_producer()
                 future = producer.send(topic, message)
-                record_metadata = future.get(timeout=10)
+                future.add_callback(_on_kafka_send_success, topic)
+                future.add_errback(_on_kafka_send_error, topic)
                 
-                span.set_attribute("messaging.partition", record_metadata.partition)
-                span.set_attribute("messaging.offset", record_metadata.offset)
-                
-                logger.info(f"✅ Kafka message sent: topic={record_metadata.topic}, partition={record_metadata.partition}, offset={record_metadata.offset}")
-                producer.flush()
-                producer.close()
-                
-                # 메트릭 기록
-                telemetry_manager.record_metric("kafka_messages_sent_total", 1, {"topic": topic, "status": "success"})
                 return True
             except Exception as e:
                 span.set_attribute("error", True)
@@ -126,14 +228,7 @@ class KafkaMessaging(MessagingInterface):
             messages = []
             
             for message in consumer:
-                messages.append({
-                    'timestamp': message.value['timestamp'],
-                    'endpoint': message.value['endpoint'],
-                    'method': message.value['method'],
-                    'status': message.value['status'],
-                    'user_id': message.value['user_id'],
-                    'message': message.value['message']
-                })
+                messages.append(_log_entry(message.value))
                 if len(messages) >= limit:
                     break
             
@@ -143,10 +238,238 @@ class KafkaMessaging(MessagingInterface):
             logger.error(f"❌ Kafka receive error: {str(e)}")
             return []
     
+    def _seek_latest(self, consumer, topic, n):
+        """토픽의 모든 파티션을 할당하고 파티션별 끝 오프셋 - n 위치로 이동합니다.
+        
+        Returns:
+            {TopicPartition: 끝 오프셋} (읽을 메시지가 있는 파티션만)
+        """
+        partitions = consumer.partitions_for_topic(topic) or set()
+        tps = [self.TopicPartition(topic, partition) for partition in sorted(partitions)]
+        consumer.assign(tps)
+        if not tps:
+            return {}
+        beginning = consumer.beginning_offsets(tps)
+        end = consumer.end_offsets(tps)
+        pending = {}
+        for tp in tps:
+            start = max(beginning[tp], end[tp] - n)
+            consumer.seek(tp, start)
+            if start < end[tp]:
+                pending[tp] = end[tp]
+        return pending
+    
+    def get_latest(self, topic, n, timeout=5):
+        """파티션별 끝 오프셋 - n부터 끝까지만 읽어 시간순으로 합친 최신 n개를 반환합니다."""
+        consumer = self.get_consumer(None, enable_auto_commit=False)
+        try:
+            pending = self._seek_latest(consumer, topic, n)
+            records = []
+            deadline = time.monotonic() + timeout
+            while pending and time.monotonic() < deadline:
+                batch = consumer.poll(timeout_ms=max(1, int((deadline - time.monotonic()) * 1000)))
+                for tp, messages in batch.items():
+                    end = pending.get(tp)
+                    if end is None:
+                        continue
+                    for message in messages:
+                        if message.offset < end:
+                            try:
+                                records.append((tp.partition, message.offset, _log_entry(message.value)))
+                            except Exception as e:
+                                logger.error(f"Kafka log parsing error: {str(e)}")
+                    if messages and messages[-1].offset >= end - 1:
+                        pending.pop(tp)
+            if pending:
+                logger.warning(f"Kafka 최신 로그 조회 시간 초과: {len(pending)}개 파티션 미완료")
+            return _merge_latest(records, n)
+        except Exception as e:
+            logger.error(f"❌ Kafka receive error: {str(e)}")
+            return []
+        finally:
+            consumer.close()
+    
+    def tail(self, topic, on_message, stop_event, backfill=None, refresh_interval=None):
+        """Kafka 토픽을 처음부터(backfill이 있으면 파티션별 최신 backfill개부터) 읽고
+        이후 새 메시지를 계속 읽습니다. (consumer group 없이 오프셋 커밋 안 함)
+        
+        backfill이 있으면 파티션을 직접 할당(assign)하므로, refresh_interval마다 토픽 메타데이터를
+        다시 조회하여 파티션 목록이 바뀌었으면 반환합니다. (subscribe 방식은 클라이언트가 자동 반영)
+        """
+        assigned = None
+        if backfill is None:
+            consumer = self.get_consumer(topic, consumer_timeout_ms=float('inf'))
+        else:
+            consumer = self.get_consumer(None, consumer_timeout_ms=float('inf'), enable_auto_commit=False)
+            self._seek_latest(consumer, topic, backfill)
+            assigned = {tp.partition for tp in consumer.assignment()}
+        refresh_at = None if refresh_interval is None else time.monotonic() + refresh_interval
+        try:
+            while not stop_event.is_set():
+                if assigned is not None and refresh_at is not None and time.monotonic() >= refresh_at:
+                    refresh_at = time.monotonic() + refresh_interval
+                    consumer.topics()  # 캐시가 아닌 최신 메타데이터를 조회
+                    partitions = consumer.partitions_for_topic(topic)
+                    if partitions and set(partitions) != assigned:
+                        logger.info(f"Kafka 토픽 {topic} 파티션 변경 감지: {sorted(assigned)} -> {sorted(partitions)}")
+                        return
+                records = consumer.poll(timeout_ms=1000)
+                for tp, messages in records.items():
+                    for message in messages:
+                        try:
+                            on_message(tp.partition, message.offset, _log_entry(message.value))
+                        except Exception as e:
+                            logger.error(f"Kafka log parsing error: {str(e)}")
+        finally:
+            consumer.close()
+    
     def close(self):
         """연결을 종료합니다."""
         pass
 
+class EventHubBatchPublisher:
+    """하나의 Producer 클라이언트로 여러 이벤트를 EventDataBatch에 모아 전송합니다.
+    
+    이벤트는 partition_key별로 순서대로 버퍼링되며, 다음 조건 중 하나를 만족하면
+    전용 flush 스레드가 전송합니다.
+    - 버퍼 이벤트 수가 max_batch_events 이상
+    - 버퍼 크기(bytes)가 max_batch_bytes 이상
+    - 가장 오래된 이벤트가 max_latency(초) 이상 대기
+    
+    producer_client와 event_factory를 주입하면 로컬 대역(stand-in)으로 테스트할 수 있습니다.
+    """
+    
+    def __init__(self, producer_client, event_factory=None, max_batch_events=100,
+                 max_batch_bytes=256 * 1024, max_latency=0.5, max_pending=10000):
+        if event_factory is None:
+            from azure.eventhub import EventData
+            event_factory = EventData
+        self.producer = producer_client
+        self.event_factory = event_factory
+        self.max_batch_events = max(1, max_batch_events)
+        self.max_batch_bytes = max_batch_bytes
+        self.max_latency = max_latency
+        self.max_pending = max_pending
+        
+        # partition_key -> {"events": [body, ...], "bytes": int, "since": monotonic}
+        self._buffers = {}
+        self._pending = 0
+        self._cond = Condition()
+        self._closed = False
+        self._thread = Thread(target=self._run, name="eventhub-batch-flusher", daemon=True)
+        self._thread.start()
+    
+    def add(self, message, partition_key=None):
+        """이벤트를 버퍼에 추가합니다. 버퍼가 가득 차 버려지면 False를 반환합니다."""
+        body = json.dumps(message)
+        with self._cond:
+            if self._closed or self._pending >= self.max_pending:
+                accepted = False
+            else:
+                buffer = self._buffers.get(partition_key)
+                if buffer is None:
+                    buffer = {"events": [], "bytes": 0, "since": time.monotonic()}
+                    self._buffers[partition_key] = buffer
+                buffer["events"].append(body)
+                buffer["bytes"] += len(body)
+                self._pending += 1
+                accepted = True
+                if self._is_ready(buffer, time.monotonic()):
+                    self._cond.notify()
+        if not accepted:
+            telemetry_manager.record_metric("eventhub_messages_sent_total", 1, {"status": "dropped"})
+        return accepted
+    
+    def _is_ready(self, buffer, now):
+        return (len(buffer["events"]) >= self.max_batch_events
+                or buffer["bytes"] >= self.max_batch_bytes
+                or now - buffer["since"] >= self.max_latency)
+    
+    def _take_ready(self, force=False):
+        """전송할 버퍼를 꺼냅니다. 조건을 만족한 것이 없으면 다음 대기 시간을 반환합니다."""
+        now = time.monotonic()
+        ready = []
+        wait = self.max_latency
+        for key in list(self._buffers):
+            buffer = self._buffers[key]
+            if force or self._is_ready(buffer, now):
+                ready.append((key, self._buffers.pop(key)["events"]))
+            else:
+                wait = min(wait, self.max_latency - (now - buffer["since"]))
+        self._pending -= sum(len(events) for _, events in ready)
+        return ready, max(wait, 0.001)
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                ready, wait = self._take_ready(force=self._closed)
+                if not ready:
+                    if self._closed:
+                        return
+                    self._cond.wait(wait)
+                    continue
+            for partition_key, events in ready:
+                self._send(partition_key, events)
+    
+    def _send(self, partition_key, events):
+        """이벤트를 가능한 한 꽉 채운 EventDataBatch로 나누어 전송합니다."""
+        index = 0
+        while index < len(events):
+            batch = self.producer.create_batch(partition_key=partition_key)
+            count = 0
+            while index < len(events):
+                try:
+                    batch.add(self.event_factory(events[index]))
+                except ValueError:
+                    # 배치 최대 크기 초과: 현재 배치를 전송하고 새 배치 시작
+                    if count == 0:
+                        logger.error("❌ Event Hubs 이벤트가 배치 최대 크기를 초과하여 버려졌습니다.")
+                        telemetry_manager.record_metric("eventhub_messages_sent_total", 1, {"status": "dropped"})
+                        index += 1
+                        continue
+                    break
+                index += 1
+                count += 1
+            if count:
+                self._send_batch(batch, count)
+    
+    def _send_batch(self, batch, count):
+        start = time.perf_counter()
+        try:
+            self.producer.send_batch(batch)
+            status = "success"
+        except Exception as e:
+            status = "error"
+            logger.error(f"❌ Event Hubs send error: {str(e)}")
+        telemetry_manager.record_histogram(
+            "eventhub_flush_latency_ms", (time.perf_counter() - start) * 1000, {"status": status}
+        )
+        if batch.max_size_in_bytes:
+            telemetry_manager.record_histogram(
+                "eventhub_batch_fill_ratio", batch.size_in_bytes / batch.max_size_in_bytes
+            )
+        telemetry_manager.record_histogram("eventhub_batch_events", count)
+        telemetry_manager.record_metric("eventhub_messages_sent_total", count, {"status": status})
+        logger.debug(f"Event Hubs batch sent: events={count}, status={status}")
+    
+    def flush(self):
+        """버퍼에 남은 모든 이벤트를 즉시 전송합니다."""
+        with self._cond:
+            ready, _ = self._take_ready(force=True)
+        for partition_key, events in ready:
+            self._send(partition_key, events)
+    
+    def close(self, timeout=10):
+        """버퍼를 비우고 Producer 클라이언트를 닫습니다."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        try:
+            self.producer.close()
+        except Exception as e:
+            logger.error(f"❌ Event Hubs Producer 종료 오류: {str(e)}")
+
 class EventHubMessaging(MessagingInterface):
     """Azure Event Hubs 메시징 구현"""
     
@@ -175,6 +498,22 @@ class EventHubMessaging(MessagingInterface):
             eventhub_name=self.eventhub_name
         )
     
+    def get_publisher(self):
+        """프로세스 전역 배치 Publisher를 반환합니다. fork 이후에는 새로 생성합니다."""
+        global _eventhub_publisher, _eventhub_publisher_pid
+        if _eventhub_publisher is None or _eventhub_publisher_pid != os.getpid():
+            with _eventhub_publisher_lock:
+                if _eventhub_publisher is None or _eventhub_publisher_pid != os.getpid():
+                    _eventhub_publisher = EventHubBatchPublisher(
+                        self.get_producer(),
+                        max_batch_events=int(os.getenv('EVENTHUB_BATCH_MAX_EVENTS', '100')),
+                        max_batch_bytes=int(os.getenv('EVENTHUB_BATCH_MAX_BYTES', str(256 * 1024))),
+                        max_latency=int(os.getenv('EVENTHUB_BATCH_MAX_LATENCY_MS', '500')) / 1000
+                    )
+                    _eventhub_publisher_pid = os.getpid()
+                    logger.info(f"Event Hubs 배치 Publisher 생성됨 (pid={_eventhub_publisher_pid})")
+        return _eventhub_publisher
+    
     def get_consumer(self, topic):
         """Event Hubs Consumer를 생성합니다."""
         return self.EventHubConsumerClient.from_connection_string(
@@ -190,13 +529,9 @@ class EventHubMessaging(MessagingInterface):
             return False
             
         try:
-            producer = self.get_producer()
-            event_data_batch = producer.create_batch()
-            event_data_batch.add(json.dumps(message))
-            producer.send_batch(event_data_batch)
-            logger.info(f"✅ Event Hubs message sent successfully")
-            producer.close()
-            return True
+            # 같은 사용자의 이벤트는 같은 파티션으로 보내 순서를 유지
+            partition_key = message.get('user_id') if isinstance(message, dict) else None
+            return self.get_publisher().add(message, partition_key=partition_key)
         except Exception as e:
             logger.error(f"❌ Event Hubs send error: {str(e)}")
             return False
@@ -213,15 +548,7 @@ class EventHubMessaging(MessagingInterface):
             
             def on_event(partition_context, event):
                 try:
-                    log_data = json.loads(event.body_as_str())
-                    messages.append({
-                        'timestamp': log_data['timestamp'],
-                        'endpoint': log_data['endpoint'],
-                        'method': log_data['method'],
-                        'status': log_data['status'],
-                        'user_id': log_data['user_id'],
-                        'message': log_data['message']
-                    })
+                    messages.append(_log_entry(json.loads(event.body_as_str())))
                 except Exception as e:
                     logger.error(f"Event parsing error: {str(e)}")
             
@@ -238,6 +565,123 @@ class EventHubMessaging(MessagingInterface):
             logger.error(f"❌ Event Hubs receive error: {str(e)}")
             return []
     
+    @staticmethod
+    def _latest_position(properties, n):
+        """파티션 속성으로 최신 n개의 시작 시퀀스 번호를 계산합니다. 비어 있으면 None."""
+        if properties['is_empty'] or n <= 0:
+            return None
+        last = properties['last_enqueued_sequence_number']
+        return max(properties['beginning_sequence_number'], last - n + 1)
+    
+    def _read_partition_latest(self, topic, partition_id, n, deadline):
+        """한 파티션에서 마지막 시퀀스 번호까지 최신 n개를 읽습니다."""
+        consumer = self.get_consumer(topic)
+        records = []
+        try:
+            properties = consumer.get_partition_properties(partition_id)
+            start = self._latest_position(properties, n)
+            if start is None:
+                return records
+            last = properties['last_enqueued_sequence_number']
+            done = Event()
+            
+            def on_event_batch(partition_context, events):
+                for event in events:
+                    if event.sequence_number > last:
+                        continue
+                    try:
+                        records.append((partition_id, event.sequence_number,
+                                        _log_entry(json.loads(event.body_as_str()))))
+                    except Exception as e:
+                        logger.error(f"Event parsing error: {str(e)}")
+                    if event.sequence_number >= last:
+                        done.set()
+            
+            receiver = Thread(target=consumer.receive_batch, kwargs={
+                'on_event_batch': on_event_batch,
+                'partition_id': partition_id,
+                'starting_position': start,
+                'starting_position_inclusive': True,
+                'max_batch_size': min(n, 300),
+                'max_wait_time': 1
+            }, name=f"eventhub-latest-{partition_id}", daemon=True)
+            receiver.start()
+            if not done.wait(max(0, deadline - time.monotonic())):
+                logger.warning(f"Event Hubs 최신 로그 조회 시간 초과: partition={partition_id}")
+            return list(records)
+        finally:
+            consumer.close()
+    
+    def get_latest(self, topic, n, timeout=5):
+        """파티션별로 최신 n개를 시퀀스 번호로 찾아 병렬로 읽고 시간순으로 합친 최신 n개를 반환합니다."""
+        if not self.connection_str:
+            logger.error("❌ Event Hubs 연결 문자열이 설정되지 않았습니다.")
+            return []
+        
+        try:
+            deadline = time.monotonic() + timeout
+            consumer = self.get_consumer(topic)
+            with consumer:
+                partition_ids = consumer.get_partition_ids()
+            if not partition_ids:
+                return []
+            with ThreadPoolExecutor(max_workers=len(partition_ids)) as executor:
+                results = executor.map(
+                    lambda partition_id: self._read_partition_latest(topic, partition_id, n, deadline),
+                    partition_ids
+                )
+                records = [record for partition_records in results for record in partition_records]
+            return _merge_latest(records, n)
+        except Exception as e:
+            logger.error(f"❌ Event Hubs receive error: {str(e)}")
+            return []
+    
+    def tail(self, topic, on_message, stop_event, backfill=None, refresh_interval=None):
+        """모든 파티션을 처음부터(backfill이 있으면 파티션별 최신 backfill개부터) 읽고
+        이후 새 이벤트를 계속 읽습니다. stop_event가 설정되면 종료합니다.
+        refresh_interval마다 파티션 목록을 다시 조회하여 바뀌었으면 수신을 종료하고 반환합니다.
+        """
+        if not self.connection_str:
+            raise RuntimeError("Event Hubs 연결 문자열이 설정되지 않았습니다.")
+        
+        consumer = self.get_consumer(topic)
+        partition_ids = consumer.get_partition_ids()
+        starting_position = "-1"
+        if backfill is not None:
+            starting_position = {}
+            for partition_id in partition_ids:
+                start = self._latest_position(consumer.get_partition_properties(partition_id), backfill)
+                starting_position[partition_id] = "-1" if start is None else start
+        
+        def on_event(partition_context, event):
+            if event is None:
+                return
+            try:
+                entry = _log_entry(json.loads(event.body_as_str()))
+            except Exception as e:
+                logger.error(f"Event parsing error: {str(e)}")
+                return
+            on_message(partition_context.partition_id, event.sequence_number, entry)
+        
+        # receive()는 close()가 호출될 때까지 반환하지 않으므로 별도 스레드에서 종료 신호를 기다림
+        def close_on_stop():
+            while not stop_event.wait(refresh_interval):
+                try:
+                    with self.get_consumer(topic) as probe:
+                        current = probe.get_partition_ids()
+                except Exception as e:
+                    logger.error(f"❌ Event Hubs 파티션 조회 오류: {str(e)}")
+                    continue
+                if set(current) != set(partition_ids):
+                    logger.info(f"Event Hub {topic} 파티션 변경 감지: {partition_ids} -> {current}")
+                    break
+            consumer.close()
+        
+        Thread(target=close_on_stop, name="eventhub-tail-closer", daemon=True).start()
+        with consumer:
+            consumer.receive(on_event=on_event, starting_position=starting_position,
+                             starting_position_inclusive=True, max_wait_time=1)
+    
     def close(self):
         """연결을 종료합니다."""
         pass
@@ -258,31 +702,174 @@ class MessagingFactory:
             return KafkaMessaging()
         else:
             raise ValueError(f"지원하지 않는 메시징 타입: {messaging_type}")
+    
+    _shared = None
+    _shared_pid = None
+    _shared_lock = Lock()
+    
+    @classmethod
+    def get_shared_messaging(cls):
+        """API 로그 전송에 재사용하는 프로세스 전역 메시징 인스턴스를 반환합니다. (fork 이후에는 새로 생성)"""
+        if cls._shared is None or cls._shared_pid != os.getpid():
+            with cls._shared_lock:
+                if cls._shared is None or cls._shared_pid != os.getpid():
+                    cls._shared = cls.create_messaging()
+                    cls._shared_pid = os.getpid()
+        return cls._shared
 
-# 비동기 로깅 함수
-def async_log_api_stats(endpoint, method, status, user_id):
-    """API 통계를 비동기로 로깅합니다."""
-    def _log():
+class ApiStatsDispatcher:
+    """API 통계 이벤트를 제한된 큐에 담고 고정된 워커 스레드로 전송합니다.
+    
+    큐가 가득 찼을 때의 정책(overflow_policy):
+    - drop_oldest: 가장 오래된 이벤트를 버리고 새 이벤트를 추가
+    - drop_newest: 새 이벤트를 버림
+    - block: block_timeout 동안 기다린 뒤에도 자리가 없으면 새 이벤트를 버림
+    """
+    
+    OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest', 'block')
+    
+    def __init__(self, capacity=1000, workers=2, overflow_policy='drop_oldest',
+                 block_timeout=0.05, topic='api-logs'):
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"지원하지 않는 overflow 정책: {overflow_policy}")
+        self.capacity = max(1, capacity)
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.topic = topic
+        
+        self._queue = deque()
+        self._cond = Condition()
+        self._closed = False
+        self.counters = {'enqueued': 0, 'dropped': 0, 'sent': 0, 'failed': 0}
+        
+        self._workers = [
+            Thread(target=self._run, name=f"api-stats-worker-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+        
+        telemetry_manager.register_gauge(
+            "api_stats_queue_depth", lambda: len(self._queue), {"topic": self.topic},
+            description="전송 대기 중인 API 통계 이벤트 수"
+        )
+    
+    def _count(self, result, value=1):
+        with self._cond:
+            self.counters[result] += value
+        telemetry_manager.record_metric("api_stats_events_total", value, {"topic": self.topic, "result": result})
+    
+    def submit(self, event):
+        """이벤트를 큐에 추가합니다. 추가되면 True, 버려지면 False를 반환합니다."""
+        accepted = False
+        dropped_oldest = False
+        with self._cond:
+            if not self._closed:
+                if len(self._queue) >= self.capacity:
+                    if self.overflow_policy == 'drop_oldest':
+                        self._queue.popleft()
+                        dropped_oldest = True
+                    elif self.overflow_policy == 'block':
+                        self._cond.wait_for(
+                            lambda: self._closed or len(self._queue) < self.capacity, self.block_timeout
+                        )
+                if not self._closed and len(self._queue) < self.capacity:
+                    self._queue.append(event)
+                    self._cond.notify_all()
+                    accepted = True
+        
+        if dropped_oldest or not accepted:
+            self._count('dropped')
+        if accepted:
+            self._count('enqueued')
+        return accepted
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                event = self._queue.popleft()
+                self._cond.notify_all()
+            self._send(event)
+    
+    def _send(self, event):
         try:
-            messaging = MessagingFactory.create_messaging()
-            log_data = {
-                'timestamp': datetime.utcnow().replace(tzinfo=timezone.utc).isoformat(),
-                'endpoint': endpoint,
-                'method': method,
-                'status': status,
-                'user_id': user_id,
-                'message': f"{user_id}가 {method} {endpoint} 호출 ({status})"
-            }
-            
-            success = messaging.send_message('api-logs', log_data)
-            if success:
-                logger.info(f"✅ API 로그 전송 성공: {endpoint}")
+            messaging = MessagingFactory.get_shared_messaging()
+            if messaging.send_message(self.topic, event):
+                self._count('sent')
+                logger.debug(f"✅ API 로그 전송 성공: {event['endpoint']}")
             else:
-                logger.error(f"❌ API 로그 전송 실패: {endpoint}")
-            
-            messaging.close()
+                self._count('failed')
+                logger.error(f"❌ API 로그 전송 실패: {event['endpoint']}")
         except Exception as e:
+            self._count('failed')
             logger.error(f"❌ 로깅 오류: {str(e)}")
     
-    # 새로운 스레드에서 로깅 실행
-    Thread(target=_log).start()
+    def stats(self):
+        """카운터와 현재 큐 깊이를 반환합니다."""
+        with self._cond:
+            return dict(self.counters, queue_depth=len(self._queue))
+    
+    def shutdown(self, timeout=5):
+        """새 이벤트를 막고 큐에 남은 이벤트를 전송한 뒤 워커를 종료합니다."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        deadline = time.monotonic() + timeout
+        for worker in self._workers:
+            worker.join(max(0, deadline - time.monotonic()))
+        remaining = self.stats()['queue_depth']
+        if remaining:
+            logger.warning(f"API 통계 큐 종료 시 {remaining}개 이벤트를 전송하지 못했습니다.")
+
+_dispatcher = None
+_dispatcher_pid = None
+_dispatcher_lock = Lock()
+
+def get_api_stats_dispatcher():
+    """프로세스 전역 API 통계 디스패처를 반환합니다. fork 이후에는 새로 생성합니다."""
+    global _dispatcher, _dispatcher_pid
+    if _dispatcher is None or _dispatcher_pid != os.getpid():
+        with _dispatcher_lock:
+            if _dispatcher is None or _dispatcher_pid != os.getpid():
+                _dispatcher = ApiStatsDispatcher(
+                    capacity=int(os.getenv('API_STATS_QUEUE_CAPACITY', '1000')),
+                    workers=int(os.getenv('API_STATS_WORKERS', '2')),
+                    overflow_policy=os.getenv('API_STATS_OVERFLOW_POLICY', 'drop_oldest').lower(),
+                    block_timeout=float(os.getenv('API_STATS_BLOCK_TIMEOUT', '0.05'))
+                )
+                _dispatcher_pid = os.getpid()
+    return _dispatcher
+
+def shutdown_api_stats_dispatcher(timeout=None):
+    """큐에 남은 API 통계를 전송하고 디스패처를 종료합니다."""
+    global _dispatcher, _dispatcher_pid
+    with _dispatcher_lock:
+        dispatcher, pid = _dispatcher, _dispatcher_pid
+        _dispatcher = None
+        _dispatcher_pid = None
+    if dispatcher is not None and pid == os.getpid():
+        if timeout is None:
+            timeout = float(os.getenv('API_STATS_SHUTDOWN_TIMEOUT', '5'))
+        dispatcher.shutdown(timeout)
+
+# Kafka Producer 종료(flush)보다 먼저 실행되도록 나중에 등록 (atexit는 역순 실행)
+atexit.register(shutdown_api_stats_dispatcher)
+
+def api_stats_event(endpoint, method, status, user_id):
+    """API 통계 이벤트를 만듭니다. (async_messaging과 공유)"""
+    return {
+        'timestamp': datetime.utcnow().replace(tzinfo=timezone.utc).isoformat(),
+        'endpoint': endpoint,
+        'method': method,
+        'status': status,
+        'user_id': user_id,
+        'message': f"{user_id}가 {method} {endpoint} 호출 ({status})"
+    }
+
+# 비동기 로깅 함수
+def async_log_api_stats(endpoint, method, status, user_id):
+    """API 통계를 제한된 큐에 추가합니다. 전송은 워커 스레드가 처리합니다."""
+    get_api_stats_dispatcher().submit(api_stats_event(endpoint, method, status, user_id))
@@ -0,0 +1,235 @@
+import os
+import json
+import time
+import uuid
+import atexit
+import threading
+import logging
+from collections import deque
+from telemetry import telemetry_manager
+
+logger = logging.getLogger(__name__)
+
+# 토큰이 일치할 때만 lease 연장/해제 (다른 워커가 다시 잡은 lease를 건드리지 않도록)
+_RENEW_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class MessagingLogView:
+    """메시징 시스템의 최신 API 로그를 Redis에 유지하는 뷰 (모든 워커/파드 공유)
+
+    Redis lease를 얻은 워커 하나만 파티션별 최신 capacity개부터 토픽을 계속 읽어(tail)
+    최신 capacity개의 로그를 Redis ZSET에 기록합니다. 나머지 워커는 lease를 기다리며 대기하고,
+    lease를 가진 워커가 종료되거나 응답이 없으면 lease가 만료된 뒤 다른 워커가 이어서 읽습니다.
+    조회는 모든 워커가 같은 ZSET에서 페이지를 잘라 반환하므로 메시징 시스템에 접근하지 않으며,
+    어느 워커가 요청을 처리하든 결과가 같습니다.
+
+    - ZSET 멤버: "{timestamp}|{partition}|{position}|{로그 JSON}" (점수 0, 사전순 = 시간순)
+      같은 이벤트를 다시 읽어도 멤버가 같으므로 중복되지 않습니다.
+    - refresh_interval초마다 토픽의 파티션 목록을 확인하여 바뀌었으면 tail을 다시 시작합니다.
+    """
+
+    def __init__(self, messaging_factory, get_client, topic='api-logs', capacity=1000, retry_interval=5,
+                 lease_ms=15000, flush_interval=0.5, refresh_interval=60):
+        self.messaging_factory = messaging_factory
+        self.get_client = get_client
+        self.topic = topic
+        self.capacity = max(1, capacity)
+        self.retry_interval = retry_interval
+        self.lease_ms = lease_ms
+        self.flush_interval = flush_interval
+        self.refresh_interval = refresh_interval
+        self.key = f"messaging_log_view:{topic}"
+        self.lease_key = f"{self.key}:leader"
+
+        self._token = uuid.uuid4().hex
+        self._leading = False
+        self._pending = deque(maxlen=self.capacity)  # Redis에 기록 대기 중인 멤버
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="messaging-log-view", daemon=True)
+        self._started = False
+
+        telemetry_manager.register_gauge(
+            "messaging_log_view_leader", lambda: int(self._leading), {"topic": self.topic},
+            description="이 워커가 메시징 로그 뷰를 tail 중이면 1"
+        )
+
+    def start(self):
+        if not self._started:
+            self._started = True
+            self._thread.start()
+        return self
+
+    def _acquire(self):
+        try:
+            return bool(self.get_client().set(self.lease_key, self._token, nx=True, px=self.lease_ms))
+        except Exception as e:
+            print(f"Messaging log view lease error: {str(e)}")
+            return False
+
+    def _renew(self):
+        try:
+            return bool(self.get_client().eval(_RENEW_LEASE_SCRIPT, 1, self.lease_key, self._token, self.lease_ms))
+        except Exception as e:
+            print(f"Messaging log view lease error: {str(e)}")
+            return False
+
+    def _release(self):
+        try:
+            self.get_client().eval(_RELEASE_LEASE_SCRIPT, 1, self.lease_key, self._token)
+        except Exception as e:
+            print(f"Messaging log view lease error: {str(e)}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self._acquire():
+                # 다른 워커가 tail 중
+                self._stop.wait(self.lease_ms / 3000)
+                continue
+
+            self._leading = True
+            session = threading.Event()
+            keeper = threading.Thread(target=self._keep, args=(session,), name="messaging-log-view-keeper",
+                                      daemon=True)
+            keeper.start()
+            failed = False
+            try:
+                messaging = self.messaging_factory()
+                try:
+                    # 파티션 목록이 바뀌면 반환하므로 다시 시작
+                    messaging.tail(self.topic, self.add, session, backfill=self.capacity,
+                                   refresh_interval=self.refresh_interval)
+                finally:
+                    messaging.close()
+            except Exception as e:
+                failed = True
+                logger.error(f"❌ 메시징 로그 뷰 tail 오류: {str(e)}")
+                telemetry_manager.record_metric("messaging_log_view_errors_total", 1, {"topic": self.topic})
+            finally:
+                session.set()
+                keeper.join()
+                self._leading = False
+                self._release()
+            if failed:
+                self._stop.wait(self.retry_interval)
+
+    def _keep(self, session):
+        """tail하는 동안 대기 중인 로그를 기록하고 lease를 연장합니다. lease를 잃으면 tail을 중지합니다."""
+        renew_interval = self.lease_ms / 3000
+        renew_at = time.monotonic() + renew_interval
+        while not session.wait(self.flush_interval):
+            self._flush()
+            if self._stop.is_set():
+                session.set()
+                break
+            if time.monotonic() >= renew_at:
+                if not self._renew():
+                    logger.warning("메시징 로그 뷰 lease를 잃어 tail을 중지합니다.")
+                    session.set()
+                    break
+                renew_at = time.monotonic() + renew_interval
+        self._flush()
+
+    def add(self, partition, position, entry):
+        """로그 하나를 기록 대기열에 추가합니다. (tail 콜백)"""
+        member = f"{entry['timestamp']}|{partition}|{position:020d}|{json.dumps(entry, separators=(',', ':'))}"
+        with self._lock:
+            self._pending.append(member)
+
+    def _flush(self):
+        with self._lock:
+            members = list(self._pending)
+            self._pending.clear()
+        if not members:
+            return
+        try:
+            pipe = self.get_client().pipeline(transaction=False)
+            pipe.zadd(self.key, {member: 0 for member in members})
+            pipe.zremrangebyrank(self.key, 0, -self.capacity - 1)
+            pipe.execute()
+            telemetry_manager.record_metric("messaging_log_view_events_total", len(members), {"topic": self.topic})
+        except Exception as e:
+            print(f"Messaging log view write error: {str(e)}")
+            telemetry_manager.record_metric("messaging_log_view_errors_total", 1, {"topic": self.topic})
+
+    def queue_page(self, pipe, offset, limit):
+        """페이지 조회 명령을 파이프라인에 추가합니다. (동기/asyncio 클라이언트 공용)"""
+        pipe.zrevrange(self.key, offset, offset + limit - 1)
+        pipe.zcard(self.key)
+
+    @staticmethod
+    def page_result(results):
+        """queue_page 결과를 (최신순 로그 목록, 전체 로그 수)로 변환합니다."""
+        members, total = results
+        return [json.loads(member.split('|', 3)[3]) for member in members], total
+
+    def page(self, offset, limit):
+        """최신순으로 offset부터 limit개의 로그와 전체 로그 수를 반환합니다. Redis 오류 시 빈 페이지를 반환합니다."""
+        try:
+            pipe = self.get_client().pipeline(transaction=False)
+            self.queue_page(pipe, offset, limit)
+            return self.page_result(pipe.execute())
+        except Exception as e:
+            print(f"Messaging log view read error: {str(e)}")
+            return [], 0
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._started:
+            self._thread.join(timeout)
+
+
+_view = None
+_view_pid = None
+_view_lock = threading.Lock()
+
+
+def get_messaging_log_view():
+    """프로세스 전역 메시징 로그 뷰를 반환합니다. 없으면(또는 fork 이후) 새로 생성하여 시작합니다.
+
+    MESSAGING_LOG_VIEW_SIZE가 0이면 None을 반환합니다.
+    """
+    global _view, _view_pid
+    capacity = int(os.getenv('MESSAGING_LOG_VIEW_SIZE', '1000'))
+    if capacity <= 0:
+        return None
+    if _view is None or _view_pid != os.getpid():
+        with _view_lock:
+            if _view is None or _view_pid != os.getpid():
+                from messaging_interface import MessagingFactory
+                from redis_pool import get_redis_client
+                _view = MessagingLogView(
+                    MessagingFactory.create_messaging,
+                    get_redis_client,
+                    capacity=capacity,
+                    retry_interval=float(os.getenv('MESSAGING_LOG_VIEW_RETRY_INTERVAL', '5')),
+                    lease_ms=int(os.getenv('MESSAGING_LOG_VIEW_LEASE_MS', '15000')),
+                    refresh_interval=float(os.getenv('MESSAGING_LOG_VIEW_REFRESH_INTERVAL', '60'))
+                ).start()
+                _view_pid = os.getpid()
+    return _view
+
+
+def shutdown_messaging_log_view(timeout=5):
+    """tail 스레드를 종료하고 lease를 해제합니다."""
+    global _view, _view_pid
+    with _view_lock:
+        view, pid = _view, _view_pid
+        _view = None
+        _view_pid = None
+    if view is not None and pid == os.getpid():
+        view.stop(timeout)
+
+
+atexit.register(shutdown_messaging_log_view)
@@ -0,0 +1,97 @@
+import json
+import base64
+import message_counters
+
+
+class InvalidCursorError(ValueError):
+    """커서 토큰을 해석할 수 없을 때 발생합니다."""
+    pass
+
+
+def encode_cursor(message_id, direction):
+    """messages.id 경계와 방향(next/prev)을 불투명한 토큰으로 인코딩합니다."""
+    raw = json.dumps({"id": message_id, "d": direction}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """커서 토큰을 (id, direction)으로 디코딩합니다."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        message_id, direction = int(data["id"]), data["d"]
+    except Exception:
+        raise InvalidCursorError("잘못된 커서입니다")
+    if direction not in ("next", "prev"):
+        raise InvalidCursorError("잘못된 커서입니다")
+    return message_id, direction
+
+
+def keyset_query(where, params, limit, token=None):
+    """커서 기반 페이지 조회 쿼리를 만듭니다.
+
+    Returns:
+        (sql, args, direction)
+    """
+    conditions = [where] if where else []
+    args = list(params or ())
+    direction = "next"
+
+    if token:
+        boundary, direction = decode_cursor(token)
+        conditions.append("id < %s" if direction == "next" else "id > %s")
+        args.append(boundary)
+
+    order = "DESC" if direction == "next" else "ASC"
+    where_sql = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+    return f"SELECT * FROM messages {where_sql}ORDER BY id {order} LIMIT %s", (*args, limit + 1), direction
+
+
+def keyset_page(rows, limit, direction, token=None):
+    """keyset_query 결과(limit + 1행)로 페이지와 이전/다음 커서를 만듭니다.
+
+    Returns:
+        (rows, next_cursor, prev_cursor)
+    """
+    has_extra = len(rows) > limit
+    rows = list(rows[:limit])
+    if direction == "prev":
+        rows.reverse()
+
+    if not rows:
+        return rows, None, None
+
+    if direction == "next":
+        has_next, has_prev = has_extra, bool(token)
+    else:
+        has_next, has_prev = True, has_extra
+
+    next_cursor = encode_cursor(rows[-1]['id'], "next") if has_next else None
+    prev_cursor = encode_cursor(rows[0]['id'], "prev") if has_prev else None
+    return rows, next_cursor, prev_cursor
+
+
+def fetch_keyset_page(cursor, where, params, limit, token=None):
+    """messages를 id 역순으로 커서 기반 페이지 조회합니다.
+
+    where/params는 추가 필터 (예: "user_id = %s", (user_id,)) 이며 None이면 전체 조회입니다.
+    (user_id, id) 인덱스 또는 기본 키를 이용한 범위 스캔 한 번으로 끝납니다.
+
+    Returns:
+        (rows, next_cursor, prev_cursor)
+    """
+    sql, args, direction = keyset_query(where, params, limit, token)
+    cursor.execute(sql, args)
+    return keyset_page(cursor.fetchall(), limit, direction, token)
+
+
+def count_messages(cursor, mode, user_id=None):
+    """전체(또는 사용자별) 메시지 수를 조회합니다.
+
+    mode:
+    - exact / approx: 쓰기 시점에 유지되는 카운터 테이블에서 O(1)로 조회
+    - none: 조회하지 않음 (None 반환)
+    """
+    if mode == "none":
+        return None
+    return message_counters.get_count(cursor, user_id)
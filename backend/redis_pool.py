@@ -0,0 +1,162 @@
+import os
+import time
+import threading
+import redis
+import redis.asyncio
+from redis.client import Pipeline
+from telemetry import telemetry_manager
+
+
+def _record_latency(command, start):
+    telemetry_manager.record_histogram(
+        "redis_command_duration_ms", (time.perf_counter() - start) * 1000, {"command": command}
+    )
+
+
+class InstrumentedPipeline(Pipeline):
+    """실행 시간을 하나의 PIPELINE 명령으로 기록하는 파이프라인"""
+
+    def execute(self, raise_on_error=True):
+        commands = "+".join(str(args[0]).upper() for args, _ in self.command_stack) or "EMPTY"
+        start = time.perf_counter()
+        try:
+            return super().execute(raise_on_error)
+        finally:
+            _record_latency(f"PIPELINE({commands})", start)
+
+
+class InstrumentedRedis(redis.Redis):
+    """명령별 지연 시간 히스토그램을 기록하는 Redis 클라이언트"""
+
+    def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            _record_latency(str(args[0]).upper(), start)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+class AsyncInstrumentedPipeline(redis.asyncio.client.Pipeline):
+    """asyncio용 InstrumentedPipeline"""
+
+    async def execute(self, raise_on_error=True):
+        commands = "+".join(str(args[0]).upper() for args, _ in self.command_stack) or "EMPTY"
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            _record_latency(f"PIPELINE({commands})", start)
+
+
+class AsyncInstrumentedRedis(redis.asyncio.Redis):
+    """asyncio용 InstrumentedRedis (async_app에서 사용)"""
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            _record_latency(str(args[0]).upper(), start)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return AsyncInstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+_pools = {}
+_clients = {}
+_lock = threading.RLock()
+
+
+def _create_pool(db, decode_responses, pool_class=redis.BlockingConnectionPool):
+    """환경 변수 설정으로 BlockingConnectionPool을 생성합니다."""
+    host = os.getenv('REDIS_HOST', 'my-redis-master')
+    pool = pool_class(
+        host=host,
+        port=6379,
+        password=os.getenv('REDIS_PASSWORD'),
+        db=db,
+        decode_responses=decode_responses,
+        max_connections=int(os.getenv('REDIS_POOL_MAX_CONNECTIONS', '50')),
+        timeout=float(os.getenv('REDIS_POOL_TIMEOUT', '5')),
+        socket_timeout=float(os.getenv('REDIS_SOCKET_TIMEOUT', '5')),
+        socket_connect_timeout=float(os.getenv('REDIS_SOCKET_CONNECT_TIMEOUT', '5')),
+        health_check_interval=int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', '30'))
+    )
+    telemetry_manager.log_info("Redis connection pool created", lambda: {
+        "action": "redis_pool_create",
+        "host": host,
+        "port": 6379,
+        "db": db,
+        "asyncio": pool_class is redis.asyncio.BlockingConnectionPool,
+        "component": "redis"
+    }, component="redis")
+    return pool
+
+
+def get_redis_pool(db=0, decode_responses=True):
+    """db/디코딩 설정별로 공유되는 연결 풀을 반환합니다."""
+    key = (db, decode_responses)
+    pool = _pools.get(key)
+    if pool is None:
+        with _lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _create_pool(db, decode_responses)
+                _pools[key] = pool
+    return pool
+
+
+def get_redis_client(db=0, decode_responses=True):
+    """공유 연결 풀을 사용하는 Redis 클라이언트를 반환합니다.
+
+    클라이언트는 스레드 안전하므로 프로세스 전체에서 재사용합니다.
+    """
+    key = (db, decode_responses)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = InstrumentedRedis(connection_pool=get_redis_pool(db, decode_responses))
+                _clients[key] = client
+    return client
+
+
+def close_redis_pools():
+    """모든 연결 풀의 연결을 끊습니다."""
+    with _lock:
+        for pool in _pools.values():
+            pool.disconnect()
+
+
+# asyncio 클라이언트 (이벤트 루프 하나에서만 사용, 스레드 간 공유하지 않음)
+_async_clients = {}
+
+
+def get_async_redis_client(db=0, decode_responses=True):
+    """asyncio 연결 풀을 사용하는 Redis 클라이언트를 반환합니다.
+
+    연결 풀 설정은 get_redis_client와 같으며 (REDIS_POOL_MAX_CONNECTIONS 등),
+    풀에 연결이 없으면 요청은 이벤트 루프를 막지 않고 REDIS_POOL_TIMEOUT초까지 기다립니다.
+    """
+    key = (db, decode_responses)
+    client = _async_clients.get(key)
+    if client is None:
+        pool = _create_pool(db, decode_responses, pool_class=redis.asyncio.BlockingConnectionPool)
+        client = _async_clients[key] = AsyncInstrumentedRedis(connection_pool=pool)
+    return client
+
+
+async def close_async_redis_clients():
+    """asyncio 클라이언트의 연결 풀을 닫습니다. (이벤트 루프 종료 전에 호출)"""
+    clients = list(_async_clients.values())
+    _async_clients.clear()
+    for client in clients:
+        await client.connection_pool.disconnect()
@@ -0,0 +1,687 @@
+import os
+import json
+import time
+import uuid
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+from redis.exceptions import RedisError
+from message_search import _TOKEN_PATTERN, _tokenize
+from telemetry import telemetry_manager
+
+# 락 토큰이 일치할 때만 삭제 (다른 프로세스가 다시 잡은 락을 지우지 않도록)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# 레지스트리 키: KEYS[1]=hits(ZSET), KEYS[2]=expiry(ZSET), KEYS[3]=meta(HASH), KEYS[4]=total_hits,
+# KEYS[5]=queries(HASH, digest → 검색어), KEYS[6]=index(HASH, digest → 색인 term 목록),
+# KEYS[7]=versions(HASH, digest → 채우기 버전)
+# 검색어 색인: {레지스트리}:term:{term} (SET, term → digest), 스크립트 안에서 KEYS[1]의 접두어로 만듭니다.
+
+# 무효화 대상을 찾을 수 있도록 검색어와 term 색인 등록. (digest, 검색어, 공백으로 구분한 term 목록)
+_INDEX_FUNCTION = """
+local function index(digest, query, terms)
+    local base = string.sub(KEYS[1], 1, -5)
+    redis.call('hset', KEYS[5], digest, query)
+    redis.call('hset', KEYS[6], digest, terms)
+    for term in string.gmatch(terms, '%S+') do
+        redis.call('sadd', base .. 'term:' .. term, digest)
+    end
+end
+"""
+
+# 색인만 등록 (rebuild_registry). ARGV[1]=digest, ARGV[2]=검색어, ARGV[3]=term 목록
+_INDEX_SCRIPT = _INDEX_FUNCTION + """
+index(ARGV[1], ARGV[2], ARGV[3])
+return 1
+"""
+
+# 캐시 채우기 시작: 색인 등록 후 채우기 버전을 올려 반환 (채우는 동안 저장된 메시지의 무효화 대상이 되도록)
+# ARGV[1]=digest, ARGV[2]=검색어, ARGV[3]=term 목록, ARGV[4]=채우기 만료 시각(epoch, 실패 시 정리용)
+_BEGIN_FILL_SCRIPT = _INDEX_FUNCTION + """
+index(ARGV[1], ARGV[2], ARGV[3])
+local expiry = redis.call('zscore', KEYS[2], ARGV[1])
+if not expiry or tonumber(expiry) < tonumber(ARGV[4]) then
+    redis.call('zadd', KEYS[2], ARGV[4], ARGV[1])
+end
+return redis.call('hincrby', KEYS[7], ARGV[1], 1)
+"""
+
+# 항목 저장과 레지스트리 등록 (히트 수는 1로 초기화)
+# KEYS[8]=항목 키
+# ARGV[1]=digest, ARGV[2]=만료 시각(epoch), ARGV[3]=메타데이터 JSON, ARGV[4]=항목, ARGV[5]=항목 TTL(초),
+# ARGV[6]=채우기 시작 시 받은 버전 (무효화되었거나 이후 다른 채우기가 시작되었으면 저장하지 않고 0 반환,
+# 빈 문자열이면 확인하지 않음), ARGV[7]=검색어, ARGV[8]=term 목록
+_REGISTER_SCRIPT = _INDEX_FUNCTION + """
+if ARGV[6] ~= '' and redis.call('hget', KEYS[7], ARGV[1]) ~= ARGV[6] then
+    return 0
+end
+redis.call('set', KEYS[8], ARGV[4], 'EX', ARGV[5])
+local old = redis.call('zscore', KEYS[1], ARGV[1])
+if old then
+    redis.call('decrby', KEYS[4], math.floor(tonumber(old)))
+end
+redis.call('zadd', KEYS[1], 1, ARGV[1])
+redis.call('incr', KEYS[4])
+redis.call('zadd', KEYS[2], ARGV[2], ARGV[1])
+redis.call('hset', KEYS[3], ARGV[1], ARGV[3])
+index(ARGV[1], ARGV[7], ARGV[8])
+return 1
+"""
+
+# 히트 수 증가 (등록된 항목만). ARGV[1]=digest, ARGV[2]=새 만료 시각 (sliding, 아니면 빈 문자열)
+_HIT_SCRIPT = """
+local hits = redis.call('zadd', KEYS[1], 'XX', 'INCR', 1, ARGV[1])
+if not hits then
+    return 0
+end
+redis.call('incr', KEYS[4])
+if ARGV[2] ~= '' then
+    redis.call('zadd', KEYS[2], 'XX', ARGV[2], ARGV[1])
+end
+return math.floor(tonumber(hits))
+"""
+
+# 만료 시각이 지난 항목(최대 ARGV[2]개)과 ARGV[3..]의 digest를 레지스트리와 색인에서 제거
+# 채우기 버전도 삭제되므로 진행 중인 채우기 결과는 저장되지 않습니다.
+# ARGV[1]=기준 시각(epoch)
+_PRUNE_SCRIPT = """
+local base = string.sub(KEYS[1], 1, -5)
+local members = redis.call('zrangebyscore', KEYS[2], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for i = 3, #ARGV do
+    table.insert(members, ARGV[i])
+end
+local removed = 0
+for _, member in ipairs(members) do
+    local hits = redis.call('zscore', KEYS[1], member)
+    if hits then
+        redis.call('decrby', KEYS[4], math.floor(tonumber(hits)))
+        removed = removed + 1
+    end
+    redis.call('zrem', KEYS[1], member)
+    redis.call('zrem', KEYS[2], member)
+    redis.call('hdel', KEYS[3], member)
+    local terms = redis.call('hget', KEYS[6], member)
+    if terms then
+        for term in string.gmatch(terms, '%S+') do
+            redis.call('srem', base .. 'term:' .. term, member)
+        end
+    end
+    redis.call('hdel', KEYS[5], member)
+    redis.call('hdel', KEYS[6], member)
+    redis.call('hdel', KEYS[7], member)
+end
+return removed
+"""
+
+
+# 색인하지 않고 모든 메시지에 대해 확인하는 검색어의 term (LIKE 와일드카드 포함, 단어 토큰 없음)
+UNINDEXED_TERM = "*"
+# 색인 term 길이 (검색어 토큰의 앞 글자)
+INDEX_TERM_LENGTH = 3
+
+
+def index_terms(query):
+    """검색어를 색인할 term 목록을 반환합니다.
+
+    MessageSearch.matches가 True이면 검색어 토큰 중 하나 이상이 메시지 토큰의 부분 문자열이므로,
+    각 토큰의 앞 INDEX_TERM_LENGTH글자로 색인합니다. (부분 문자열/접두어/자연어 모드 모두 포함)
+    """
+    terms = _tokenize(query)
+    if not terms or "%" in query or "_" in query:
+        return [UNINDEXED_TERM]
+    return sorted({term[:INDEX_TERM_LENGTH] for term in terms})
+
+
+def message_terms(message, limit=None):
+    """메시지와 일치할 수 있는 검색어의 색인 term 목록을 반환합니다. (토큰의 1~INDEX_TERM_LENGTH글자 부분 문자열)
+
+    term 수가 limit을 넘으면 더 만들지 않고 None을 반환합니다.
+    """
+    terms = {UNINDEXED_TERM}
+    for token in set(_TOKEN_PATTERN.findall(message.lower())):
+        for length in range(1, INDEX_TERM_LENGTH + 1):
+            for start in range(len(token) - length + 1):
+                terms.add(token[start:start + length])
+        if limit is not None and len(terms) > limit:
+            return None
+    return terms
+
+
+class _Flight:
+    """프로세스 내에서 진행 중인 캐시 채우기"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.entry = None
+
+
+class SearchCache:
+    """검색 결과 캐시 (Redis)
+
+    전체 결과 행 대신 일치하는 메시지 ID 목록(최대 max_ids개)과 전체 결과 수만 저장합니다.
+    캐시 히트 시에는 요청한 페이지의 ID만 DB에서 기본 키로 조회합니다.
+    직렬화된 항목이 max_entry_bytes를 넘으면 저장하지 않습니다.
+
+    캐시 미스/만료 시 fill()은 single-flight로 동작합니다.
+    - 프로세스 내: 같은 검색어의 동시 요청은 한 스레드만 DB를 조회하고 나머지는 결과를 기다립니다.
+    - 파드 간: Redis 락(lease)을 잡은 프로세스만 DB를 조회하고 나머지는 채워진 캐시를 기다립니다.
+    - 만료 후 stale_ttl 동안은 이전 결과(stale)가 남아 있어 기다리는 요청에 바로 반환합니다.
+
+    캐시된 검색어는 레지스트리에 등록됩니다. (통계 조회 시 KEYS/항목별 GET 불필요)
+    - {prefix}_registry:hits: digest → 히트 수 (ZSET, 히트 수 순 정렬)
+    - {prefix}_registry:expiry: digest → 항목 만료 시각 (ZSET, 만료된 항목 정리용)
+    - {prefix}_registry:meta: digest → 검색어, 결과 수, 생성 시각 (HASH)
+    - {prefix}_registry:total_hits: 전체 히트 수
+    히트 수는 레지스트리에만 기록하므로 히트 시 결과 항목을 다시 쓰지 않습니다.
+    신선도는 항목의 남은 TTL(PTTL)로 판단합니다.
+
+    메시지가 저장되면 invalidate_matching()이 새 메시지와 일치하는 검색어의 항목만 삭제합니다.
+    (write-through 무효화, 메시지 삭제/수정 API는 없음) 메시지의 색인 term이 max_message_terms개를
+    넘으면 후보 검색어를 찾는 대신 세대 번호를 올려 전체를 무효화합니다. (긴 메시지의 저장 비용 제한)
+    - {prefix}_registry:term:{term}: 검색어 토큰의 앞 글자 → digest (SET), 메시지의 부분 문자열로
+      후보 검색어만 찾으므로 레지스트리 전체를 읽지 않습니다.
+    - {prefix}_registry:versions: digest → 채우기 버전, 채우기를 시작할 때 색인 등록과 함께 올리고
+      저장 시 비교합니다. 채우는 동안 일치하는 메시지가 저장되어 항목이 무효화되었으면 (버전 삭제)
+      해당 검색어의 결과만 저장하지 않습니다.
+
+    모든 키(항목, 락, 레지스트리)에는 세대 번호({prefix}_generation)가 포함됩니다.
+    전체 삭제는 세대 번호 INCR 한 번이며, 이전 세대의 키는 백그라운드에서 SCAN + UNLINK로 정리됩니다.
+    세대 번호는 프로세스별로 generation_refresh_ms 동안 캐시하므로 다른 파드의 전체 삭제는
+    최대 그 시간만큼 늦게 반영됩니다.
+    ttl_mode:
+    - fixed: 채운 시점부터 ttl초 후 만료 (히트해도 TTL 유지)
+    - sliding: 히트할 때마다 TTL을 다시 ttl초로 연장
+    """
+
+    # 한 번에 레지스트리에서 정리할 만료 항목 수
+    PRUNE_BATCH = 100
+    # SCAN 한 번에 가져올 키 수
+    SCAN_COUNT = 500
+
+    def __init__(self, get_client, ttl=300, max_ids=1000, max_entry_bytes=64 * 1024, prefix="search",
+                 stale_ttl=30, lock_lease_ms=5000, fill_wait_ms=3000, ttl_mode="fixed",
+                 generation_refresh_ms=1000, max_message_terms=1000):
+        if ttl_mode not in ("fixed", "sliding"):
+            raise ValueError(f"지원하지 않는 TTL 모드: {ttl_mode}")
+        self.get_client = get_client
+        self.ttl = ttl
+        self.ttl_mode = ttl_mode
+        self.max_ids = max_ids
+        self.max_entry_bytes = max_entry_bytes
+        self.prefix = prefix
+        self.stale_ttl = stale_ttl
+        self.lock_lease_ms = lock_lease_ms
+        self.fill_wait = fill_wait_ms / 1000
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self._scripts = {}
+        self.generation_refresh = generation_refresh_ms / 1000
+        self.max_message_terms = max_message_terms
+        self._generation_value = None
+        self._generation_checked = 0.0
+        self._reclaim_lock = threading.Lock()
+
+    @staticmethod
+    def normalize(query):
+        """대소문자와 공백 차이를 없앤 검색어를 반환합니다."""
+        return " ".join(query.lower().split())
+
+    def _digest(self, query):
+        return hashlib.sha256(self.normalize(query).encode('utf-8')).hexdigest()
+
+    def _generation_key(self):
+        return f"{self.prefix}_generation"
+
+    def generation(self):
+        """현재 세대 번호를 반환합니다. (generation_refresh_ms 동안 캐시)"""
+        now = time.monotonic()
+        if self._generation_value is None or now - self._generation_checked >= self.generation_refresh:
+            self._generation_value = int(self.get_client().get(self._generation_key()) or 0)
+            self._generation_checked = now
+        return self._generation_value
+
+    def key(self, query, generation=None):
+        """세대 번호와 정규화된 검색어의 전체 SHA-256 해시로 캐시 키를 만듭니다."""
+        if generation is None:
+            generation = self.generation()
+        return f"{self.prefix}:{generation}:{self._digest(query)}"
+
+    def _registry_keys(self, generation):
+        base = f"{self.prefix}_registry:{generation}"
+        return [f"{base}:hits", f"{base}:expiry", f"{base}:meta", f"{base}:total_hits",
+                f"{base}:queries", f"{base}:index", f"{base}:versions"]
+
+    def _term_key(self, generation, term):
+        return f"{self.prefix}_registry:{generation}:term:{term}"
+
+    def _begin_args(self, query):
+        """_BEGIN_FILL_SCRIPT 인자 (채우기 만료는 락 lease와 대기 시간이 지난 뒤)"""
+        return (self._digest(query), query, " ".join(index_terms(query)),
+                time.time() + self.lock_lease_ms / 1000 + self.fill_wait)
+
+    def _candidate_keys(self, generation, terms):
+        """메시지 term의 검색어 색인 키를 SUNION 한 번에 넘길 크기로 나누어 반환합니다."""
+        keys = [self._term_key(generation, term) for term in terms]
+        return [keys[i:i + self.SCAN_COUNT] for i in range(0, len(keys), self.SCAN_COUNT)]
+
+    @staticmethod
+    def _matched(candidates, queries, message, matches):
+        """후보 digest 중 검색어가 메시지와 일치하는 digest 목록을 반환합니다."""
+        digests = []
+        for digest, query in zip(candidates, queries):
+            if query is None:
+                continue
+            try:
+                if matches(query, message):
+                    digests.append(digest)
+            except Exception as e:
+                print(f"Error matching cache registry query for {digest}: {str(e)}")
+        return digests
+
+    def _run_script(self, client, script, generation, *args, extra_keys=()):
+        """레지스트리 스크립트를 실행합니다. (client가 파이프라인이면 파이프라인에 추가)"""
+        registered = self._scripts.get(script)
+        if registered is None:
+            registered = self._scripts.setdefault(script, self.get_client().register_script(script))
+        keys = self._registry_keys(generation) + list(extra_keys)
+        return registered(keys=keys, args=list(args), client=client)
+
+    def get(self, query):
+        """캐시 항목을 한 번의 왕복(GET + PTTL)으로 읽습니다. 없으면 None.
+
+        반환 항목의 ttl_ms에는 남은 TTL(ms)이 들어 있습니다.
+        """
+        key = self.key(query)
+        pipe = self.get_client().pipeline(transaction=False)
+        pipe.get(key)
+        pipe.pttl(key)
+        cached_data, ttl_ms = pipe.execute()
+        if not cached_data:
+            return None
+        entry = json.loads(cached_data)
+        entry['ttl_ms'] = ttl_ms
+        return entry
+
+    def is_fresh(self, entry):
+        """TTL 안의 항목이면 True, stale 구간이면 False를 반환합니다."""
+        ttl_ms = entry.get('ttl_ms', -1)
+        return ttl_ms < 0 or ttl_ms > self.stale_ttl * 1000
+
+    def record_hit(self, query):
+        """레지스트리의 히트 수를 증가시키고 증가된 값을 반환합니다. (결과 항목은 다시 쓰지 않음)
+
+        레지스트리에 없는 항목(등록 전에 캐시된 항목)이면 0을 반환합니다.
+        """
+        expire = self.ttl + self.stale_ttl
+        generation = self.generation()
+        client = self.get_client()
+        if self.ttl_mode != "sliding":
+            return self._run_script(client, _HIT_SCRIPT, generation, self._digest(query), "")
+        pipe = client.pipeline(transaction=False)
+        self._run_script(pipe, _HIT_SCRIPT, generation, self._digest(query), time.time() + expire)
+        pipe.expire(self.key(query, generation), expire)
+        return pipe.execute()[0]
+
+    def _build_entry(self, query, ids, total):
+        now = datetime.utcnow().replace(tzinfo=timezone.utc)
+        ids = list(ids[:self.max_ids])
+        return {
+            "query": query,
+            "ids": ids,
+            "total": total,
+            "truncated": total > len(ids),
+            "timestamp": now.isoformat(),
+            "expires_at": (now + timedelta(seconds=self.ttl)).isoformat(),
+            "ttl_ms": (self.ttl + self.stale_ttl) * 1000
+        }
+
+    def store(self, query, ids, total, write_version=None):
+        """검색 결과 ID 목록을 저장하고 항목을 반환합니다.
+
+        크기 제한을 넘거나, write_version(채우기를 시작할 때 받은 검색어의 채우기 버전)이 주어졌고
+        그 사이 일치하는 메시지가 저장되어 항목이 무효화되었으면 저장하지 않습니다. (반환된 항목은 이번 요청에서만 사용)
+        """
+        entry = self._build_entry(query, ids, total)
+        payload = json.dumps({k: v for k, v in entry.items() if k != 'ttl_ms'}, separators=(',', ':'))
+        if len(payload) > self.max_entry_bytes:
+            telemetry_manager.record_metric("search_cache_store_skipped_total", 1, {"reason": "entry_too_large"})
+            return entry
+
+        # 만료 후에도 stale_ttl 동안 stale 결과로 제공할 수 있도록 보관
+        expire = self.ttl + self.stale_ttl
+        now = time.time()
+        meta = json.dumps({"query": query, "results_count": total, "created": entry['timestamp']},
+                          separators=(',', ':'))
+        generation = self.generation()
+        pipe = self.get_client().pipeline(transaction=False)
+        self._run_script(pipe, _REGISTER_SCRIPT, generation, self._digest(query), now + expire, meta,
+                         payload, expire, write_version if write_version is not None else "",
+                         query, " ".join(index_terms(query)), extra_keys=(self.key(query, generation),))
+        # 레지스트리가 계속 커지지 않도록 만료된 항목을 조금씩 정리
+        self._run_script(pipe, _PRUNE_SCRIPT, generation, now, self.PRUNE_BATCH)
+        stored, _ = pipe.execute()
+        if not stored:
+            telemetry_manager.record_metric("search_cache_store_skipped_total", 1, {"reason": "concurrent_write"})
+        return entry
+
+    def _lock_key(self, query, generation=None):
+        return f"{self.prefix}_lock:{self.key(query, generation).split(':', 1)[1]}"
+
+    def fill(self, query, loader, stale=None):
+        """single-flight로 캐시를 채우고 항목을 반환합니다.
+
+        Args:
+            loader: DB를 조회해 (ids, total)을 반환하는 함수
+            stale: 만료되었지만 남아 있는 이전 항목 (있으면 기다리는 요청에 반환)
+
+        Returns:
+            (entry, source) - source: fill, local, remote, stale, db (Redis를 사용할 수 없어 캐시 없이 DB 조회)
+        """
+        try:
+            generation = self.generation()
+        except RedisError as e:
+            # 세대 번호를 읽을 수 없으면 캐시 키를 만들 수 없으므로 DB에서 바로 조회
+            print(f"Redis cache error: {str(e)}")
+            return self._build_entry(query, *loader()), "db"
+        key = self.key(query, generation)
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+
+        if not leader:
+            # 같은 프로세스에서 이미 채우는 중
+            if stale is not None:
+                return self._coalesced(stale, "stale")
+            if flight.event.wait(self.fill_wait) and flight.entry is not None:
+                return self._coalesced(flight.entry, "local")
+            return self._build_entry(query, *loader()), "fill"
+
+        try:
+            flight.entry, source = self._fill_as_leader(query, generation, loader, stale)
+            return flight.entry, source
+        finally:
+            with self._flights_lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def _fill_as_leader(self, query, generation, loader, stale):
+        client = self.get_client()
+        lock_key = self._lock_key(query, generation)
+        token = uuid.uuid4().hex
+        try:
+            acquired = bool(client.set(lock_key, token, nx=True, px=self.lock_lease_ms))
+        except Exception as e:
+            # Redis를 사용할 수 없으면 락 없이 DB 조회
+            print(f"Redis cache lock error: {str(e)}")
+            acquired = None
+
+        if acquired is False:
+            # 다른 파드가 채우는 중
+            if stale is not None:
+                return self._coalesced(stale, "stale")
+            deadline = time.monotonic() + self.fill_wait
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                try:
+                    entry = self.get(query)
+                except Exception:
+                    break
+                if entry is not None and self.is_fresh(entry):
+                    return self._coalesced(entry, "remote")
+
+        write_version = None
+        if acquired is not None:
+            try:
+                write_version = self._run_script(client, _BEGIN_FILL_SCRIPT, generation, *self._begin_args(query))
+            except Exception as e:
+                print(f"Redis cache error: {str(e)}")
+
+        try:
+            ids, total = loader()
+            telemetry_manager.record_metric("search_cache_fills_total", 1)
+            try:
+                return self.store(query, ids, total, write_version), "fill"
+            except Exception as e:
+                print(f"Redis cache store error: {str(e)}")
+                return self._build_entry(query, ids, total), "fill"
+        finally:
+            if acquired:
+                try:
+                    client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    print(f"Redis cache unlock error: {str(e)}")
+
+    @staticmethod
+    def _coalesced(entry, source):
+        telemetry_manager.record_metric("search_cache_coalesced_total", 1, {"source": source})
+        return entry, source
+
+    def delete(self, query):
+        """특정 검색어의 캐시를 삭제합니다. 삭제된 결과 항목 수를 반환합니다."""
+        generation = self.generation()
+        pipe = self.get_client().pipeline(transaction=False)
+        pipe.delete(self.key(query, generation))
+        self._run_script(pipe, _PRUNE_SCRIPT, generation, 0, 0, self._digest(query))
+        return pipe.execute()[0]
+
+    def invalidate_matching(self, message, matches):
+        """새로 저장된 메시지와 일치하는 검색어의 캐시만 삭제하고, 삭제한 검색어 수를 반환합니다.
+
+        메시지를 커밋한 뒤 호출해야 합니다.
+
+        Args:
+            message: 저장된 메시지 본문
+            matches: (query, message)가 일치하면 True를 반환하는 함수 (MessageSearch.matches)
+        """
+        terms = message_terms(message, self.max_message_terms)
+        if terms is None:
+            # term이 너무 많으면 색인 조회 대신 전체 무효화
+            telemetry_manager.record_metric("search_cache_invalidation_fallbacks_total", 1)
+            return self.clear_all()
+
+        client = self.get_client()
+        generation = self.generation()
+
+        # 최신 세대 번호와 함께 색인에서 후보 검색어만 조회
+        pipe = client.pipeline(transaction=False)
+        pipe.get(self._generation_key())
+        for keys in self._candidate_keys(generation, terms):
+            pipe.sunion(keys)
+        current, *found = pipe.execute()
+
+        current = int(current or 0)
+        if current != generation:
+            # 다른 파드에서 전체 삭제됨
+            self._generation_value = generation = current
+            self._generation_checked = time.monotonic()
+            pipe = client.pipeline(transaction=False)
+            for keys in self._candidate_keys(generation, terms):
+                pipe.sunion(keys)
+            found = pipe.execute()
+
+        candidates = sorted(set().union(*found))
+        digests = []
+        if candidates:
+            queries = client.hmget(self._registry_keys(generation)[4], candidates)
+            digests = self._matched(candidates, queries, message, matches)
+
+        if digests:
+            pipe = client.pipeline(transaction=False)
+            pipe.unlink(*[f"{self.prefix}:{generation}:{digest}" for digest in digests])
+            self._run_script(pipe, _PRUNE_SCRIPT, generation, 0, 0, *digests)
+            pipe.execute()
+            telemetry_manager.record_metric("search_cache_invalidations_total", len(digests))
+        return len(digests)
+
+    def stats(self, offset=0, limit=20):
+        """히트 수 상위 검색어 통계를 레지스트리에서 조회합니다. (최대 두 번의 왕복)
+
+        Returns:
+            {"total_cached_queries", "total_hits", "cache_stats": [...]}
+        """
+        client = self.get_client()
+        generation = self.generation()
+        hits_key, expiry_key, meta_key, total_key = self._registry_keys(generation)[:4]
+
+        # 1) 만료 항목 정리 후 상위 N개, 전체 수, 전체 히트 수
+        pipe = client.pipeline(transaction=False)
+        self._run_script(pipe, _PRUNE_SCRIPT, generation, time.time(), self.PRUNE_BATCH)
+        pipe.zrevrange(hits_key, offset, offset + limit - 1, withscores=True)
+        pipe.zcard(hits_key)
+        pipe.get(total_key)
+        _, top, total_queries, total_hits = pipe.execute()
+
+        cache_stats = []
+        if top:
+            # 2) 상위 N개의 메타데이터와 만료 시각
+            digests = [digest for digest, _ in top]
+            pipe = client.pipeline(transaction=False)
+            pipe.hmget(meta_key, digests)
+            pipe.zmscore(expiry_key, digests)
+            metas, expiries = pipe.execute()
+
+            for (digest, hits), meta, expiry in zip(top, metas, expiries):
+                try:
+                    if meta:
+                        cache_info = json.loads(meta)
+                        expires_at = datetime.fromtimestamp(expiry - self.stale_ttl, timezone.utc) if expiry else None
+                        cache_stats.append({
+                            'query': cache_info['query'],
+                            'hit_count': int(hits),
+                            'timestamp': cache_info['created'],
+                            'expires_at': expires_at.isoformat() if expires_at else None,
+                            'results_count': cache_info['results_count']
+                        })
+                except Exception as e:
+                    print(f"Error parsing cache registry data for {digest}: {str(e)}")
+
+        return {
+            "total_cached_queries": total_queries,
+            "total_hits": int(total_hits or 0),
+            "cache_stats": cache_stats
+        }
+
+    def _scan_keys(self, client, match):
+        """match와 일치하는 키를 SCAN으로 SCAN_COUNT개씩 나누어 반환합니다."""
+        batch = []
+        for key in client.scan_iter(match=match, count=self.SCAN_COUNT):
+            batch.append(key)
+            if len(batch) >= self.SCAN_COUNT:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def rebuild_registry(self):
+        """레지스트리에 없는 현재 세대의 캐시 항목을 SCAN으로 찾아 등록합니다. 등록된 항목 수를 반환합니다.
+
+        레지스트리가 유실된 경우용이며, 이미 등록된 항목의 히트 수는 유지됩니다.
+        """
+        client = self.get_client()
+        generation = self.generation()
+        hits_key, expiry_key, meta_key, _ = self._registry_keys(generation)[:4]
+        now = time.time()
+        registered = 0
+        for keys in self._scan_keys(client, f"{self.prefix}:{generation}:*"):
+            pipe = client.pipeline(transaction=False)
+            for key in keys:
+                pipe.get(key)
+                pipe.pttl(key)
+            values = pipe.execute()
+
+            pipe = client.pipeline(transaction=False)
+            for key, cached_data, ttl_ms in zip(keys, values[::2], values[1::2]):
+                if not cached_data or ttl_ms < 0:
+                    continue
+                try:
+                    cache_info = json.loads(cached_data)
+                except ValueError:
+                    continue
+                digest = key.rsplit(':', 1)[1]
+                meta = json.dumps({"query": cache_info['query'], "results_count": cache_info['total'],
+                                   "created": cache_info['timestamp']}, separators=(',', ':'))
+                pipe.zadd(hits_key, {digest: 0}, nx=True)
+                pipe.zadd(expiry_key, {digest: now + ttl_ms / 1000}, nx=True)
+                pipe.hsetnx(meta_key, digest, meta)
+                self._run_script(pipe, _INDEX_SCRIPT, generation, digest, cache_info['query'],
+                                 " ".join(index_terms(cache_info['query'])))
+            results = pipe.execute()
+            registered += sum(1 for added in results[::4] if added)
+        return registered
+
+    def clear_all(self):
+        """세대 번호를 올려 모든 검색 캐시를 무효화하고, 무효화된 검색어 수를 반환합니다.
+
+        이전 세대의 키는 더 이상 조회되지 않으며 백그라운드 스레드가 정리합니다.
+        """
+        client = self.get_client()
+        generation = client.incr(self._generation_key())
+        self._generation_value = generation
+        self._generation_checked = time.monotonic()
+        cleared = client.zcard(self._registry_keys(generation - 1)[0])
+        telemetry_manager.record_metric("search_cache_generation_bumps_total", 1)
+
+        threading.Thread(target=self.reclaim, name="search-cache-reclaim", daemon=True).start()
+        return cleared
+
+    def _is_stale_key(self, key, generation):
+        """현재 세대가 아닌 검색 캐시 키(항목, 락, 레지스트리)이면 True"""
+        namespace, _, rest = key.partition(':')
+        if namespace not in (self.prefix, f"{self.prefix}_lock", f"{self.prefix}_registry"):
+            return False
+        key_generation = rest.split(':', 1)[0]
+        return not key_generation.isdigit() or int(key_generation) < generation
+
+    def reclaim(self):
+        """이전 세대의 키를 SCAN으로 찾아 UNLINK로 일괄 삭제합니다. 삭제한 키 수를 반환합니다.
+
+        프로세스 안에서는 한 번에 하나만 실행되며, 이미 실행 중이면 0을 반환합니다.
+        """
+        if not self._reclaim_lock.acquire(blocking=False):
+            return 0
+        reclaimed = 0
+        try:
+            client = self.get_client()
+            generation = int(client.get(self._generation_key()) or 0)
+            for keys in self._scan_keys(client, f"{self.prefix}*"):
+                stale = [key for key in keys if self._is_stale_key(key, generation)]
+                if stale:
+                    reclaimed += client.unlink(*stale)
+            telemetry_manager.record_metric("search_cache_reclaimed_keys_total", reclaimed)
+        except Exception as e:
+            print(f"Redis cache reclaim error: {str(e)}")
+        finally:
+            self._reclaim_lock.release()
+        return reclaimed
+
+    @staticmethod
+    def page_ids(entry, offset, limit):
+        """캐시된 ID로 요청 페이지를 만들 수 있으면 해당 ID 목록을, 아니면 None을 반환합니다."""
+        ids = entry['ids']
+        if offset + limit <= len(ids) or not entry.get('truncated'):
+            return ids[offset:offset + limit]
+        return None
+
+
+def get_search_cache(get_client):
+    """환경 변수 설정으로 검색 캐시를 생성합니다."""
+    return SearchCache(
+        get_client,
+        ttl=int(os.getenv('SEARCH_CACHE_TTL', '300')),
+        max_ids=int(os.getenv('SEARCH_CACHE_MAX_IDS', '1000')),
+        max_entry_bytes=int(os.getenv('SEARCH_CACHE_MAX_ENTRY_BYTES', str(64 * 1024))),
+        stale_ttl=int(os.getenv('SEARCH_CACHE_STALE_TTL', '30')),
+        lock_lease_ms=int(os.getenv('SEARCH_CACHE_LOCK_LEASE_MS', '5000')),
+        fill_wait_ms=int(os.getenv('SEARCH_CACHE_FILL_WAIT_MS', '3000')),
+        ttl_mode=os.getenv('SEARCH_CACHE_TTL_MODE', 'fixed').lower(),
+        generation_refresh_ms=int(os.getenv('SEARCH_CACHE_GENERATION_REFRESH_MS', '1000')),
+        max_message_terms=int(os.getenv('SEARCH_CACHE_MAX_MESSAGE_TERMS', '1000'))
+    )
@@ -0,0 +1,68 @@
+import time
+from datetime import datetime, timezone
+from telemetry import telemetry_manager
+
+
+class SessionActivity:
+    """세션 활동 시간(last_activity) 기록을 제한하는 추적기
+
+    last_activity가 write_interval초 이상 지났을 때만 세션을 수정하여 Flask-Session이
+    세션 전체를 다시 직렬화/SET 하도록 합니다. 그 사이의 요청은 세션 키에 EXPIRE만 실행하여
+    (touch) 페이로드를 다시 쓰지 않고 만료 시간만 연장합니다.
+
+    write_interval이 0이면 기존처럼 요청마다 기록합니다.
+    related_prefixes의 키(세션 ID 기준, 예: session_details:<sid>)는 세션과 함께 만료를 연장합니다.
+    """
+
+    def __init__(self, get_client, key_prefix="session:", lifetime=3600, write_interval=60, touch=True,
+                 related_prefixes=()):
+        self.get_client = get_client
+        self.key_prefix = key_prefix
+        self.lifetime = int(lifetime)
+        self.write_interval = write_interval
+        self.touch = touch
+        self.related_prefixes = tuple(related_prefixes)
+
+    def _last_activity(self, session):
+        value = session.get('last_activity')
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except (TypeError, ValueError):
+            return None
+
+    def update(self, session):
+        """활동 시간을 갱신합니다. 세션을 다시 저장하면 True, 저장을 생략하면 False를 반환합니다."""
+        written, prefixes = self._mark(session)
+        self._touch(session, prefixes)
+        return written
+
+    def _mark(self, session):
+        """활동 시간을 기록할지 결정하고 (기록할 때만 세션 수정), (기록 여부, 만료를 연장할 키 prefix)를 반환합니다."""
+        now = time.time()
+        last = self._last_activity(session)
+        if last is None or now - last >= self.write_interval:
+            session['last_activity'] = datetime.fromtimestamp(now, timezone.utc).isoformat()
+            session.modified = True  # 세션 변경사항을 Redis에 저장
+            telemetry_manager.record_metric("session_activity_writes_total", 1, {"result": "written"})
+            # 세션 키는 Flask-Session이 다시 저장하면서 만료가 연장됨
+            return True, self.related_prefixes
+
+        telemetry_manager.record_metric("session_activity_writes_total", 1, {"result": "avoided"})
+        return False, ((self.key_prefix,) + self.related_prefixes if self.touch else ())
+
+    def _touch(self, session, prefixes):
+        """세션 ID 기준 키들의 만료 시간을 한 번의 파이프라인으로 연장합니다."""
+        sid = getattr(session, 'sid', None)
+        if not sid or not prefixes:
+            return
+        try:
+            pipe = self.get_client().pipeline(transaction=False)
+            for prefix in prefixes:
+                pipe.expire(f"{prefix}{sid}", self.lifetime)
+            pipe.execute()
+            telemetry_manager.record_metric("session_touch_total", 1, {"status": "success"})
+        except Exception as e:
+            print(f"Session touch error: {str(e)}")
+            telemetry_manager.record_metric("session_touch_total", 1, {"status": "error"})
@@ -0,0 +1,99 @@
+from typing import Any, Dict, Optional
+import msgspec
+from flask_session.base import Serializer, MsgSpecSerializer
+
+
+class _CompactSession(msgspec.Struct, array_like=True):
+    """세션의 고정 레이아웃 (필드 이름 없이 msgpack 배열로 저장)
+
+    레이아웃에 없는 키(또는 문자열이 아닌 값)는 extra에 그대로 저장합니다.
+    """
+    user_id: Optional[str] = None
+    login_time: Optional[str] = None
+    last_activity: Optional[str] = None
+    browser_id: Optional[str] = None
+    permanent: Optional[bool] = None
+    extra: Dict[str, Any] = msgspec.field(default_factory=dict)
+
+
+_STRING_FIELDS = ("user_id", "login_time", "last_activity", "browser_id")
+
+
+class CompactSessionSerializer(Serializer):
+    """고정 레이아웃 msgpack 세션 직렬화기 (Flask-Session 플러그인)
+
+    자주 쓰는 필드는 순서만으로 구분되는 배열로 저장하여 키 이름을 저장하지 않습니다.
+    기존 형식(msgpack/json/pickle 맵)의 세션은 Flask-Session 기본 직렬화기로 읽습니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.encoder = msgspec.msgpack.Encoder()
+        self.decoder = msgspec.msgpack.Decoder(_CompactSession)
+        self.fallback = MsgSpecSerializer(app=app, format="msgpack")
+
+    def encode(self, session):
+        data = dict(session)
+        # _CompactSession 필드 순서의 배열
+        values = [data.pop(name) if isinstance(data.get(name), str) else None for name in _STRING_FIELDS]
+        values.append(data.pop("_permanent") if isinstance(data.get("_permanent"), bool) else None)
+        values.append(data)
+        try:
+            return self.encoder.encode(values)
+        except Exception as e:
+            self.app.logger.error(f"Failed to serialize session data: {e}")
+            raise
+
+    def decode(self, serialized_data):
+        try:
+            compact = self.decoder.decode(serialized_data)
+        except (msgspec.DecodeError, msgspec.ValidationError):
+            # 기존 형식으로 저장된 세션
+            return self.fallback.decode(serialized_data)
+        data = dict(compact.extra)
+        for name in _STRING_FIELDS:
+            value = getattr(compact, name)
+            if value is not None:
+                data[name] = value
+        if compact.permanent is not None:
+            data["_permanent"] = compact.permanent
+        return data
+
+
+def create_serializer(app, name):
+    """SESSION_SERIALIZER 값으로 세션 직렬화기를 생성합니다. (compact, msgpack, json)"""
+    if name == "compact":
+        return CompactSessionSerializer(app)
+    if name in ("msgpack", "json"):
+        return MsgSpecSerializer(app=app, format=name)
+    raise ValueError(f"지원하지 않는 세션 직렬화 형식: {name}")
+
+
+class SessionDetails:
+    """세션에서 거의 읽지 않는 필드(user_agent 등)를 별도 Hash(session_details:<sid>)에 저장
+
+    요청마다 세션과 함께 읽히지 않고, 필요한 엔드포인트에서만 HGET으로 읽습니다.
+    만료 시간은 세션과 함께 연장합니다. (SessionActivity의 touch 대상)
+    """
+
+    def __init__(self, get_client, key_prefix="session_details:", lifetime=3600):
+        self.get_client = get_client
+        self.key_prefix = key_prefix
+        self.lifetime = int(lifetime)
+
+    def key(self, sid):
+        return f"{self.key_prefix}{sid}"
+
+    def save(self, sid, fields):
+        pipe = self.get_client().pipeline(transaction=False)
+        pipe.delete(self.key(sid))
+        pipe.hset(self.key(sid), mapping=fields)
+        pipe.expire(self.key(sid), self.lifetime)
+        pipe.execute()
+
+    def get(self, sid, field):
+        value = self.get_client().hget(self.key(sid), field)
+        return value.decode() if isinstance(value, bytes) else value
+
+    def delete(self, sid):
+        self.get_client().delete(self.key(sid))
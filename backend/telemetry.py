@@ -1,11 +1,16 @@
 import os
 import logging
+import time
+import threading
 from opentelemetry import trace
 from opentelemetry import metrics
+from opentelemetry.metrics import Observation
 from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import Sampler, SamplingResult, Decision, ParentBased, TraceIdRatioBased
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics import MeterProvider, Histogram
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+from opentelemetry.sdk.metrics.view import View, ExplicitBucketHistogramAggregation
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.instrumentation.flask import FlaskInstrumentor
 from opentelemetry.instrumentation.mysql import MySQLInstrumentor
@@ -22,6 +27,148 @@ from opentelemetry.sdk._logs.export import BatchLogRecordProcessor, ConsoleLogEx
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 지연 시간(*_ms) 히스토그램 기본 버킷 경계 (ms)
+DEFAULT_LATENCY_BUCKETS_MS = "1,2.5,5,10,25,50,100,250,500,1000,2500,5000,10000"
+
+def _latency_buckets():
+    """OTEL_LATENCY_BUCKETS_MS(쉼표 구분)에서 버킷 경계를 읽습니다."""
+    raw = os.getenv('OTEL_LATENCY_BUCKETS_MS', DEFAULT_LATENCY_BUCKETS_MS)
+    try:
+        return sorted(float(value) for value in raw.split(',') if value.strip())
+    except ValueError:
+        logger.error(f"잘못된 OTEL_LATENCY_BUCKETS_MS 값: {raw}, 기본값을 사용합니다.")
+        return [float(value) for value in DEFAULT_LATENCY_BUCKETS_MS.split(',')]
+
+# 이 속성이 설정된 Span은 샘플링 비율과 관계없이 항상 샘플링 (errors always)
+FORCE_SAMPLE_ATTRIBUTE = "sampling.priority"
+
+def _parse_overrides(raw, upper=1.0):
+    """"이름=값,이름=값" 형식의 이름별 설정 값(샘플링 비율, 레이트 리밋)을 읽습니다. (0 ~ upper)"""
+    overrides = {}
+    for item in (raw or "").split(','):
+        if '=' not in item:
+            continue
+        name, ratio = item.split('=', 1)
+        try:
+            value = max(0.0, float(ratio))
+            overrides[name.strip()] = value if upper is None else min(upper, value)
+        except ValueError:
+            logger.error(f"잘못된 설정 값: {item}")
+    return overrides
+
+class _OperationRatioSampler(Sampler):
+    """루트 Span의 작업(Span 이름, http.route 또는 "METHOD 라우트"에 연결된 작업 이름)별 비율로 샘플링"""
+    
+    def __init__(self, ratio, overrides, operation_routes):
+        self._default = TraceIdRatioBased(ratio)
+        self._overrides = {name: TraceIdRatioBased(value) for name, value in overrides.items()}
+        self._operation_routes = operation_routes
+    
+    def _select(self, name, attributes):
+        if self._overrides:
+            route = attributes.get("http.route") if attributes else None
+            for key in (name, route, self._operation_routes.get(name)):
+                if key in self._overrides:
+                    return self._overrides[key]
+        return self._default
+    
+    def should_sample(self, parent_context, trace_id, name, kind=None, attributes=None, links=None, trace_state=None):
+        return self._select(name, attributes).should_sample(
+            parent_context, trace_id, name, kind, attributes, links, trace_state
+        )
+    
+    def get_description(self):
+        return f"OperationRatioSampler{{{self._default.get_description()}, overrides={len(self._overrides)}}}"
+
+class OperationSampler(Sampler):
+    """ParentBased(작업별 TraceIdRatioBased) 샘플러
+    
+    - 부모 Span이 있으면 부모의 샘플링 결정을 따릅니다.
+    - 루트 Span은 작업별 비율(없으면 기본 비율)로 샘플링합니다.
+    - errors_always가 켜져 있으면 FORCE_SAMPLE_ATTRIBUTE가 설정된 Span은 항상 샘플링합니다.
+    
+    configure()로 실행 중에도 설정을 바꿀 수 있습니다.
+    """
+    
+    def __init__(self, ratio=1.0, overrides=None, errors_always=True):
+        self.operation_routes = {}
+        self.configure(ratio, overrides, errors_always)
+    
+    def configure(self, ratio=1.0, overrides=None, errors_always=True):
+        self.ratio = ratio
+        self.overrides = dict(overrides or {})
+        self.errors_always = errors_always
+        self._delegate = ParentBased(root=_OperationRatioSampler(ratio, self.overrides, self.operation_routes))
+    
+    def should_sample(self, parent_context, trace_id, name, kind=None, attributes=None, links=None, trace_state=None):
+        if self.errors_always and attributes and attributes.get(FORCE_SAMPLE_ATTRIBUTE):
+            return SamplingResult(Decision.RECORD_AND_SAMPLE, attributes,
+                                  trace.get_current_span(parent_context).get_span_context().trace_state)
+        return self._delegate.should_sample(parent_context, trace_id, name, kind, attributes, links, trace_state)
+    
+    def get_description(self):
+        return f"OperationSampler{{ratio={self.ratio}, overrides={self.overrides}, errors_always={self.errors_always}}}"
+
+# LogRecord 기본 필드와 이름이 겹치는 로그 속성은 "attr." 접두어를 붙여 전달
+_RESERVED_LOG_FIELDS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+def _log_attributes(attributes):
+    """로그 속성을 OTel LogRecord 속성으로 사용할 수 있는 값으로 변환합니다. (None 제외, 그 외 타입은 문자열)"""
+    extra = {}
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if not isinstance(value, (str, bool, int, float)):
+            value = str(value)
+        extra[f"attr.{key}" if key in _RESERVED_LOG_FIELDS else key] = value
+    return extra
+
+class _LazyMessage:
+    """로그가 실제로 출력될 때 메시지 함수를 호출하는 래퍼"""
+    
+    __slots__ = ("_build",)
+    
+    def __init__(self, build):
+        self._build = build
+    
+    def __str__(self):
+        return f"[LGTM] {self._build()}"
+
+# 환경 변수(OTEL_LOG_RATE_LIMIT_OVERRIDES)로 덮어쓸 수 있는 컴포넌트별 기본 로그 레이트 리밋
+# (redis_logging은 API 로그마다 기록되므로 트래픽에 비례해 늘지 않도록 제한)
+DEFAULT_LOG_RATE_LIMITS = {"redis_logging": 50.0}
+
+class _LogRateLimiter:
+    """컴포넌트별 토큰 버킷 (초당 rate개, 최대 burst개까지 연속 허용)
+    
+    rate가 0 이하인 컴포넌트는 제한하지 않습니다.
+    """
+    
+    def __init__(self, rate=0.0, overrides=None, burst=None):
+        self.rate = rate
+        self.overrides = dict(overrides or {})
+        self.burst = burst
+        self._buckets = {}  # component -> [tokens, last]
+        self._lock = threading.Lock()
+    
+    def allow(self, component):
+        rate = self.overrides.get(component, self.rate)
+        if rate <= 0:
+            return True
+        # rate가 1 미만이어도 로그 하나는 기록할 수 있도록 버킷 크기는 최소 1
+        capacity = max(1.0, self.burst or rate)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(component)
+            if bucket is None:
+                bucket = self._buckets[component] = [capacity, now]
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                return False
+            bucket[0] -= 1
+            return True
+
 class TelemetryManager:
     """OpenTelemetry 설정 및 관리를 위한 클래스"""
     
@@ -32,49 +179,54 @@ class TelemetryManager:
         self.trace_provider = None
         self.meter_provider = None
         self.logging_instrumentor = None
+        # 이름별로 한 번만 생성해 재사용하는 계측기 (kind, name) -> instrument
+        self._instruments = {}
+        self._instruments_lock = threading.Lock()
+        # Observable Gauge 이름별 콜백 {name: {attributes key: (callback, attributes)}}
+        self._gauge_callbacks = {}
+        # 트레이스 샘플링 설정 (setup_telemetry에서 환경 변수로 구성)
+        self.sampler = OperationSampler()
+        self.low_overhead = False
+        # 컴포넌트별 로그 레이트 리밋 (setup_telemetry에서 환경 변수로 구성)
+        self.log_rate_limiter = _LogRateLimiter()
+        # gunicorn preload 모드에서 Provider 생성을 워커 fork 이후로 미뤘는지 여부
+        self._providers_deferred = False
+        self._log_handler = None
         
-    def setup_telemetry(self, app=None):
-        """OpenTelemetry 설정을 초기화합니다."""
+    def setup_telemetry(self, app=None, defer_providers=False):
+        """OpenTelemetry 설정을 초기화합니다.
+        
+        defer_providers가 True이면 (gunicorn preload) 자동 계측만 적용하고 Provider/Exporter는
+        워커 fork 이후 setup_after_fork()에서 생성합니다. 그 전에 만든 Tracer/Meter는
+        Provider가 설정되면 자동으로 연결됩니다.
+        """
         try:
-            # 리소스 설정
-            service_name = os.getenv('BACKEND_SERVICE_NAME', 'backend')
-            resource = Resource.create({
-                "service.name": service_name,
-                "service.version": "1.0.0",
-                "deployment.environment": "development"
-            })
+            # 샘플링 설정
+            self.configure_sampling(
+                ratio=float(os.getenv('OTEL_TRACES_SAMPLER_ARG', '1.0')),
+                overrides=_parse_overrides(os.getenv('OTEL_TRACES_SAMPLER_OVERRIDES')),
+                errors_always=os.getenv('OTEL_TRACES_SAMPLE_ERRORS', 'true').lower() == 'true',
+                low_overhead=os.getenv('OTEL_LOW_OVERHEAD', 'false').lower() == 'true'
+            )
             
-            # Trace Provider 설정
-            self.trace_provider = TracerProvider(resource=resource)
+            # 로그 레이트 리밋 설정
+            self.log_rate_limiter = _LogRateLimiter(
+                rate=float(os.getenv('OTEL_LOG_RATE_LIMIT', '0')),
+                overrides=dict(DEFAULT_LOG_RATE_LIMITS,
+                               **_parse_overrides(os.getenv('OTEL_LOG_RATE_LIMIT_OVERRIDES'), upper=None)),
+                burst=float(os.getenv('OTEL_LOG_RATE_LIMIT_BURST', '0')) or None
+            )
             
-            # Span Exporter 설정
-            exporters = self._setup_span_exporters()
-            for exporter in exporters:
-                self.trace_provider.add_span_processor(BatchSpanProcessor(exporter))
+            if defer_providers:
+                self._providers_deferred = True
+                logger.info("OpenTelemetry Provider 설정을 워커 fork 이후로 미룹니다.")
+            else:
+                self._setup_providers()
             
-            # Trace 설정
-            trace.set_tracer_provider(self.trace_provider)
+            # Provider 설정 전이면 프록시 Tracer/Meter (Provider 설정 시 연결됨)
             self.tracer = trace.get_tracer(__name__)
-            
-            # Meter Provider 설정
-            metric_readers = self._setup_metric_readers()
-            self.meter_provider = MeterProvider(resource=resource, metric_readers=metric_readers)
-            
-            # Metrics 설정
-            metrics.set_meter_provider(self.meter_provider)
             self.meter = metrics.get_meter(__name__)
             
-            # Logger Provider 설정
-            self.logger_provider = LoggerProvider(resource=resource)
-            
-            # Log Exporter 설정
-            log_exporters = self._setup_log_exporters()
-            for exporter in log_exporters:
-                self.logger_provider.add_log_record_processor(BatchLogRecordProcessor(exporter))
-            
-            # Logger 설정
-            set_logger_provider(self.logger_provider)
-            
             # LoggingInstrumentor로 Python 로깅과 OpenTelemetry 연동
             # 이렇게 하면 모든 로그에 trace_id, span_id, service.name이 자동으로 포함됩니다
             self.logging_instrumentor = LoggingInstrumentor()
@@ -83,10 +235,6 @@ class TelemetryManager:
                 log_level=logging.INFO
             )
             
-            # LoggingHandler 설정으로 Python 로깅과 OpenTelemetry 로깅 연결
-            handler = LoggingHandler(level=logging.NOTSET, logger_provider=self.logger_provider)
-            logging.getLogger().addHandler(handler)
-            
             # Flask 앱이 제공된 경우 자동 계측
             if app:
                 self._instrument_flask(app)
@@ -99,6 +247,66 @@ class TelemetryManager:
         except Exception as e:
             logger.error(f"❌ OpenTelemetry 설정 오류: {str(e)}")
     
+    def setup_after_fork(self):
+        """setup_telemetry(defer_providers=True)로 미룬 Provider/Exporter를 현재(워커) 프로세스에서 생성합니다.
+        
+        워커마다 Resource의 service.instance.id가 달라지므로 워커별 누적 메트릭이 섞이지 않습니다.
+        """
+        if not self._providers_deferred:
+            return
+        self._providers_deferred = False
+        try:
+            self._setup_providers()
+            logger.info(f"✅ OpenTelemetry Provider가 설정되었습니다. (pid={os.getpid()})")
+        except Exception as e:
+            logger.error(f"❌ OpenTelemetry Provider 설정 오류: {str(e)}")
+    
+    def _setup_providers(self):
+        """Trace/Metric/Log Provider와 Exporter를 생성하고 전역으로 설정합니다."""
+        # 리소스 설정
+        service_name = os.getenv('BACKEND_SERVICE_NAME', 'backend')
+        resource = Resource.create({
+            "service.name": service_name,
+            "service.version": "1.0.0",
+            "deployment.environment": "development",
+            "process.pid": os.getpid()
+        })
+        
+        # Trace Provider 설정
+        self.trace_provider = TracerProvider(resource=resource, sampler=self.sampler)
+        
+        # Span Exporter 설정
+        exporters = self._setup_span_exporters()
+        for exporter in exporters:
+            self.trace_provider.add_span_processor(BatchSpanProcessor(exporter))
+        
+        # Trace 설정
+        trace.set_tracer_provider(self.trace_provider)
+        
+        # Meter Provider 설정
+        metric_readers = self._setup_metric_readers()
+        self.meter_provider = MeterProvider(
+            resource=resource, metric_readers=metric_readers, views=self._setup_views()
+        )
+        
+        # Metrics 설정
+        metrics.set_meter_provider(self.meter_provider)
+        
+        # Logger Provider 설정
+        self.logger_provider = LoggerProvider(resource=resource)
+        
+        # Log Exporter 설정
+        log_exporters = self._setup_log_exporters()
+        for exporter in log_exporters:
+            self.logger_provider.add_log_record_processor(BatchLogRecordProcessor(exporter))
+        
+        # Logger 설정
+        set_logger_provider(self.logger_provider)
+        
+        # LoggingHandler 설정으로 Python 로깅과 OpenTelemetry 로깅 연결
+        self._log_handler = LoggingHandler(level=logging.NOTSET, logger_provider=self.logger_provider)
+        logging.getLogger().addHandler(self._log_handler)
+    
     def _setup_span_exporters(self):
         """Span Exporter들을 설정합니다."""
         exporters = []
@@ -131,6 +339,18 @@ class TelemetryManager:
         
         return readers
     
+    def _setup_views(self):
+        """지연 시간(*_ms) 히스토그램의 버킷 경계를 설정합니다."""
+        buckets = _latency_buckets()
+        logger.info(f"지연 시간 히스토그램 버킷: {buckets}")
+        return [
+            View(
+                instrument_type=Histogram,
+                instrument_name="*_ms",
+                aggregation=ExplicitBucketHistogramAggregation(boundaries=buckets)
+            )
+        ]
+    
     def _setup_log_exporters(self):
         """Log Exporter들을 설정합니다."""
         exporters = []
@@ -163,7 +383,16 @@ class TelemetryManager:
             logger.info("Flask 자동 계측이 적용되었습니다.")
         except Exception as e:
             logger.error(f"Flask 계측 설정 실패: {str(e)}")
-    
+
+    def instrument_asgi_app(self, app):
+        """ASGI 앱(Quart)의 HTTP 요청을 OpenTelemetry 미들웨어로 계측합니다."""
+        try:
+            from opentelemetry.instrumentation.asgi import OpenTelemetryMiddleware
+            app.asgi_app = OpenTelemetryMiddleware(app.asgi_app)
+            logger.info("ASGI 자동 계측이 적용되었습니다.")
+        except Exception as e:
+            logger.error(f"ASGI 계측 설정 실패: {str(e)}")
+
     def _instrument_databases(self):
         """데이터베이스 및 Redis에 자동 계측을 적용합니다."""
         try:
@@ -195,37 +424,165 @@ class TelemetryManager:
         """Meter 인스턴스를 반환합니다."""
         return self.meter
     
+    def configure_sampling(self, ratio=1.0, overrides=None, errors_always=True, low_overhead=False):
+        """트레이스 샘플링을 설정합니다.
+        
+        Args:
+            ratio: 루트 트레이스 기본 샘플링 비율 (0.0 ~ 1.0)
+            overrides: 작업 이름(또는 Span 이름/라우트)별 샘플링 비율
+            errors_always: 오류는 샘플링 여부와 관계없이 별도 Span으로 기록
+            low_overhead: 샘플링되지 않은 요청은 log_operation에서 속성/성공 로그를 생략
+        """
+        self.sampler.configure(min(1.0, max(0.0, ratio)), overrides, errors_always)
+        self.low_overhead = low_overhead
+        logger.info(f"트레이스 샘플링 설정: {self.sampler.get_description()}, low_overhead={low_overhead}")
+    
+    def register_operation_route(self, method, route, operation_name):
+        """라우트의 루트 Span("METHOD 라우트")에 작업별 샘플링 비율이 적용되도록 작업 이름을 연결합니다."""
+        self.sampler.operation_routes[f"{method} {route}"] = operation_name
+    
+    def record_error_span(self, name, error, attributes=None, parent_span=None):
+        """샘플링되지 않은 요청의 오류를 항상 샘플링되는 새 트레이스로 기록합니다. (원래 Span은 link로 연결)"""
+        if not self.tracer or not self.sampler.errors_always:
+            return
+        links = []
+        if parent_span is not None and parent_span.get_span_context().is_valid:
+            links.append(trace.Link(parent_span.get_span_context()))
+        span_attributes = dict(attributes or {}, error=True)
+        span_attributes[FORCE_SAMPLE_ATTRIBUTE] = 1
+        span = self.tracer.start_span(
+            name, context=trace.set_span_in_context(trace.INVALID_SPAN),
+            attributes=span_attributes, links=links
+        )
+        span.record_exception(error)
+        span.set_status(trace.Status(trace.StatusCode.ERROR, str(error)))
+        span.end()
+    
     def create_span(self, name, attributes=None):
         """새로운 Span을 생성합니다."""
         if self.tracer:
             return self.tracer.start_span(name, attributes=attributes or {})
         return None
     
+    def _instrument(self, kind, name, **kwargs):
+        """계측기를 처음 사용할 때 한 번만 생성하고 이후에는 캐시된 계측기를 반환합니다."""
+        instrument = self._instruments.get((kind, name))
+        if instrument is None and self.meter:
+            with self._instruments_lock:
+                instrument = self._instruments.get((kind, name))
+                if instrument is None:
+                    factory = {
+                        "counter": self.meter.create_counter,
+                        "histogram": self.meter.create_histogram,
+                        "up_down_counter": self.meter.create_up_down_counter
+                    }[kind]
+                    instrument = factory(name, **kwargs)
+                    self._instruments[(kind, name)] = instrument
+        return instrument
+    
     def record_metric(self, name, value, attributes=None):
-        """메트릭을 기록합니다."""
-        if self.meter:
-            counter = self.meter.create_counter(name)
+        """카운터 메트릭을 기록합니다."""
+        counter = self._instrument("counter", name)
+        if counter is not None:
             counter.add(value, attributes=attributes or {})
+
+    def record_histogram(self, name, value, attributes=None):
+        """히스토그램 값을 기록합니다. (지연 시간 등, 이름이 _ms로 끝나면 OTEL_LATENCY_BUCKETS_MS 버킷 사용)"""
+        histogram = self._instrument("histogram", name)
+        if histogram is not None:
+            histogram.record(value, attributes=attributes or {})
+
+    def add_up_down(self, name, value, attributes=None):
+        """증감 카운터(UpDownCounter)에 값을 더합니다. (진행 중인 요청 수 등)"""
+        counter = self._instrument("up_down_counter", name)
+        if counter is not None:
+            counter.add(value, attributes=attributes or {})
+
+    def register_gauge(self, name, callback, attributes=None, description=""):
+        """콜백으로 현재 값을 읽는 Observable Gauge를 등록합니다.
+        
+        같은 이름과 속성으로 다시 등록하면 (fork 이후 재생성된 객체 등) 콜백을 교체합니다.
+        """
+        if not self.meter:
+            return
+
+        key = tuple(sorted((attributes or {}).items()))
+        with self._instruments_lock:
+            callbacks = self._gauge_callbacks.get(name)
+            created = callbacks is not None
+            if not created:
+                callbacks = self._gauge_callbacks[name] = {}
+            callbacks[key] = (callback, attributes or {})
+        if created:
+            return
+
+        def _observe(options):
+            observations = []
+            for gauge_callback, gauge_attributes in list(callbacks.values()):
+                try:
+                    observations.append(Observation(gauge_callback(), gauge_attributes))
+                except Exception as e:
+                    logger.error(f"Gauge 콜백 오류 ({name}): {str(e)}")
+            return observations
+
+        self.meter.create_observable_gauge(name, callbacks=[_observe], description=description)
+
+    def log(self, level, message, attributes=None, args=(), component=None):
+        """구조화된 로그를 기록합니다. 트레이스 컨텍스트가 자동으로 포함됩니다.
+        
+        Args:
+            level: logging 레벨 (logging.INFO 등)
+            message: 메시지 문자열(args가 있으면 %-포맷) 또는 메시지를 반환하는 함수
+            attributes: 로그 속성 dict 또는 dict를 반환하는 함수 (OTel LogRecord 속성으로 전달)
+            args: message의 %-포맷 인자 (출력될 때만 포맷)
+            component: 레이트 리밋 단위 (없으면 attributes dict의 component)
+        
+        레벨이 비활성화되었거나, low overhead 모드에서 샘플링되지 않은 요청의 INFO 이하 로그이거나,
+        컴포넌트의 레이트 리밋을 넘으면 메시지와 속성을 만들지 않고 버립니다.
+        """
+        self._emit(level, message, attributes, args, component)
+    
+    def _emit(self, level, message, attributes, args, component):
+        if not logger.isEnabledFor(level):
+            return
+        if self.low_overhead and level < logging.WARNING:
+            span_context = trace.get_current_span().get_span_context()
+            if span_context.is_valid and not span_context.trace_flags.sampled:
+                return
+        if component is None and isinstance(attributes, dict):
+            component = attributes.get("component")
+        if not self.log_rate_limiter.allow(component):
+            self.record_metric("log_records_dropped_total", 1, {"component": component or "unknown"})
+            return
+        if callable(attributes):
+            attributes = attributes()
+        if callable(message):
+            message, args = _LazyMessage(message), ()
+        else:
+            message = f"[LGTM] {message}"
+        # stacklevel=3: 로그의 code.* 속성이 log_*()를 호출한 위치를 가리키도록
+        logger.log(level, message, *args, extra=_log_attributes(attributes) if attributes else None, stacklevel=3)
     
-    def log_info(self, message, attributes=None):
-        """INFO 레벨 로그를 기록합니다. 트레이스 컨텍스트가 자동으로 포함됩니다."""
-        # LoggingInstrumentor가 설정되어 있으므로 trace_id, span_id가 자동으로 포함됩니다
-        logger.info(f"[LGTM] {message}")
+    def log_info(self, message, attributes=None, args=(), component=None):
+        """INFO 레벨 로그를 기록합니다."""
+        self._emit(logging.INFO, message, attributes, args, component)
     
-    def log_error(self, message, attributes=None):
-        """ERROR 레벨 로그를 기록합니다. 트레이스 컨텍스트가 자동으로 포함됩니다."""
-        logger.error(f"[LGTM] {message}")
+    def log_error(self, message, attributes=None, args=(), component=None):
+        """ERROR 레벨 로그를 기록합니다."""
+        self._emit(logging.ERROR, message, attributes, args, component)
     
-    def log_warn(self, message, attributes=None):
-        """WARN 레벨 로그를 기록합니다. 트레이스 컨텍스트가 자동으로 포함됩니다."""
-        logger.warning(f"[LGTM] {message}")
+    def log_warn(self, message, attributes=None, args=(), component=None):
+        """WARN 레벨 로그를 기록합니다."""
+        self._emit(logging.WARNING, message, attributes, args, component)
     
-    def log_debug(self, message, attributes=None):
-        """DEBUG 레벨 로그를 기록합니다. 트레이스 컨텍스트가 자동으로 포함됩니다."""
-        logger.debug(f"[LGTM] {message}")
+    def log_debug(self, message, attributes=None, args=(), component=None):
+        """DEBUG 레벨 로그를 기록합니다."""
+        self._emit(logging.DEBUG, message, attributes, args, component)
     
     def log_with_span(self, message, level="info", attributes=None):
         """현재 활성 Span이 있는 컨텍스트에서 로그를 기록합니다."""
+        if callable(attributes):
+            attributes = attributes()
         current_span = trace.get_current_span()
         if current_span and current_span.is_recording():
             # Span에 로그 이벤트 추가
@@ -247,13 +604,19 @@ class TelemetryManager:
             # LoggingInstrumentor 비활성화
             if self.logging_instrumentor:
                 self.logging_instrumentor.uninstrument()
+                self.logging_instrumentor = None
+            
+            # 종료된 LoggerProvider로 로그가 전달되지 않도록 핸들러 제거
+            if self._log_handler:
+                logging.getLogger().removeHandler(self._log_handler)
+                self._log_handler = None
             
-            if self.trace_provider:
-                self.trace_provider.shutdown()
-            if self.meter_provider:
-                self.meter_provider.shutdown()
-            if self.logger_provider:
-                self.logger_provider.shutdown()
+            # 남은 Span/메트릭/로그를 내보낸 뒤 종료 (여러 번 호출해도 한 번만 종료)
+            providers = (self.trace_provider, self.meter_provider, self.logger_provider)
+            self.trace_provider = self.meter_provider = self.logger_provider = None
+            for provider in providers:
+                if provider:
+                    provider.shutdown()
             logger.info("OpenTelemetry 리소스가 정리되었습니다.")
         except Exception as e:
             logger.error(f"OpenTelemetry 정리 오류: {str(e)}")
@@ -0,0 +1,584 @@
+"""Flask 백엔드(app.py)와 asyncio 백엔드(async_app.py)의 API 응답 동등성 테스트
+
+같은 요청을 같은 순서로 두 앱의 테스트 클라이언트에 보내고 상태 코드와 JSON 본문이 같은지 확인합니다.
+각 앱은 자신의 Redis와 DB를 사용하므로 한 앱의 요청이 다른 앱의 상태에 영향을 주지 않습니다.
+
+- Redis: redis_pool의 연결 풀을 fakeredis 연결로 생성 (동기/asyncio 클라이언트 코드는 그대로 사용)
+- MariaDB: 앱이 실행하는 SQL만 해석하는 메모리 DB (mysql-connector / aiomysql 형태의 풀과 커서)
+  FULLTEXT 인덱스가 없는 DB처럼 동작하므로 검색은 LIKE 대체 경로를 거칩니다.
+- 메시징: 보낸 메시지를 기록하고, 조회 시에는 테스트가 넣어 둔 API 로그를 반환하는 메모리 메시징
+
+사용법: cd backend && pip install -r requirements-test.txt && python -m pytest -q
+"""
+import os
+import re
+import asyncio
+import importlib
+from contextlib import contextmanager, asynccontextmanager
+from datetime import datetime, timedelta
+
+import pytest
+import redis
+import redis.asyncio
+import fakeredis
+import fakeredis.aioredis
+import aiomysql
+import mysql.connector
+from opentelemetry.sdk._logs.export import InMemoryLogExporter
+
+import api_log_stream
+import async_db
+import async_messaging
+import db_pool
+import messaging_log_view
+import redis_pool
+from message_search import ER_FT_MATCHING_KEY_NOT_FOUND
+from messaging_interface import MessagingFactory, MessagingInterface, shutdown_api_stats_dispatcher
+from telemetry import TelemetryManager
+
+
+# ===== 메모리 DB =====
+
+_SELECT = re.compile(
+    r"^SELECT (?P<columns>.+?) FROM (?P<table>\w+)(?: WHERE (?P<where>.+?))?"
+    r"(?: ORDER BY id (?P<order>ASC|DESC))?(?: LIMIT %s(?P<offset> OFFSET %s)?)?$"
+)
+_INSERT = re.compile(
+    r"^INSERT INTO (?P<table>\w+) \((?P<columns>[^)]+)\) VALUES (?P<values>.+?)"
+    r"(?P<upsert> ON DUPLICATE KEY UPDATE total = total \+ VALUES\(total\))?$"
+)
+_CONDITION = re.compile(r"^(?P<column>\w+) (?P<op>=|<|>|LIKE|IN) (?P<value>%s|\((?:%s, )*%s\))$")
+
+
+def _like(pattern, value):
+    """MariaDB 기본 collation처럼 대소문자를 구분하지 않는 LIKE"""
+    regex = "".join(".*" if c == "%" else "." if c == "_" else re.escape(c) for c in pattern)
+    return re.fullmatch(regex, value, re.IGNORECASE | re.DOTALL) is not None
+
+
+class MemoryDatabase:
+    """users, messages, message_counters 테이블을 메모리에 보관하는 DB
+
+    테스트 대상 SQL 형태(단순 SELECT/INSERT, 카운터 upsert)만 해석하며, 그 밖의 SQL은 AssertionError로 실패합니다.
+    created_at은 실행 시각 대신 id로 정해지는 값을 저장하므로 두 앱의 응답을 그대로 비교할 수 있습니다.
+    """
+
+    def __init__(self, fulltext_error):
+        self.tables = {"users": [], "messages": [], "message_counters": []}
+        self.fulltext_error = fulltext_error
+
+    def execute(self, sql, args=()):
+        """SQL을 실행하고 결과 행(dict) 목록을 반환합니다."""
+        sql = " ".join(sql.split())
+        args = list(args or ())
+        if "MATCH(" in sql:
+            raise self.fulltext_error()
+        match = _SELECT.match(sql)
+        if match:
+            return self._select(match, args)
+        match = _INSERT.match(sql)
+        if match:
+            self._insert(match, args)
+            return []
+        raise AssertionError(f"메모리 DB가 지원하지 않는 SQL: {sql}")
+
+    def _select(self, match, args):
+        rows = self.tables[match["table"]]
+        for condition in (match["where"].split(" AND ") if match["where"] else ()):
+            rows = self._filter(rows, condition, args)
+        if match["order"]:
+            rows = sorted(rows, key=lambda row: row["id"], reverse=match["order"] == "DESC")
+        if "LIMIT" in match.group(0):
+            limit = args.pop(0)
+            offset = args.pop(0) if match["offset"] else 0
+            rows = rows[offset:offset + limit]
+        assert not args, f"바인딩되지 않은 값: {args}"
+
+        columns = match["columns"]
+        if columns == "COUNT(*) AS total":
+            return [{"total": len(rows)}]
+        if columns == "*":
+            return [dict(row) for row in rows]
+        names = [name.strip() for name in columns.split(",")]
+        return [{name: row[name] for name in names} for row in rows]
+
+    @staticmethod
+    def _filter(rows, condition, args):
+        parsed = _CONDITION.match(condition)
+        assert parsed, f"메모리 DB가 지원하지 않는 조건: {condition}"
+        column, op = parsed["column"], parsed["op"]
+        if op == "IN":
+            count = parsed["value"].count("%s")
+            values, args[:count] = set(args[:count]), []
+            return [row for row in rows if row[column] in values]
+        value = args.pop(0)
+        tests = {
+            "=": lambda v: v == value,
+            "<": lambda v: v < value,
+            ">": lambda v: v > value,
+            "LIKE": lambda v: _like(value, v),
+        }
+        return [row for row in rows if tests[op](row[column])]
+
+    def _insert(self, match, args):
+        table = self.tables[match["table"]]
+        columns = [name.strip() for name in match["columns"].split(",")]
+        for start in range(0, len(args), len(columns)):
+            row = dict(zip(columns, args[start:start + len(columns)]))
+            if match["upsert"]:
+                existing = next((r for r in table if r["scope"] == row["scope"]), None)
+                if existing is not None:
+                    existing["total"] += row["total"]
+                    continue
+            if match["table"] in ("messages", "users"):
+                row["id"] = len(table) + 1
+            if match["table"] == "messages":
+                row["created_at"] = datetime(2024, 1, 1) + timedelta(minutes=row["id"])
+            table.append(row)
+
+
+class SyncCursor:
+    """mysql-connector 커서 형태 (dictionary=False이면 튜플 행)"""
+
+    def __init__(self, database, dictionary):
+        self.database = database
+        self.dictionary = dictionary
+        self._rows = []
+
+    def execute(self, sql, args=()):
+        self._rows = self.database.execute(sql, args)
+
+    def _row(self, row):
+        return row if self.dictionary else tuple(row.values())
+
+    def fetchone(self):
+        return self._row(self._rows.pop(0)) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return [self._row(row) for row in rows]
+
+    def close(self):
+        pass
+
+
+class SyncConnection:
+    """트랜잭션은 흉내 내지 않고 실행 즉시 반영합니다."""
+
+    def __init__(self, database):
+        self.database = database
+
+    def cursor(self, dictionary=False):
+        return SyncCursor(self.database, dictionary)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class SyncPool:
+    """db_pool.DatabaseConnectionPool 형태"""
+
+    def __init__(self, database):
+        self.database = database
+
+    @contextmanager
+    def connection(self):
+        yield SyncConnection(self.database)
+
+
+class AsyncCursor:
+    """aiomysql DictCursor 형태"""
+
+    def __init__(self, database):
+        self.database = database
+        self._rows = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def execute(self, sql, args=()):
+        self._rows = self.database.execute(sql, args)
+
+    async def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    async def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+
+class AsyncConnection:
+    def __init__(self, database):
+        self.database = database
+
+    def cursor(self):
+        return AsyncCursor(self.database)
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+class AsyncPool:
+    """async_db.AsyncDatabasePool 형태"""
+
+    def __init__(self, database):
+        self.database = database
+
+    async def open(self):
+        pass
+
+    @asynccontextmanager
+    async def connection(self):
+        yield AsyncConnection(self.database)
+
+    async def close(self):
+        pass
+
+
+def _sync_fulltext_error():
+    return mysql.connector.Error(msg="Can't find FULLTEXT index matching the column list",
+                                 errno=ER_FT_MATCHING_KEY_NOT_FOUND)
+
+
+def _async_fulltext_error():
+    return aiomysql.OperationalError(ER_FT_MATCHING_KEY_NOT_FOUND, "Can't find FULLTEXT index matching the column list")
+
+
+# ===== 메모리 메시징 =====
+
+class MemoryMessaging(MessagingInterface):
+    """보낸 메시지는 sent에 기록하고, 조회는 logs(테스트가 넣어 둔 API 로그)에서 반환합니다."""
+
+    def __init__(self):
+        self.sent = []
+        self.logs = []
+
+    def send_message(self, topic, message):
+        self.sent.append((topic, message))
+        return True
+
+    def get_messages(self, topic, limit=100):
+        return list(self.logs[-limit:])
+
+    def close(self):
+        pass
+
+
+class AsyncMemoryMessaging:
+    """async_messaging.AsyncMessagingInterface 형태의 MemoryMessaging"""
+
+    def __init__(self):
+        self.sent = []
+        self.logs = []
+
+    async def send_message(self, topic, message):
+        self.sent.append((topic, message))
+        return True
+
+    async def get_latest(self, topic, n, timeout=5):
+        return list(self.logs[-n:])
+
+    async def close(self):
+        pass
+
+
+# ===== 두 앱 준비 =====
+
+SYNC_REDIS = fakeredis.FakeServer()
+ASYNC_REDIS = fakeredis.FakeServer()
+
+
+def _create_fake_pool(db, decode_responses, pool_class=redis.BlockingConnectionPool):
+    """redis_pool._create_pool 대체: 동기 앱과 asyncio 앱이 서로 다른 fakeredis 서버를 사용"""
+    if pool_class is redis.asyncio.BlockingConnectionPool:
+        return pool_class(connection_class=fakeredis.aioredis.FakeConnection, server=ASYNC_REDIS,
+                          db=db, decode_responses=decode_responses)
+    return pool_class(connection_class=fakeredis.FakeConnection, server=SYNC_REDIS,
+                      db=db, decode_responses=decode_responses)
+
+
+def _redis(server, db=0):
+    return fakeredis.FakeRedis(server=server, db=db, decode_responses=True)
+
+
+@pytest.fixture(scope="module")
+def apps():
+    """fakeredis 연결 풀과 메모리 익스포터로 두 앱을 import합니다."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("MESSAGING_LOG_VIEW_SIZE", "0")
+        mp.setenv("MESSAGE_COUNTER_RECONCILE_INTERVAL", "0")
+        mp.setenv("SEARCH_ENGINE", "fulltext")
+        # 캐시된 ID 목록 밖의 페이지는 DB에서 직접 검색
+        mp.setenv("SEARCH_CACHE_MAX_IDS", "3")
+        mp.setenv("REDIS_LOG_FLUSH_INTERVAL_MS", "10")
+        mp.setattr(TelemetryManager, "_setup_log_exporters", lambda self: [InMemoryLogExporter()])
+        mp.setattr(redis_pool, "_create_pool", _create_fake_pool)
+        mp.setattr(redis_pool, "_pools", {})
+        mp.setattr(redis_pool, "_clients", {})
+        mp.setattr(redis_pool, "_async_clients", {})
+        mp.setattr(db_pool, "_pool", SyncPool(MemoryDatabase(_sync_fulltext_error)))
+        mp.setattr(db_pool, "_pool_pid", os.getpid())
+        mp.setattr(MessagingFactory, "_shared", MemoryMessaging())
+        mp.setattr(MessagingFactory, "_shared_pid", os.getpid())
+        yield importlib.import_module("app"), importlib.import_module("async_app")
+        api_log_stream.shutdown_log_shipper()
+        shutdown_api_stats_dispatcher()
+
+
+def _normalize(body):
+    """요청 시각에 따라 달라지는 값(로그인 시각, 캐시 생성/만료 시각)을 형식만 확인하고 지웁니다."""
+    if isinstance(body, dict):
+        for key in ("login_time", "last_activity"):
+            if body.get(key) is not None:
+                datetime.fromisoformat(body[key])
+                body[key] = "<time>"
+        for item in body.get("cache_stats", ()):
+            for key in ("timestamp", "expires_at"):
+                datetime.fromisoformat(item[key])
+                item[key] = "<time>"
+    return body
+
+
+class Parity:
+    """같은 요청을 두 앱에 보내고 응답이 같은지 확인합니다."""
+
+    def __init__(self, flask_client, quart_client, loop, worlds):
+        self.flask_client = flask_client
+        self.quart_client = quart_client
+        self.loop = loop
+        self.worlds = worlds
+
+    def request(self, method, path, params=None, json=None):
+        # 두 테스트 클라이언트의 기본 User-Agent와 클라이언트 주소가 다르므로 고정 (browser_id, user_agent 비교)
+        kwargs = {"method": method, "query_string": params, "headers": {"User-Agent": "parity-test"}}
+        if json is not None:
+            kwargs["json"] = json
+        sync_response = self.flask_client.open(path, environ_base={"REMOTE_ADDR": "127.0.0.1"}, **kwargs)
+        async_response = self.loop.run_until_complete(
+            self.quart_client.open(path, scope_base={"client": ("127.0.0.1", 0)}, **kwargs)
+        )
+        sync_result = (sync_response.status_code, _normalize(sync_response.get_json()))
+        async_result = (async_response.status_code, _normalize(self.loop.run_until_complete(async_response.get_json())))
+        assert async_result == sync_result, f"{method} {path} {params or ''}"
+        return sync_result
+
+    def get(self, path, **params):
+        return self.request("GET", path, params=params)
+
+    def post(self, path, json=None):
+        return self.request("POST", path, json=json)
+
+    def login(self, username, password="secret"):
+        self.post("/register", {"username": username, "password": password})
+        assert self.post("/login", {"username": username, "password": password})[0] == 200
+
+    def seed_redis_logs(self, entries):
+        """두 앱의 Redis 로그 스트림에 ID를 지정하여 로그를 넣습니다."""
+        for server in (SYNC_REDIS, ASYNC_REDIS):
+            client = _redis(server)
+            for stream_id, fields in entries:
+                client.xadd(api_log_stream.STREAM_KEY, fields, id=stream_id)
+
+    def seed_messaging_logs(self, entries):
+        """메시징 API 로그를 두 앱의 메모리 메시징과 Redis 로그 뷰에 넣습니다."""
+        for messaging in self.worlds["messaging"]:
+            messaging.logs = list(entries)
+        for server in (SYNC_REDIS, ASYNC_REDIS):
+            view = messaging_log_view.MessagingLogView(None, lambda server=server: _redis(server), capacity=100)
+            for position, entry in enumerate(entries):
+                view.add(0, position, entry)
+            view._flush()
+
+
+@pytest.fixture
+def parity(apps, monkeypatch):
+    flask_backend, quart_backend = apps
+    for server in (SYNC_REDIS, ASYNC_REDIS):
+        _redis(server).flushall()
+    for backend in apps:
+        backend.search_cache._generation_value = None
+
+    sync_messaging, async_messaging_stub = MemoryMessaging(), AsyncMemoryMessaging()
+    monkeypatch.setattr(db_pool, "_pool", SyncPool(MemoryDatabase(_sync_fulltext_error)))
+    monkeypatch.setattr(async_db, "_pool", AsyncPool(MemoryDatabase(_async_fulltext_error)))
+    monkeypatch.setattr(MessagingFactory, "_shared", sync_messaging)
+    monkeypatch.setattr(MessagingFactory, "create_messaging", staticmethod(lambda: sync_messaging))
+    monkeypatch.setattr(async_messaging, "_messaging", async_messaging_stub)
+    # MESSAGING_LOG_VIEW_SIZE > 0일 때 사용할 뷰 (tail하지 않고 Redis에 넣어 둔 로그만 조회)
+    monkeypatch.setattr(messaging_log_view, "_view", messaging_log_view.MessagingLogView(
+        None, redis_pool.get_redis_client, capacity=100
+    ))
+    monkeypatch.setattr(messaging_log_view, "_view_pid", os.getpid())
+
+    loop = asyncio.new_event_loop()
+    test_app = quart_backend.app.test_app()
+    loop.run_until_complete(test_app.__aenter__())
+    try:
+        yield Parity(flask_backend.app.test_client(), test_app.test_client(), loop,
+                     {"messaging": (sync_messaging, async_messaging_stub)})
+    finally:
+        loop.run_until_complete(test_app.__aexit__(None, None, None))
+        loop.close()
+        api_log_stream.shutdown_log_shipper()
+        shutdown_api_stats_dispatcher()
+
+
+# ===== 테스트 =====
+
+PROTECTED_ROUTES = [
+    ("GET", "/db/message"),
+    ("POST", "/db/message"),
+    ("GET", "/db/messages"),
+    ("GET", "/db/messages/search"),
+    ("GET", "/logs/redis"),
+    ("GET", "/logs/messaging"),
+    ("GET", "/cache/search/stats"),
+    ("POST", "/cache/search/clear"),
+]
+
+
+@pytest.mark.parametrize("method,path", PROTECTED_ROUTES)
+def test_login_required(parity, method, path):
+    assert parity.request(method, path, json={} if method == "POST" else None)[0] == 401
+
+
+def test_register_login_session(parity):
+    assert parity.get("/session/status")[1]["logged_in"] is False
+    assert parity.post("/register", {"username": "alice"})[0] == 400
+    assert parity.post("/register", {"username": "alice", "password": "secret"})[0] == 200
+    assert parity.post("/register", {"username": "alice", "password": "other"})[0] == 400
+
+    assert parity.post("/login", {"username": "alice"})[0] == 400
+    assert parity.post("/login", {"username": "alice", "password": "wrong"})[0] == 401
+    assert parity.post("/login", {"username": "bob", "password": "secret"})[0] == 401
+    assert parity.post("/login", {"username": "alice", "password": "secret"})[0] == 200
+
+    status, body = parity.get("/session/status")
+    assert status == 200 and body["logged_in"] is True and body["username"] == "alice"
+
+    assert parity.post("/logout")[0] == 200
+    assert parity.get("/session/status")[1]["logged_in"] is False
+
+
+def test_user_messages(parity):
+    parity.login("alice")
+    parity.login("bob")
+    parity.login("alice")
+    for i in range(5):
+        assert parity.post("/db/message", {"message": f"hello {i}"}) == (200, {"status": "success"})
+
+    body = parity.get("/db/message", page=1, limit=2)[1]
+    assert [m["message"] for m in body["messages"]] == ["hello 4", "hello 3"]
+    assert body["pagination"]["total"] == 5
+    parity.get("/db/message", page=3, limit=2)
+    parity.get("/db/message", page=0, limit=500, total="none")
+
+    # 커서 기반 페이지네이션 (다음/이전 페이지)
+    body = parity.get("/db/message", cursor=body["pagination"]["next_cursor"], limit=2, total="exact")[1]
+    assert [m["message"] for m in body["messages"]] == ["hello 2", "hello 1"]
+    parity.get("/db/message", cursor=body["pagination"]["prev_cursor"], limit=2)
+    assert parity.get("/db/message", cursor="invalid")[0] == 400
+
+
+def test_all_messages(parity):
+    for user in ("alice", "bob"):
+        parity.login(user)
+        for i in range(3):
+            parity.post("/db/message", {"message": f"{user} {i}"})
+
+    body = parity.get("/db/messages", limit=4)[1]
+    assert body["pagination"]["total"] == 6 and body["pagination"]["has_more"] is True
+    parity.get("/db/messages", page=2, limit=4, total="approx")
+    parity.get("/db/messages", page=1, total="none")
+
+    body = parity.get("/db/messages", cursor=body["pagination"]["next_cursor"], limit=4, total="exact")[1]
+    assert [m["message"] for m in body["messages"]] == ["alice 1", "alice 0"]
+    parity.get("/db/messages", cursor=body["pagination"]["prev_cursor"], limit=4)
+    assert parity.get("/db/messages", cursor="invalid")[0] == 400
+
+
+def test_search_and_cache(parity):
+    parity.login("alice")
+    for message in ("Redis cache", "redis stream", "kafka topic", "c++ tips", "redis lua", "Redis pool"):
+        parity.post("/db/message", {"message": message})
+
+    assert parity.get("/db/messages/search", q="  ")[1]["results"] == []
+    body = parity.get("/db/messages/search", q="redis", limit=2)[1]  # 캐시 채움
+    assert [r["message"] for r in body["results"]] == ["Redis pool", "redis lua"]
+    assert body["pagination"]["total"] == 4
+    parity.get("/db/messages/search", q="redis", limit=2)  # 캐시 히트
+    parity.get("/db/messages/search", q="redis", page=2, limit=2)  # 캐시된 ID 목록 밖
+    parity.get("/db/messages/search", q="c++")  # 단어 토큰 없음
+    parity.get("/db/messages/search", q="nothing")
+
+    # 일치하는 새 메시지는 캐시를 무효화 ("redis", 색인할 단어가 없는 "c++")
+    parity.post("/db/message", {"message": "redis cluster"})
+    assert parity.get("/db/messages/search", q="redis")[1]["pagination"]["total"] == 5
+
+    body = parity.get("/cache/search/stats")[1]
+    assert [item["query"] for item in body["cache_stats"]] == ["redis", "nothing"]
+    parity.get("/cache/search/stats", page=2, limit=1)
+    parity.get("/cache/search/stats", rebuild="true")
+
+    assert parity.post("/cache/search/clear", {"query": "redis"})[1]["deleted_count"] == 1
+    assert parity.post("/cache/search/clear", {"query": "redis"})[1]["deleted_count"] == 0
+    assert parity.post("/cache/search/clear", {})[1]["deleted_count"] == 1
+    assert parity.get("/cache/search/stats")[1]["total_cached_queries"] == 0
+
+
+def test_redis_logs(parity):
+    parity.login("alice")
+    parity.seed_redis_logs([
+        (f"{1704067200000 + i * 1000}-0", {
+            "timestamp": f"2024-01-01T00:00:{i:02d}+00:00",
+            "action": "db_insert",
+            "details": f"Message saved: {i}"
+        })
+        for i in range(7)
+    ])
+
+    body = parity.get("/logs/redis", limit=3)[1]
+    assert body["pagination"]["total"] == 7
+    parity.get("/logs/redis", page=3, limit=3)
+
+    body = parity.get("/logs/redis", cursor="", since="2024-01-01T00:00:01Z", limit=2)[1]
+    parity.get("/logs/redis", cursor=body["pagination"]["next_cursor"], limit=2)
+    parity.get("/logs/redis", until="2024-01-01T00:00:04Z", limit=10)
+    assert parity.get("/logs/redis", cursor="invalid")[0] == 400
+    assert parity.get("/logs/redis", since="not-a-time")[0] == 400
+
+
+def test_messaging_logs(parity, monkeypatch):
+    parity.login("alice")
+    parity.seed_messaging_logs([
+        {
+            "timestamp": f"2024-01-01T00:00:{i:02d}",
+            "endpoint": "/db/message",
+            "method": "POST",
+            "status": "success",
+            "user_id": "alice",
+            "message": f"API call {i}"
+        }
+        for i in range(5)
+    ])
+
+    # Redis 로그 뷰에서 조회
+    monkeypatch.setenv("MESSAGING_LOG_VIEW_SIZE", "100")
+    body = parity.get("/logs/messaging", limit=2)[1]
+    assert [log["message"] for log in body["logs"]] == ["API call 4", "API call 3"]
+    assert body["pagination"]["total"] == 5
+    parity.get("/logs/messaging", page=3, limit=2)
+
+    # 뷰 비활성화 시 메시징 시스템에서 직접 조회
+    monkeypatch.setenv("MESSAGING_LOG_VIEW_SIZE", "0")
+    assert parity.get("/logs/messaging", limit=2)[1] == body
+    parity.get("/logs/messaging", page=2, limit=4)
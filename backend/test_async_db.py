@@ -0,0 +1,51 @@
+"""AsyncDatabasePool 테스트 (aiomysql.create_pool 대역 사용)
+
+사용법: cd backend && pip install -r requirements-test.txt && python -m pytest -q
+"""
+import asyncio
+
+import aiomysql
+
+from async_db import AsyncDatabasePool
+
+
+class FakeConnection:
+    closed = False
+
+    def get_transaction_status(self):
+        return False
+
+
+class FakePool:
+    size = 1
+    freesize = 1
+
+    async def acquire(self):
+        return FakeConnection()
+
+    def release(self, connection):
+        pass
+
+
+def test_concurrent_first_connections_open_one_pool(monkeypatch):
+    created = []
+
+    async def create_pool(**kwargs):
+        # 연결 생성 중 다른 요청이 끼어들 수 있도록 양보
+        await asyncio.sleep(0.05)
+        created.append(FakePool())
+        return created[-1]
+
+    monkeypatch.setattr(aiomysql, "create_pool", create_pool)
+    pool = AsyncDatabasePool({"host": "localhost", "db": "test"}, name="mariadb-async-test")
+
+    async def borrow():
+        async with pool.connection() as connection:
+            return connection
+
+    async def scenario():
+        return await asyncio.gather(*(borrow() for _ in range(5)))
+
+    assert len(asyncio.run(scenario())) == 5
+    assert len(created) == 1
+    assert pool._pool is created[0]
@@ -0,0 +1,204 @@
+"""EventHubBatchPublisher 테스트 (로컬 Producer 대역 사용)
+
+Event Hubs에 연결하지 않고 create_batch/send_batch/close만 구현한 Producer 대역으로
+배치 구성, flush 조건, partition_key 라우팅, 버리기와 메트릭을 확인합니다.
+
+사용법: cd backend && pip install -r requirements-test.txt && python -m pytest -q
+"""
+import json
+import time
+import threading
+
+import pytest
+
+import messaging_interface
+from messaging_interface import EventHubBatchPublisher
+
+
+class FakeBatch:
+    """EventDataBatch 대역: 이벤트 본문 길이의 합이 max_size_in_bytes를 넘으면 ValueError"""
+
+    def __init__(self, partition_key, max_size_in_bytes):
+        self.partition_key = partition_key
+        self.max_size_in_bytes = max_size_in_bytes
+        self.size_in_bytes = 0
+        self.events = []
+
+    def add(self, event):
+        if self.size_in_bytes + len(event) > self.max_size_in_bytes:
+            raise ValueError("EventDataBatch has reached its size limit")
+        self.events.append(event)
+        self.size_in_bytes += len(event)
+
+
+class FakeProducer:
+    """EventHubProducerClient 대역: 전송된 배치를 기록합니다."""
+
+    def __init__(self, max_size_in_bytes=1024 * 1024, fail=False):
+        self.max_size_in_bytes = max_size_in_bytes
+        self.fail = fail
+        self.sent = []
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def create_batch(self, partition_key=None):
+        return FakeBatch(partition_key, self.max_size_in_bytes)
+
+    def send_batch(self, batch):
+        if self.fail:
+            raise ConnectionError("send failed")
+        with self._cond:
+            self.sent.append(batch)
+            self._cond.notify_all()
+
+    def wait_sent(self, count, timeout=2):
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self.sent) >= count, timeout)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    """telemetry_manager에 기록된 (이름, 값, 속성) 목록"""
+    recorded = []
+    telemetry = messaging_interface.telemetry_manager
+    monkeypatch.setattr(telemetry, "record_metric",
+                        lambda name, value=1, attributes=None: recorded.append((name, value, attributes)))
+    monkeypatch.setattr(telemetry, "record_histogram",
+                        lambda name, value, attributes=None: recorded.append((name, value, attributes)))
+    return recorded
+
+
+@pytest.fixture
+def publishers():
+    created = []
+
+    def create(producer, **kwargs):
+        kwargs.setdefault("max_latency", 60)
+        publisher = EventHubBatchPublisher(producer, event_factory=lambda body: body, **kwargs)
+        created.append(publisher)
+        return publisher
+
+    yield create
+    for publisher in created:
+        publisher.close(timeout=2)
+
+
+def _bodies(batch):
+    return [json.loads(event)["n"] for event in batch.events]
+
+
+def test_flush_on_event_count(publishers, metrics):
+    producer = FakeProducer()
+    publisher = publishers(producer, max_batch_events=3)
+    for n in range(3):
+        assert publisher.add({"n": n})
+    assert producer.wait_sent(1)
+    assert [_bodies(batch) for batch in producer.sent] == [[0, 1, 2]]
+
+
+def test_flush_on_byte_size(publishers, metrics):
+    producer = FakeProducer()
+    size = len(json.dumps({"n": 0}))
+    publisher = publishers(producer, max_batch_events=100, max_batch_bytes=size * 2)
+    publisher.add({"n": 0})
+    time.sleep(0.1)
+    assert producer.sent == []
+    publisher.add({"n": 1})
+    assert producer.wait_sent(1)
+    assert _bodies(producer.sent[0]) == [0, 1]
+
+
+def test_flush_on_latency(publishers, metrics):
+    producer = FakeProducer()
+    publisher = publishers(producer, max_batch_events=100, max_latency=0.2)
+    start = time.monotonic()
+    publisher.add({"n": 0})
+    assert producer.wait_sent(1)
+    assert time.monotonic() - start >= 0.2
+    assert _bodies(producer.sent[0]) == [0]
+
+
+def test_partition_key_grouping(publishers, metrics):
+    producer = FakeProducer()
+    publisher = publishers(producer)
+    for n, user in enumerate(["a", "b", "a", None, "b", "a"]):
+        publisher.add({"n": n}, partition_key=user)
+    publisher.flush()
+    by_key = {batch.partition_key: _bodies(batch) for batch in producer.sent}
+    assert by_key == {"a": [0, 2, 5], "b": [1, 4], None: [3]}
+    assert len(producer.sent) == 3
+
+
+def test_full_batch_rolls_into_new_batch(publishers, metrics):
+    size = len(json.dumps({"n": 0}))
+    producer = FakeProducer(max_size_in_bytes=size * 2)
+    publisher = publishers(producer)
+    for n in range(5):
+        publisher.add({"n": n}, partition_key="a")
+    publisher.flush()
+    assert [_bodies(batch) for batch in producer.sent] == [[0, 1], [2, 3], [4]]
+
+
+def test_drop_when_pending_buffer_is_full(publishers, metrics):
+    producer = FakeProducer()
+    publisher = publishers(producer, max_pending=2)
+    assert publisher.add({"n": 0})
+    assert publisher.add({"n": 1})
+    assert not publisher.add({"n": 2})
+    publisher.flush()
+    assert [_bodies(batch) for batch in producer.sent] == [[0, 1]]
+    assert ("eventhub_messages_sent_total", 1, {"status": "dropped"}) in metrics
+    # 전송 후에는 다시 받음
+    assert publisher.add({"n": 3})
+
+
+def test_drop_after_close(publishers, metrics):
+    producer = FakeProducer()
+    publisher = publishers(producer)
+    publisher.add({"n": 0})
+    publisher.close(timeout=2)
+    assert not publisher.add({"n": 1})
+    assert [_bodies(batch) for batch in producer.sent] == [[0]]
+    assert producer.closed
+    assert ("eventhub_messages_sent_total", 1, {"status": "dropped"}) in metrics
+
+
+def test_drop_event_larger_than_batch(publishers, metrics):
+    producer = FakeProducer(max_size_in_bytes=len(json.dumps({"n": 0})))
+    publisher = publishers(producer)
+    publisher.add({"n": 0})
+    publisher.add({"n": "too large for one batch"})
+    publisher.add({"n": 2})
+    publisher.flush()
+    assert [_bodies(batch) for batch in producer.sent] == [[0], [2]]
+    assert ("eventhub_messages_sent_total", 1, {"status": "dropped"}) in metrics
+
+
+def test_fill_ratio_and_latency_metrics(publishers, metrics):
+    size = len(json.dumps({"n": 0}))
+    producer = FakeProducer(max_size_in_bytes=size * 4)
+    publisher = publishers(producer)
+    for n in range(3):
+        publisher.add({"n": n})
+    publisher.flush()
+
+    histograms = {name: (value, attributes) for name, value, attributes in metrics
+                  if name.startswith("eventhub_") and name != "eventhub_messages_sent_total"}
+    assert histograms["eventhub_batch_fill_ratio"][0] == pytest.approx(0.75)
+    assert histograms["eventhub_batch_events"][0] == 3
+    latency, attributes = histograms["eventhub_flush_latency_ms"]
+    assert latency >= 0 and attributes == {"status": "success"}
+    assert ("eventhub_messages_sent_total", 3, {"status": "success"}) in metrics
+
+
+def test_send_error_is_reported(publishers, metrics):
+    producer = FakeProducer(fail=True)
+    publisher = publishers(producer)
+    publisher.add({"n": 0})
+    publisher.flush()
+    assert ("eventhub_messages_sent_total", 1, {"status": "error"}) in metrics
+    assert any(name == "eventhub_flush_latency_ms" and attributes == {"status": "error"}
+               for name, _, attributes in metrics)
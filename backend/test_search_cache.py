@@ -0,0 +1,447 @@
+"""검색 캐시(search_cache.py, async_search_cache.py) 테스트
+
+fakeredis(Lua 포함)로 Redis를 대신하며, 동기/asyncio 캐시가 같은 시나리오에서 같은 결과를 내는지 확인합니다.
+
+사용법: cd backend && pip install -r requirements-test.txt && python -m pytest -q
+"""
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from async_search_cache import AsyncSearchCache
+from search_cache import SearchCache
+
+# 색인 term이 많은 메시지 (max_message_terms 초과용)
+LONG_MESSAGE = " ".join(f"word{n}" for n in range(50))
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def _sync_cache(server, **kwargs):
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    kwargs.setdefault("fill_wait_ms", 500)
+    return SearchCache(lambda: client, **kwargs)
+
+
+@pytest.fixture
+def cache(server):
+    return _sync_cache(server)
+
+
+@pytest.fixture
+def other_cache(server):
+    """같은 Redis를 쓰는 다른 파드의 캐시 (프로세스 내 single-flight를 공유하지 않음)"""
+    return _sync_cache(server, fill_wait_ms=2000)
+
+
+@pytest.fixture
+def async_cache(server):
+    client = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    return AsyncSearchCache(lambda: client, fill_wait_ms=500)
+
+
+def test_fill_without_redis_loads_from_db(cache, server):
+    server.connected = False
+    entry, source = cache.fill("hello", lambda: ([3, 2, 1], 3))
+    assert source == "db"
+    assert entry["ids"] == [3, 2, 1] and entry["total"] == 3
+
+
+def test_async_fill_without_redis_loads_from_db(async_cache, server):
+    async def loader():
+        return [3, 2, 1], 3
+
+    server.connected = False
+    entry, source = asyncio.run(async_cache.fill("hello", loader))
+    assert source == "db"
+    assert entry["ids"] == [3, 2, 1] and entry["total"] == 3
+
+
+def test_message_terms_limit():
+    from search_cache import message_terms
+
+    assert message_terms("hello", limit=100) >= {"*", "h", "he", "hel", "llo"}
+    assert message_terms("hello world", limit=5) is None
+
+
+def test_long_message_invalidates_whole_generation(cache):
+    cache.max_message_terms = 20
+    cache.fill("hello", lambda: ([1], 1))
+    cache.fill("other", lambda: ([2], 1))
+    generation = cache.generation()
+
+    assert cache.invalidate_matching(LONG_MESSAGE, lambda query, message: False) == 2
+    assert cache.generation() == generation + 1
+    assert cache.get("hello") is None and cache.get("other") is None
+
+
+def test_async_long_message_invalidates_whole_generation(async_cache):
+    async def scenario():
+        async_cache.max_message_terms = 20
+        await async_cache.fill("hello", _loader([1], 1))
+        generation = await async_cache.generation()
+        cleared = await async_cache.invalidate_matching(LONG_MESSAGE, lambda query, message: False)
+        await async_cache._reclaim_task
+        return cleared, generation, await async_cache.generation(), await async_cache.get("hello")
+
+    assert asyncio.run(scenario()) == (1, 0, 1, None)
+
+
+def _loader(ids, total):
+    async def load():
+        return ids, total
+    return load
+
+
+class GatedLoader:
+    """release될 때까지 DB 조회를 붙잡아 두는 loader (호출 수 기록)"""
+
+    def __init__(self, ids, total):
+        self.result = (ids, total)
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        assert self.release.wait(5)
+        return self.result
+
+
+# ===== single-flight (user-010) =====
+
+def test_concurrent_fills_are_coalesced(cache):
+    cache.fill_wait = 5
+    loader = GatedLoader([1, 2], 2)
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(cache.fill, "hello", loader)
+        assert loader.started.wait(2)
+        followers = [pool.submit(cache.fill, "Hello ", loader) for _ in range(4)]
+        time.sleep(0.1)
+        loader.release.set()
+        results = [leader.result()] + [future.result() for future in followers]
+
+    assert loader.calls == 1
+    assert [source for _, source in results] == ["fill"] + ["local"] * 4
+    assert all(entry["ids"] == [1, 2] for entry, _ in results)
+    assert cache.get("hello")["ids"] == [1, 2]
+
+
+def test_other_pod_waits_for_remote_fill(cache, other_cache):
+    loader = GatedLoader([1], 1)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(cache.fill, "hello", loader)
+        assert loader.started.wait(2)
+        follower = pool.submit(other_cache.fill, "hello", lambda: pytest.fail("다른 파드가 채우는 중"))
+        time.sleep(0.2)
+        loader.release.set()
+        assert leader.result()[1] == "fill"
+        entry, source = follower.result()
+
+    assert source == "remote"
+    assert entry["ids"] == [1]
+
+
+def test_lock_is_released_after_fill(cache):
+    cache.fill("hello", lambda: ([1], 1))
+    lock_key = cache._lock_key("hello", cache.generation())
+    assert cache.get_client().exists(lock_key) == 0
+
+
+def test_expired_lock_lease_falls_back_to_db(cache):
+    # 락을 잡은 파드가 응답하지 않음: fill_wait만 기다린 뒤 직접 조회
+    cache.fill_wait = 0.2
+    client = cache.get_client()
+    client.set(cache._lock_key("hello", cache.generation()), "dead-pod", px=cache.lock_lease_ms)
+
+    entry, source = cache.fill("hello", lambda: ([7], 1))
+    assert source == "fill"
+    assert entry["ids"] == [7]
+
+
+def _stale_entry(cache, query, ids):
+    """TTL이 지나 stale 구간에 있는 항목을 만듭니다."""
+    ttl = cache.ttl
+    cache.ttl = 0
+    cache.fill(query, lambda: (ids, len(ids)))
+    cache.ttl = ttl
+    entry = cache.get(query)
+    assert entry is not None and not cache.is_fresh(entry)
+    return entry
+
+
+def test_stale_served_while_local_refresh_runs(cache):
+    stale = _stale_entry(cache, "hello", [1])
+    loader = GatedLoader([1, 2], 2)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(cache.fill, "hello", loader, stale)
+        assert loader.started.wait(2)
+        entry, source = cache.fill("hello", loader, stale=stale)
+        assert (entry["ids"], source) == ([1], "stale")
+        loader.release.set()
+        assert leader.result()[1] == "fill"
+
+    assert loader.calls == 1
+    refreshed = cache.get("hello")
+    assert refreshed["ids"] == [1, 2] and cache.is_fresh(refreshed)
+
+
+def test_stale_served_while_other_pod_refreshes(cache, other_cache):
+    stale = _stale_entry(cache, "hello", [1])
+    loader = GatedLoader([1, 2], 2)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        leader = pool.submit(cache.fill, "hello", loader, stale)
+        assert loader.started.wait(2)
+        entry, source = other_cache.fill("hello", lambda: pytest.fail("다른 파드가 채우는 중"), stale=stale)
+        loader.release.set()
+        leader.result()
+
+    assert (entry["ids"], source) == ([1], "stale")
+
+
+def test_async_concurrent_fills_are_coalesced(async_cache):
+    async def scenario():
+        calls = []
+        release = asyncio.Event()
+
+        async def loader():
+            calls.append(1)
+            await release.wait()
+            return [1, 2], 2
+
+        tasks = [asyncio.ensure_future(async_cache.fill("hello", loader)) for _ in range(5)]
+        await asyncio.sleep(0.1)
+        release.set()
+        results = await asyncio.gather(*tasks)
+        return len(calls), sorted(source for _, source in results), await async_cache.get("hello")
+
+    calls, sources, cached = asyncio.run(scenario())
+    assert calls == 1
+    assert sources == ["fill"] + ["local"] * 4
+    assert cached["ids"] == [1, 2]
+
+
+def test_async_stale_served_while_refresh_runs(server, async_cache):
+    stale = _stale_entry(_sync_cache(server), "hello", [1])
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def loader():
+            await release.wait()
+            return [1, 2], 2
+
+        leader = asyncio.ensure_future(async_cache.fill("hello", loader, stale=stale))
+        await asyncio.sleep(0.05)
+        follower = await async_cache.fill("hello", loader, stale=stale)
+        release.set()
+        await leader
+        return follower, await async_cache.get("hello")
+
+    (entry, source), refreshed = asyncio.run(scenario())
+    assert (entry["ids"], source) == ([1], "stale")
+    assert refreshed["ids"] == [1, 2]
+
+
+# ===== 세대 번호 전체 삭제 (user-013) =====
+
+def _wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def _keys_of_generation(client, generation):
+    """세대 번호가 generation인 검색 캐시 키 (항목, 락, 레지스트리)"""
+    return [key for key in client.scan_iter(match="search*")
+            if key.split(":")[1:2] == [str(generation)]]
+
+
+def test_clear_all_bumps_generation_and_reclaims_old_keys(cache):
+    client = cache.get_client()
+    cache.fill("hello", lambda: ([1], 1))
+    cache.fill("world", lambda: ([2], 1))
+    cache.record_hit("hello")
+    assert _keys_of_generation(client, 0)
+
+    assert cache.clear_all() == 2
+    assert cache.generation() == 1
+    assert cache.get("hello") is None
+    assert cache.stats()["total_cached_queries"] == 0
+    # 백그라운드 reclaim 스레드가 이전 세대 키를 정리
+    assert _wait_until(lambda: not _keys_of_generation(client, 0))
+    assert client.get("search_generation") == "1"
+
+
+def test_reclaim_keeps_current_generation(cache):
+    client = cache.get_client()
+    cache.fill("hello", lambda: ([1], 1))
+    client.incr("search_generation")
+    cache._generation_value = None
+    cache.fill("hello", lambda: ([2], 1))
+
+    assert cache.reclaim() > 0
+    assert not _keys_of_generation(client, 0)
+    assert cache.get("hello")["ids"] == [2]
+    assert cache.stats()["total_cached_queries"] == 1
+
+
+def test_other_pod_sees_clear_all_after_refresh(server, cache):
+    other = _sync_cache(server, generation_refresh_ms=0)
+    cache.fill("hello", lambda: ([1], 1))
+    assert other.get("hello") is not None
+    cache.clear_all()
+    assert other.get("hello") is None
+
+
+def test_fill_racing_clear_all_is_not_stored(cache):
+    def loader():
+        cache.clear_all()
+        return [1], 1
+
+    entry, source = cache.fill("hello", loader)
+    assert (entry["ids"], source) == ([1], "fill")
+    assert cache.get("hello") is None
+    assert cache.stats()["total_cached_queries"] == 0
+
+
+def test_async_clear_all_reclaims_old_keys(server, async_cache):
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+
+    async def scenario():
+        await async_cache.fill("hello", _loader([1], 1))
+        cleared = await async_cache.clear_all()
+        await async_cache._reclaim_task
+        return cleared, await async_cache.generation(), await async_cache.get("hello")
+
+    assert asyncio.run(scenario()) == (1, 1, None)
+    assert not _keys_of_generation(client, 0)
+
+
+# ===== 메시지 저장 시 일치하는 검색어만 무효화 (user-014) =====
+
+def _matches(query, message):
+    from message_search import MessageSearch
+
+    return MessageSearch().matches(query, message)
+
+
+def _term_members(client, term, generation=0):
+    return client.smembers(f"search_registry:{generation}:term:{term}")
+
+
+def test_fill_indexes_query_terms(cache):
+    client = cache.get_client()
+    cache.fill("Hello World", lambda: ([1], 1))
+    cache.fill("50%", lambda: ([2], 1))
+    digest = cache._digest("hello world")
+
+    assert _term_members(client, "hel") == {digest}
+    assert _term_members(client, "wor") == {digest}
+    assert _term_members(client, "*") == {cache._digest("50%")}
+    assert client.hget("search_registry:0:queries", digest) == "Hello World"
+
+
+def test_invalidate_matching_deletes_only_matching_queries(cache):
+    client = cache.get_client()
+    for query in ("hello", "world", "50%"):
+        cache.fill(query, lambda: ([1], 1))
+
+    # 색인하지 않은 검색어(LIKE 와일드카드)는 모든 메시지에 대해 일치로 간주
+    assert cache.invalidate_matching("well, hello there", _matches) == 2
+    assert cache.get("hello") is None and cache.get("50%") is None
+    assert cache.get("world") is not None
+    assert _term_members(client, "hel") == set() and _term_members(client, "*") == set()
+    assert cache.stats()["total_cached_queries"] == 1
+
+
+def test_invalidation_racing_fill_discards_store(cache):
+    def loader():
+        # DB 조회 이후, 저장 이전에 일치하는 메시지가 저장됨 (채우는 중인 검색어도 무효화 대상)
+        assert cache.invalidate_matching("hello again", _matches) == 1
+        return [1], 1
+
+    entry, source = cache.fill("hello", loader)
+    assert (entry["ids"], source) == ([1], "fill")
+    assert cache.get("hello") is None
+    assert cache.stats()["total_cached_queries"] == 0
+
+
+def test_unrelated_save_during_fill_keeps_store(cache):
+    def loader():
+        cache.invalidate_matching("goodbye", _matches)
+        return [1], 1
+
+    cache.fill("hello", loader)
+    assert cache.get("hello")["ids"] == [1]
+
+
+def test_newer_fill_wins_over_older_fill(cache, other_cache):
+    # 먼저 시작한 채우기가 나중에 끝나면 버전이 달라 저장하지 않음
+    older = GatedLoader([1], 1)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        first = pool.submit(cache.fill, "hello", older)
+        assert older.started.wait(2)
+        other_cache.get_client().delete(other_cache._lock_key("hello", 0))
+        other_cache.fill("hello", lambda: ([2], 1))
+        older.release.set()
+        first.result()
+
+    assert cache.get("hello")["ids"] == [2]
+
+
+def test_prune_removes_expired_registry_and_term_membership(cache):
+    from search_cache import _PRUNE_SCRIPT
+
+    client = cache.get_client()
+    cache.fill("hello", lambda: ([1], 1))
+    cache.fill("help", lambda: ([2], 1))
+    cache.record_hit("hello")
+    digest = cache._digest("hello")
+    assert _term_members(client, "hel") == {digest, cache._digest("help")}
+
+    # 만료 시각을 과거로 옮긴 뒤 정리
+    client.zadd("search_registry:0:expiry", {digest: 0})
+    assert cache._run_script(client, _PRUNE_SCRIPT, 0, time.time(), cache.PRUNE_BATCH) == 1
+
+    assert _term_members(client, "hel") == {cache._digest("help")}
+    for field in ("queries", "index", "versions", "meta"):
+        assert client.hget(f"search_registry:0:{field}", digest) is None
+    assert client.zscore("search_registry:0:hits", digest) is None
+    assert client.get("search_registry:0:total_hits") == "1"
+
+
+def test_delete_removes_term_membership(cache):
+    client = cache.get_client()
+    cache.fill("hello", lambda: ([1], 1))
+    assert cache.delete("hello") == 1
+    assert _term_members(client, "hel") == set()
+    assert client.hget("search_registry:0:queries", cache._digest("hello")) is None
+
+
+def test_async_invalidation_racing_fill_discards_store(async_cache):
+    async def scenario():
+        async def loader():
+            await async_cache.invalidate_matching("hello again", _matches)
+            return [1], 1
+
+        entry, source = await async_cache.fill("hello", loader)
+        await async_cache.fill("world", _loader([2], 1))
+        invalidated = await async_cache.invalidate_matching("hello world", _matches)
+        return source, await async_cache.get("hello"), invalidated, await async_cache.get("world")
+
+    source, raced, invalidated, world = asyncio.run(scenario())
+    assert source == "fill" and raced is None
+    assert invalidated == 1 and world is None
@@ -5,7 +5,11 @@ CREATE TABLE messages (
     id INT AUTO_INCREMENT PRIMARY KEY,
     message TEXT,
     created_at DATETIME,
-    user_id VARCHAR(255)
+    user_id VARCHAR(255),
+    -- 사용자별 커서(keyset) 페이지네이션용 인덱스
+    INDEX idx_messages_user_id_id (user_id, id),
+    -- 메시지 검색용 FULLTEXT 인덱스 (짧은 한글 단어를 위해 innodb_ft_min_token_size=1 권장)
+    FULLTEXT INDEX ft_messages_message (message)
 );
 
 CREATE TABLE users (
@@ -13,4 +17,11 @@ CREATE TABLE users (
     username VARCHAR(255) UNIQUE NOT NULL,
     password VARCHAR(255) NOT NULL,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-); 
\ No newline at end of file
+);
+
+-- 메시지 수 카운터 (scope: '__all__' 또는 'user:<user_id>')
+-- save_to_db에서 INSERT와 같은 트랜잭션으로 갱신되며, 주기적으로 messages 테이블과 재조정됩니다.
+CREATE TABLE message_counters (
+    scope VARCHAR(300) PRIMARY KEY,
+    total BIGINT NOT NULL DEFAULT 0
+);